@@ -0,0 +1,105 @@
+"""
+benchmarks/bench_availability_grid.py
+-------------------------------------
+Microbenchmark: every feasible start over 30 / 90 days with
+services/availability_grid.py (NumPy bitmaps) vs the interval engine in
+services/availability_engine.py, for 1 and 3 calendars (no Google calls).
+
+The engine handles several calendars by merging all busy lists; the grid ANDs
+one bitmap per calendar. Both paths are checked to return the same starts
+before timing.
+
+Usage:
+    python -m benchmarks.bench_availability_grid [--repeat 20]
+"""
+
+import argparse
+import datetime
+import random
+import timeit
+
+import numpy as np
+import pytz
+
+import config
+from calendar_tool import _normalize_business_periods
+from services.availability_engine import get_engine
+from services.availability_grid import AvailabilityGrid, cell_minutes_for
+
+IST = pytz.timezone(config.CALENDAR_TIMEZONE)
+
+BOT_CFG = {
+    "business_hours_periods": [{"start": "09:00", "end": "13:00"}, {"start": "14:00", "end": "19:00"}],
+    "slot_duration_mins": 30,
+}
+PERIODS = _normalize_business_periods(BOT_CFG)
+
+
+def make_busy(start, days, per_day, rng):
+    """Random 15–90 min meetings inside 08:00–20:00, `per_day` per day."""
+    busy = []
+    for d in range(days):
+        day = start + datetime.timedelta(days=d)
+        for _ in range(per_day):
+            s = day + datetime.timedelta(minutes=rng.randrange(8 * 60, 20 * 60, 15))
+            busy.append((s, s + datetime.timedelta(minutes=rng.choice((15, 30, 45, 60, 90)))))
+    return busy
+
+
+def engine_all(calendars, start, days, dur):
+    engine = get_engine(PERIODS, config.CALENDAR_TIMEZONE)
+    busy = [b for cal in calendars for b in cal]
+    return engine.find_slots(
+        busy, anchor=start, duration_minutes=dur, max_slots=days * 24 * 60,
+        horizon=datetime.timedelta(days=days),
+    )
+
+
+def grid_all(calendars, start, days, dur):
+    grid = AvailabilityGrid(PERIODS, start.date(), days, config.CALENDAR_TIMEZONE,
+                            cell_minutes=cell_minutes_for(PERIODS, dur))
+    for cal in calendars:
+        grid.block(cal)
+    mask = grid.start_mask(dur).ravel()
+    return [grid.origin + datetime.timedelta(minutes=int(c) * grid.cell) for c in np.flatnonzero(mask)]
+
+
+def grid_mask_only(calendars, start, days, dur):
+    grid = AvailabilityGrid(PERIODS, start.date(), days, config.CALENDAR_TIMEZONE,
+                            cell_minutes=cell_minutes_for(PERIODS, dur))
+    for cal in calendars:
+        grid.block(cal)
+    return grid.start_mask(dur)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    start = IST.localize(datetime.datetime(2030, 3, 4))
+    dur = BOT_CFG["slot_duration_mins"]
+
+    print(f"{'days':>5} {'cals':>4} {'busy/day':>8} {'starts':>7} | "
+          f"{'engine ms':>10} {'grid ms':>9} {'mask ms':>9} {'speedup':>8}")
+    for days in (30, 90):
+        for n_cals in (1, 3):
+            for per_day in (5, 20):
+                calendars = [make_busy(start, days, per_day, rng) for _ in range(n_cals)]
+                want = engine_all(calendars, start, days, dur)
+                got = grid_all(calendars, start, days, dur)
+                assert got == want, (days, n_cals, per_day)
+
+                t_engine = min(timeit.repeat(
+                    lambda: engine_all(calendars, start, days, dur), number=1, repeat=args.repeat)) * 1e3
+                t_grid = min(timeit.repeat(
+                    lambda: grid_all(calendars, start, days, dur), number=1, repeat=args.repeat)) * 1e3
+                t_mask = min(timeit.repeat(
+                    lambda: grid_mask_only(calendars, start, days, dur), number=1, repeat=args.repeat)) * 1e3
+                print(f"{days:>5} {n_cals:>4} {per_day:>8} {len(want):>7} | "
+                      f"{t_engine:>10.2f} {t_grid:>9.2f} {t_mask:>9.2f} {t_engine / t_grid:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
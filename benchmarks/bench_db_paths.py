@@ -0,0 +1,103 @@
+"""
+benchmarks/bench_db_paths.py
+----------------------------
+Compares the two ways the API can hit Postgres under concurrent load:
+
+  thread : await asyncio.to_thread(crud.fn, ...)   (psycopg2 pool, default executor)
+  async  : await async_crud.fn(...)                (asyncpg pool, on the event loop)
+
+Reports p50 / p99 latency and throughput for a few read-heavy handler queries.
+
+Usage (needs DATABASE_URL and an existing tenant):
+    python -m benchmarks.bench_db_paths --tenant <tenant_id> [--concurrency 50] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database import crud, async_crud
+from database.db import init_db_pool, close_db_pool
+from database.async_db import init_async_pool, close_async_pool, is_ready
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _calls(tenant_id: str):
+    """(name, sync_fn, async_fn, args) mirroring the admin dashboard + voice init."""
+    return [
+        ("get_bot_config",     crud.get_bot_config,     async_crud.get_bot_config,     (tenant_id,)),
+        ("get_tenant_modules", crud.get_tenant_modules, async_crud.get_tenant_modules, (tenant_id,)),
+        ("get_tenant_stats",   crud.get_tenant_stats,   async_crud.get_tenant_stats,   (tenant_id,)),
+        ("get_tenant_users",   crud.get_tenant_users,   async_crud.get_tenant_users,   (tenant_id,)),
+    ]
+
+
+async def _run(mode: str, tenant_id: str, concurrency: int, total: int):
+    calls = _calls(tenant_id)
+    latencies = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        _, sync_fn, async_fn, args = calls[i % len(calls)]
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                if mode == "thread":
+                    await asyncio.to_thread(sync_fn, *args)
+                else:
+                    await async_fn(*args)
+            except Exception:
+                errors += 1
+                return
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - t_start
+
+    print(
+        f"{mode:>6} | n={len(latencies):5d} err={errors:3d} | "
+        f"p50={_percentile(latencies, 50):7.2f} ms  p99={_percentile(latencies, 99):7.2f} ms  "
+        f"mean={statistics.fmean(latencies):7.2f} ms | {len(latencies) / elapsed:8.1f} req/s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant", required=True, help="tenant_id to query")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    await asyncio.to_thread(init_db_pool)
+    await init_async_pool()
+    if not is_ready():
+        print("asyncpg pool unavailable — the 'async' run would just measure the thread fallback.")
+        return
+
+    try:
+        # Warm both pools so connection setup is not measured.
+        await _run("thread", args.tenant, args.concurrency, 50)
+        await _run("async", args.tenant, args.concurrency, 50)
+        print("-" * 100)
+        for mode in ("thread", "async"):
+            await _run(mode, args.tenant, args.concurrency, args.requests)
+    finally:
+        await close_async_pool()
+        await asyncio.to_thread(close_db_pool)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+benchmarks/bench_knowledge_insert.py
+------------------------------------
+Times knowledge_base ingestion for 1k / 10k / 100k chunks:
+
+  loop     : one INSERT per chunk (the previous add_knowledge_chunks)
+  values   : multi-row INSERT ... RETURNING id (execute_values)
+  copy     : COPY FROM STDIN (CSV) with client-side ids
+  async    : async_crud.insert_knowledge_chunks (unnest / copy_records_to_table)
+
+Rows are written under a throwaway tenant which is deleted at the end
+(ON DELETE CASCADE removes its knowledge rows).
+
+Usage (needs DATABASE_URL):
+    python -m benchmarks.bench_knowledge_insert [--sizes 1000,10000,100000] [--loop-max 10000]
+"""
+
+import argparse
+import asyncio
+import time
+from unittest import mock
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import config
+from database import crud, async_crud
+from database.db import init_db_pool, close_db_pool, get_db_connection
+from database.async_db import init_async_pool, close_async_pool, is_ready
+
+
+def _make_chunks(n: int):
+    # ~120 words, similar to facts_module.chunk_text output
+    body = "Consultation fees, timings and parking details for the clinic. " * 12
+    return [f"Section {i}\n{body}" for i in range(n)]
+
+
+def _legacy_loop(tenant_id, chunks):
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            for chunk in chunks:
+                cur.execute(
+                    "INSERT INTO knowledge_base (tenant_id, content) VALUES (%s, %s);",
+                    (tenant_id, chunk.strip()),
+                )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _values(tenant_id, chunks):
+    with mock.patch.object(config, "KNOWLEDGE_COPY_THRESHOLD", len(chunks)):
+        return crud.insert_knowledge_chunks(tenant_id, chunks)
+
+
+def _copy(tenant_id, chunks):
+    with mock.patch.object(config, "KNOWLEDGE_COPY_THRESHOLD", 0):
+        return crud.insert_knowledge_chunks(tenant_id, chunks)
+
+
+def _timed(label, n, fn):
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    print(f"  {label:>7} | {elapsed * 1000:10.1f} ms | {n / elapsed:10.0f} rows/s")
+
+
+def _clear(tenant_id):
+    crud.delete_all_knowledge(tenant_id)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--loop-max", type=int, default=10000,
+                        help="skip the row-by-row baseline above this size")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    await asyncio.to_thread(init_db_pool)
+    await init_async_pool()
+    tenant = crud.create_tenant("bench-knowledge", "benchmark", "bench@example.invalid")
+    tenant_id = tenant["tenant_id"]
+
+    try:
+        for n in sizes:
+            chunks = _make_chunks(n)
+            print(f"{n} chunks")
+            if n <= args.loop_max:
+                _timed("loop", n, lambda: _legacy_loop(tenant_id, chunks))
+                _clear(tenant_id)
+            _timed("values", n, lambda: _values(tenant_id, chunks))
+            _clear(tenant_id)
+            _timed("copy", n, lambda: _copy(tenant_id, chunks))
+            _clear(tenant_id)
+            if is_ready():
+                t0 = time.perf_counter()
+                await async_crud.insert_knowledge_chunks(tenant_id, chunks)
+                elapsed = time.perf_counter() - t0
+                print(f"  {'async':>7} | {elapsed * 1000:10.1f} ms | {n / elapsed:10.0f} rows/s")
+                _clear(tenant_id)
+    finally:
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM tenants WHERE tenant_id = %s;", (tenant_id,))
+            conn.commit()
+        finally:
+            conn.close()
+        await close_async_pool()
+        await asyncio.to_thread(close_db_pool)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""
+benchmarks/bench_slot_search.py
+-------------------------------
+Microbenchmark: the previous suggest_next_available_slot loop vs
+services/availability_engine.py on synthetic calendars (no Google calls).
+
+The legacy loop is reproduced verbatim (including re-normalising the business
+periods for every candidate, as is_within_business_hours did). Both paths are
+checked to return the same slots before timing.
+
+Usage:
+    python -m benchmarks.bench_slot_search [--repeat 200]
+"""
+
+import argparse
+import datetime
+import random
+import timeit
+
+import pytz
+
+import config
+from calendar_tool import _normalize_business_periods
+from services.availability_engine import get_engine
+
+IST = pytz.timezone(config.CALENDAR_TIMEZONE)
+
+BOT_CFG = {
+    "business_hours_periods": [{"start": "09:00", "end": "13:00"}, {"start": "14:00", "end": "19:00"}],
+    "slot_duration_mins": 30,
+}
+
+
+def _legacy_within_hours(bot_cfg, start_str, duration_minutes):
+    periods = _normalize_business_periods(bot_cfg)
+    naive_dt = datetime.datetime.fromisoformat(start_str)
+    start_mins = naive_dt.hour * 60 + naive_dt.minute
+    end_mins = start_mins + duration_minutes
+    return any(start_mins >= s and end_mins <= e for s, e in periods)
+
+
+def legacy_search(bot_cfg, busy, search_start, search_hours, duration_minutes, max_slots):
+    end_search = search_start + datetime.timedelta(hours=search_hours)
+    busy_intervals = sorted(busy)
+    available = []
+    current = search_start
+    while current < end_search and len(available) < max_slots:
+        end_time = current + datetime.timedelta(minutes=duration_minutes)
+        is_busy = False
+        for busy_start, busy_end in busy_intervals:
+            if not (end_time <= busy_start or current >= busy_end):
+                is_busy = True
+                break
+        if not is_busy and _legacy_within_hours(bot_cfg, current.strftime("%Y-%m-%dT%H:%M:%S"), duration_minutes):
+            available.append(current)
+        current += datetime.timedelta(minutes=duration_minutes)
+    return available
+
+
+def engine_search(bot_cfg, busy, search_start, search_hours, duration_minutes, max_slots):
+    engine = get_engine(_normalize_business_periods(bot_cfg), config.CALENDAR_TIMEZONE)
+    return engine.find_slots(
+        busy, anchor=search_start, duration_minutes=duration_minutes, max_slots=max_slots,
+        horizon=datetime.timedelta(hours=search_hours),
+    )
+
+
+def make_busy(start, days, per_day, rng):
+    """Random 15–90 min meetings inside 08:00–20:00, `per_day` per day."""
+    busy = []
+    for d in range(days + 1):
+        day = start.replace(hour=0, minute=0) + datetime.timedelta(days=d)
+        for _ in range(per_day):
+            s = day + datetime.timedelta(minutes=rng.randrange(8 * 60, 20 * 60, 15))
+            busy.append((s, s + datetime.timedelta(minutes=rng.choice((15, 30, 45, 60, 90)))))
+    return busy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    start = IST.localize(datetime.datetime(2030, 3, 4, 9, 0))
+    dur = BOT_CFG["slot_duration_mins"]
+
+    print(f"{'horizon':>9} {'busy/day':>8} {'slots':>5} | {'legacy µs':>11} {'engine µs':>11} {'speedup':>8}")
+    for hours in (4, 24, 7 * 24, 28 * 24):
+        for per_day in (5, 20):
+            busy = make_busy(start, hours // 24 + 1, per_day, rng)
+            # Ask for more slots than a busy day has, so long horizons are actually walked.
+            for max_slots in (3, 50):
+                want = legacy_search(BOT_CFG, busy, start, hours, dur, max_slots)
+                got = engine_search(BOT_CFG, busy, start, hours, dur, max_slots)
+                # Legacy may return a slot that starts inside the horizon but ends past it.
+                horizon_end = start + datetime.timedelta(hours=hours)
+                want = [t for t in want if t + datetime.timedelta(minutes=dur) <= horizon_end]
+                assert got[:len(want)] == want, (hours, per_day, max_slots)
+
+                t_legacy = min(timeit.repeat(
+                    lambda: legacy_search(BOT_CFG, busy, start, hours, dur, max_slots),
+                    number=1, repeat=args.repeat)) * 1e6
+                t_engine = min(timeit.repeat(
+                    lambda: engine_search(BOT_CFG, busy, start, hours, dur, max_slots),
+                    number=1, repeat=args.repeat)) * 1e6
+                print(f"{hours:>8}h {per_day:>8} {max_slots:>5} | {t_legacy:>11.1f} {t_engine:>11.1f} "
+                      f"{t_legacy / t_engine:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
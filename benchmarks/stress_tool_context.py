@@ -0,0 +1,95 @@
+"""
+benchmarks/stress_tool_context.py
+---------------------------------
+Concurrency stress check: hundreds of simultaneous brain._run_tool_async calls
+across tenants must each see their own session (no Google / DB calls).
+
+A probe tool is registered on calendar_tool for the run. It sleeps a random
+few milliseconds in its worker thread (so calls interleave) and reports what
+get_session_context() / get_tenant_config() returned; every result is checked
+against the session that issued the call. The old module-global tenant_context
+fails this as soon as two sessions overlap.
+
+Usage:
+    python -m benchmarks.stress_tool_context [--sessions 400] [--tenants 25] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+import calendar_tool
+from brain import _run_tool_async
+from services.session_registry import SessionRegistry
+from services.tool_context import ToolContext
+
+PROBE = "_stress_context_probe"
+
+
+def _probe(expect: str, phone_number=None):
+    time.sleep(random.uniform(0, 0.004))
+    tenant_id, phone = calendar_tool.get_session_context()
+    time.sleep(random.uniform(0, 0.004))
+    cfg = calendar_tool.get_tenant_config()
+    return {"expect": expect, "tenant_id": tenant_id, "phone": phone,
+            "cfg_tenant": cfg.get("tenant"), "thread": threading.get_ident()}
+
+
+async def _one_session(i: int, n_tenants: int, chat_sessions, rounds: int):
+    sid = f"stress_{i}"
+    tenant = f"tenant_{i % n_tenants}"
+    chat_sessions[sid] = {"tenant_id": tenant, "phone_number": f"+91{i:010d}",
+                          "bot_config": {"tenant": tenant}}
+    ctx = ToolContext(sid, chat_sessions)
+    results = []
+    for _ in range(rounds):
+        await asyncio.sleep(random.uniform(0, 0.002))
+        results.append(await _run_tool_async(PROBE, {"expect": sid}, ctx))
+    return sid, tenant, results
+
+
+async def run(sessions: int, tenants: int, rounds: int) -> int:
+    chat_sessions = SessionRegistry()
+    for s in range(sessions):
+        chat_sessions.pin(f"stress_{s}")       # keep all of them under the registry caps
+    t0 = time.monotonic()
+    out = await asyncio.gather(*(_one_session(i, tenants, chat_sessions, rounds) for i in range(sessions)))
+    elapsed = time.monotonic() - t0
+
+    errors, threads = 0, set()
+    for sid, tenant, results in out:
+        phone = chat_sessions[sid]["phone_number"]
+        for r in results:
+            threads.add(r["thread"])
+            if (r["expect"], r["tenant_id"], r["phone"], r["cfg_tenant"]) != (sid, tenant, phone, tenant):
+                errors += 1
+                if errors <= 5:
+                    print(f"CROSS-TALK: {sid} expected ({tenant}, {phone}) got {r}")
+    total = sessions * rounds
+    print(f"{total} tool calls | {sessions} sessions / {tenants} tenants | "
+          f"{len(threads)} worker threads | {elapsed:.2f}s | mismatches={errors}")
+    # Outside a tool call nothing leaks back into the caller's context.
+    assert calendar_tool.get_session_context() == (None, None)
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=400)
+    parser.add_argument("--tenants", type=int, default=25)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    setattr(calendar_tool, PROBE, _probe)
+    try:
+        errors = asyncio.run(run(args.sessions, args.tenants, args.rounds))
+    finally:
+        delattr(calendar_tool, PROBE)
+    assert errors == 0, f"{errors} tool call(s) saw another session's context"
+    print("OK — no cross-talk")
+
+
+if __name__ == "__main__":
+    main()
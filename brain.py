@@ -5,16 +5,19 @@ brain.py
 import re
 import re as _re
 import json
+import random
 import asyncio
 import traceback
-import struct
 import os
 from collections import Counter
-from typing import Optional, List, Dict, TYPE_CHECKING
+from difflib import SequenceMatcher
+from typing import Optional, List, Dict, Sequence, TYPE_CHECKING
 
 from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage, AIMessage
-from datetime import datetime
+from langchain_core.messages import (
+    HumanMessage, SystemMessage, ToolMessage, AIMessage, message_chunk_to_message,
+)
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_not_exception_type
 
@@ -25,8 +28,11 @@ except ImportError:
 
 import prompts
 import config
+from services.vad import compute_rms   # noqa: F401 — NumPy version, re-exported for main.py
+from services.tool_context import ToolContext, use_tool_context
+from services.llm_router import LLMRouter
 from modules.module_registry import (
-    get_enabled_modules_for_tenant,
+    aget_enabled_modules_for_tenant,
     build_tools_for_tenant,
     BOOKING_MODULE,
     FACTS_MODULE,
@@ -86,13 +92,10 @@ def _get_llm_cache_key(tenant_id: str, enabled_modules: List[str]) -> str:
 def get_llm_with_tools(tenant_id: str, enabled_modules: List[str]):
     """Returns a cached (llm_with_tools, tools) pair for this tenant+modules combo."""
     key = _get_llm_cache_key(tenant_id, enabled_modules)
-    fresh_llm = get_main_llm()
     if key not in _llm_cache:
+        # Bound on every configured provider; llm_router picks / hedges per call.
         tools = build_tools_for_tenant(tenant_id, enabled_modules)
-        if tools:
-            _llm_cache[key] = (fresh_llm.bind_tools(tools), tools)
-        else:
-            _llm_cache[key] = (fresh_llm, [])
+        _llm_cache[key] = (llm_router.bind(tools), tools or [])
         print(f"[BRAIN] LLM+tools cached for key={key}")
     return _llm_cache[key]
 
@@ -175,24 +178,55 @@ def get_small_llm():
     return ChatGroq(api_key=groq_small_key, model=small_model, temperature=0)
 
 
-def get_main_llm():
-    if LLM_PROVIDER == 'nvidia':
+def _main_llm_model(provider: str) -> str:
+    if provider == 'nvidia':
+        return _env("NVIDIA_MODEL_NAME", "openai/gpt-oss-20b")
+    return _env("GROQ_MODEL_NAME", "llama-3.3-70b-versatile")
+
+
+def get_main_llm(provider: Optional[str] = None):
+    provider = provider or LLM_PROVIDER
+    if provider == 'nvidia':
         nvidia_api_key = _env("NVIDIA_API_KEY")
         if nvidia_api_key:
             os.environ["NVIDIA_API_KEY"] = nvidia_api_key
         from langchain_nvidia_ai_endpoints import ChatNVIDIA
         return ChatNVIDIA(
-            model=_env("NVIDIA_MODEL_NAME", "openai/gpt-oss-20b"),
+            model=_main_llm_model('nvidia'),
             temperature=0.1,
         )
 
     groq_key = _env("GROQ_API_KEY") or _env("GROQ_SMALL_API_KEY") or _env("GROQ_SMALL_LLM")
-    groq_model = _env("GROQ_MODEL_NAME", "llama-3.3-70b-versatile")
-    return ChatGroq(api_key=groq_key, model=groq_model, temperature=0.1)
+    return ChatGroq(api_key=groq_key, model=_main_llm_model('groq'), temperature=0.1)
+
+
+def _secondary_provider() -> Optional[str]:
+    """The other provider, if it has a key; LLM_SECONDARY_PROVIDER overrides ("none" disables)."""
+    choice = _env("LLM_SECONDARY_PROVIDER").lower()
+    if choice in ("none", "off"):
+        return None
+    if not choice:
+        choice = "groq" if LLM_PROVIDER == "nvidia" else "nvidia"
+    if choice == LLM_PROVIDER:
+        return None
+    has_key = _env("NVIDIA_API_KEY") if choice == "nvidia" else _env("GROQ_API_KEY")
+    return choice if has_key else None
+
+
+def _build_llm_router() -> LLMRouter:
+    # The secondary client is built on the first routed call, off the event loop.
+    secondary = _secondary_provider() if config.LLM_HEDGE_ENABLED else None
+    factories = [(secondary, _main_llm_model(secondary), lambda: get_main_llm(secondary))] if secondary else []
+    return LLMRouter([(LLM_PROVIDER, _main_llm_model(LLM_PROVIDER), _main_llm)], factories)
 
 
 small_llm = get_small_llm()
 _main_llm = get_main_llm()
+llm_router = _build_llm_router()
+
+
+def get_llm_router_stats() -> dict:
+    return llm_router.get_stats()
 
 
 max_history       = config.MAX_HISTORY
@@ -200,16 +234,63 @@ max_tool_iterations = config.MAX_TOOL_ITERATIONS
 min_chunk_chars   = config.MIN_CHUNK_CHARS
 
 
+# tenacity catches BaseException, so a cancelled call (barge-in) would otherwise be retried.
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(min=1, max=5),
-    retry=retry_if_not_exception_type((BadRequestError, ValueError)),
+    retry=retry_if_not_exception_type((BadRequestError, ValueError, asyncio.CancelledError)),
     before_sleep=_log_llm_retry,
 )
 async def safe_llm_call(llm_with_tools, messages):
     return await llm_with_tools.ainvoke(messages)
 
 
+class LLMStreamInterrupted(RuntimeError):
+    """The stream broke after part of the reply was already spoken — not retried."""
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(min=1, max=5),
+    retry=retry_if_not_exception_type(
+        (BadRequestError, ValueError, LLMStreamInterrupted, asyncio.CancelledError)
+    ),
+    before_sleep=_log_llm_retry,
+)
+async def safe_llm_stream(llm_with_tools, messages, on_sentence):
+    """
+    Streaming twin of safe_llm_call. Each completed sentence of a plain-text
+    reply is awaited through on_sentence(sentence) while later tokens are still
+    arriving. Sentences completed before the first tool-call chunk (a preamble
+    such as "let me check") are spoken; text after it is muted. Returns the
+    aggregated AIMessage (content + tool_calls), same shape as ainvoke().
+    """
+    streamer = SentenceStreamer()
+    aggregated = None
+    emitted = False
+    try:
+        async for chunk in llm_with_tools.astream(messages):
+            aggregated = chunk if aggregated is None else aggregated + chunk
+            if getattr(chunk, "tool_call_chunks", None):
+                streamer.muted = True
+            if isinstance(chunk.content, str) and chunk.content:
+                for sentence in streamer.feed(chunk.content):
+                    emitted = True
+                    await on_sentence(sentence)
+        for sentence in streamer.flush():
+            emitted = True
+            await on_sentence(sentence)
+    except (BadRequestError, ValueError, LLMStreamInterrupted):
+        raise
+    except Exception as e:
+        if emitted:
+            raise LLMStreamInterrupted(f"LLM stream failed mid-reply: {e}") from e
+        raise
+    if aggregated is None:
+        return AIMessage(content="")
+    return message_chunk_to_message(aggregated)
+
+
 def _log_messages_sent(messages, label: str = "[LLM_MSGS]"):
     """
     Logs a brief summary of each message in the list so we can verify
@@ -309,6 +390,35 @@ User input:
         return {}
 
 
+_memory_extraction_stats = {
+    "rule_bypassed":       0,   # turns resolved by extract_memory_rules, no small-LLM call
+    "llm_calls":           0,
+    "rule_low_confidence": 0,   # rules recognised something but not enough of the turn
+    "rule_no_signal":      0,
+}
+
+
+async def extract_memory_fast(user_text: str, memory: dict, lang_code: str = "gu-IN",
+                              enabled_modules: List[str] = None):
+    """extract_memory(), skipping the small LLM when the rule-based extractor is confident."""
+    if config.MEMORY_RULES_ENABLED:
+        update, confidence, signals = extract_memory_rules(user_text, memory, enabled_modules)
+        if signals and confidence > config.MEMORY_RULES_MIN_CONFIDENCE:
+            _memory_extraction_stats["rule_bypassed"] += 1
+            log("[MEMORY]", f"Rules ({confidence:.2f}, {', '.join(signals)}) → {update}")
+            return update
+        _memory_extraction_stats["rule_low_confidence" if signals else "rule_no_signal"] += 1
+    _memory_extraction_stats["llm_calls"] += 1
+    return await extract_memory(user_text, memory, lang_code, enabled_modules)
+
+
+def get_memory_extraction_stats() -> dict:
+    stats = dict(_memory_extraction_stats)
+    total = stats["rule_bypassed"] + stats["llm_calls"]
+    stats["bypass_rate"] = round(stats["rule_bypassed"] / total, 4) if total else 0.0
+    return stats
+
+
 def merge_memory(old, new):
     for key, value in new.items():
         if isinstance(value, dict):
@@ -319,6 +429,133 @@ def merge_memory(old, new):
     return old
 
 
+# ── Speculative turn start (stable STT partials) ─────────────────────────────
+# Sarvam marks a transcript final only after its endpointing silence. When a
+# partial has not changed for SPECULATION_STABLE_MS, main.py starts a
+# SpeculativeTurn: memory extraction and the LLM/tool binding run during that
+# silence. run_brain commits the result if the final text is close enough
+# (SPECULATION_MIN_SIMILARITY) and memory / language / modules are unchanged;
+# otherwise it is discarded and the turn runs as usual.
+
+_speculation_stats = {
+    "started":    0,
+    "hits":       0,   # speculative extraction used by run_brain
+    "misses":     0,   # final text differed too much
+    "stale":      0,   # memory / language / modules changed since the partial
+    "discarded":  0,   # superseded by a newer partial or never reached extraction
+    "saved_ms_total": 0.0,
+    "last_saved_ms":  0.0,
+}
+
+
+def _speculation_key(text: str) -> str:
+    # Punctuation / whitespace only — \w would drop Gujarati and Devanagari vowel signs.
+    return " ".join(_re.sub(r"[.,!?;:'\"()\-\u0964\u0965]+", " ", text.lower()).split())
+
+
+def _slot_signature(text: str) -> tuple:
+    """Numbers plus what the rule extractor reads as date, time, intent and yes/no."""
+    digits = tuple(_re.findall(r"\d+", text.translate(_INDIC_DIGITS)))
+    update, _, signals = extract_memory_rules(text, {}, [BOOKING_MODULE])
+    appointment = update.get("appointment") or {}
+    return (
+        digits, appointment.get("date"), appointment.get("time"), update.get("intent"),
+        update.get("language_preference"), tuple(sorted(s for s in signals if s in ("yes", "no"))),
+    )
+
+
+class SpeculativeTurn:
+    """Memory extraction + LLM binding started on a stable partial transcript."""
+
+    def __init__(self, partial_text: str, memory: dict, lang_code: str,
+                 tenant_id: Optional[str], enabled_modules: List[str]):
+        self.text = normalize_gujarati_time(partial_text)
+        self.key = _speculation_key(self.text)
+        self.slots = _slot_signature(self.text)
+        self.memory_sig = json.dumps(memory, sort_keys=True, default=str)
+        self.lang_code = lang_code
+        self.tenant_id = tenant_id
+        self.enabled_modules = list(enabled_modules)
+        self.started_at = asyncio.get_running_loop().time()
+        self.finished_at: Optional[float] = None
+        self.resolved = False
+        self._mem_task = asyncio.create_task(
+            extract_memory_fast(self.text, memory, lang_code, self.enabled_modules)
+        )
+        self._mem_task.add_done_callback(self._on_done)
+        self._llm_future = asyncio.get_running_loop().run_in_executor(
+            None, get_llm_with_tools, tenant_id or "", self.enabled_modules
+        )
+        _speculation_stats["started"] += 1
+        log("[SPECULATE]", f"Started on partial: '{self.text}'")
+
+    def _on_done(self, _task):
+        self.finished_at = asyncio.get_running_loop().time()
+
+    def same_text(self, text: str) -> bool:
+        return _speculation_key(normalize_gujarati_time(text)) == self.key
+
+    def similarity(self, text: str) -> float:
+        return SequenceMatcher(None, self.key, _speculation_key(text)).ratio()
+
+    def usable_for(self, user_text: str, memory: dict, lang_code: str,
+                   tenant_id: Optional[str], enabled_modules: List[str]) -> bool:
+        """Whether run_brain may take this result for user_text; a rejection is counted."""
+        if self.resolved:
+            return False
+        if (
+            json.dumps(memory, sort_keys=True, default=str) != self.memory_sig
+            or lang_code != self.lang_code
+            or tenant_id != self.tenant_id
+            or sorted(enabled_modules) != sorted(self.enabled_modules)
+        ):
+            self._reject("stale", "context changed since the partial")
+            return False
+        ratio = self.similarity(user_text)
+        if ratio < config.SPECULATION_MIN_SIMILARITY:
+            self._reject("misses", f"similarity {ratio:.2f} | partial='{self.text}'")
+            return False
+        # "… at 4 pm" vs "… at 5 pm" is 0.96 similar but a different slot.
+        if _slot_signature(normalize_gujarati_time(user_text)) != self.slots:
+            self._reject("misses", f"date/time/intent differ | partial='{self.text}'")
+            return False
+        return True
+
+    async def commit(self):
+        """(extracted memory, (llm_with_tools, tools)) — same shape as the normal path."""
+        self.resolved = True
+        now = asyncio.get_running_loop().time()
+        saved_ms = ((self.finished_at or now) - self.started_at) * 1000.0
+        result = await asyncio.gather(self._mem_task, self._llm_future)
+        _speculation_stats["hits"] += 1
+        _speculation_stats["saved_ms_total"] += saved_ms
+        _speculation_stats["last_saved_ms"] = saved_ms
+        log("[SPECULATE]", f"HIT — memory extraction ~{saved_ms:.0f} ms ahead of the final")
+        return result
+
+    def discard(self, reason: str = "superseded"):
+        if self.resolved:
+            return
+        self._reject("discarded", reason)
+
+    def _reject(self, counter: str, reason: str):
+        self.resolved = True
+        self._mem_task.cancel()
+        _speculation_stats[counter] += 1
+        label = {"misses": "MISS"}.get(counter, counter.upper())
+        log("[SPECULATE]", f"{label} — {reason}")
+
+
+def get_speculation_stats() -> dict:
+    stats = dict(_speculation_stats)
+    decided = stats["hits"] + stats["misses"] + stats["stale"]
+    stats["hit_rate"] = round(stats["hits"] / decided, 4) if decided else 0.0
+    stats["avg_saved_ms"] = round(stats["saved_ms_total"] / stats["hits"], 1) if stats["hits"] else 0.0
+    stats["saved_ms_total"] = round(stats["saved_ms_total"], 1)
+    stats["last_saved_ms"] = round(stats["last_saved_ms"], 1)
+    return stats
+
+
 # ── Pure-Python language detector (zero LLM cost, <1ms) ─────────────────────
 # Reads the user's message for explicit language requests and returns the
 # requested language code. The main LLM is already instructed to ask the user
@@ -423,6 +660,75 @@ def _is_mutating_tool(tool_name: str) -> bool:
     return tool_name in _MUTATING_TOOLS
 
 
+def rollback_interrupted_turn(session_data: dict) -> int:
+    """
+    After a turn was cancelled mid-way (barge-in), drop a trailing tool-call
+    exchange (AIMessage with tool_calls / ToolMessages) so the history the next
+    turn sends to the LLM is well-formed. The user's message is kept, and so is
+    a completed exchange that wrote to the calendar — without it the next turn
+    would not know the booking / cancel / reschedule happened.
+    Returns the number of messages removed.
+    """
+    history = session_data.get("history") or []
+    start = len(history)
+    while start and (
+        isinstance(history[start - 1], ToolMessage)
+        or (isinstance(history[start - 1], AIMessage) and history[start - 1].tool_calls)
+    ):
+        start -= 1
+
+    keep = i = start
+    while i < len(history):
+        ai_msg, j, answered = history[i], i + 1, set()
+        while j < len(history) and isinstance(history[j], ToolMessage):
+            answered.add(history[j].tool_call_id)
+            j += 1
+        if not isinstance(ai_msg, AIMessage) or {tc["id"] for tc in ai_msg.tool_calls} - answered:
+            break
+        if any(_is_mutating_tool(tc["name"]) for tc in ai_msg.tool_calls):
+            keep = j
+        i = j
+
+    removed = len(history) - keep
+    del history[keep:]
+    return removed
+
+
+async def settle_interrupted_turn(session_data: dict) -> int:
+    """
+    Called once a barge-in cancelled run_brain: waits for a shielded tool round
+    that is still writing to the calendar (it finishes its state reset and adds
+    its ToolMessages to history), then rolls back what is left over.
+    """
+    tool_round = session_data.pop("_tool_round", None)
+    if tool_round is not None and not tool_round.done():
+        log("[BARGE_IN]", "Waiting for the calendar write in flight to finish")
+    if tool_round is not None:
+        try:
+            await tool_round
+        except Exception as e:
+            log("[BARGE_IN]", f"Tool round failed after barge-in: {e}")
+    return rollback_interrupted_turn(session_data)
+
+
+def _reset_after_completed_action(session_data: dict):
+    """Clear booking memory / confirmation state once a mutating tool succeeded."""
+    print("$$$state memory cleared after success$$$")
+    lang_pref = session_data.get("memory", {}).get("language_preference")
+    session_data["memory"] = {
+        "intent": "none",
+        "language_preference": lang_pref,
+        "pending_action": "none",
+        "appointment": {"date": None, "time": None, "duration": None},
+        "reschedule": {"old_time": None, "new_time": None},
+        "date_context": {"resolved_date": None, "source": "none"}
+    }
+    session_data["confirmation_state"] = _confirmation_state_default()
+    session_data.pop("_confirmed_action", None)
+    # Force module re-fetch next turn in case config changed
+    session_data.pop("enabled_modules", None)
+
+
 def _confirmation_state_default() -> dict:
     return {
         "status": "idle",  # idle | awaiting_confirmation | confirmed
@@ -515,25 +821,26 @@ def _payload_same(a: dict, b: dict) -> bool:
     return json.dumps(a or {}, sort_keys=True) == json.dumps(b or {}, sort_keys=True)
 
 
+_NO_MARKERS = [
+    "no", "nope", "not now", "don't", "do not", "cancel it", "stop",
+    "ના", "નહી", "નહીં", "બંધ", "રોકો",
+    "नहीं", "ना", "मत", "रोकिए",
+]
+_YES_MARKERS = [
+    "yes", "yeah", "yep", "ok", "okay", "confirm", "go ahead", "book it",
+    "હા", "હાં", "ઓકે", "કન્ફર્મ", "કરી દો",
+    "हाँ", "हा", "ठीक है", "कन्फर्म", "कर दो",
+]
+
+
 def _detect_confirmation_intent(text: str) -> Optional[str]:
     if not text:
         return None
     t = re.sub(r"\s+", " ", text.lower()).strip()
 
-    no_markers = [
-        "no", "nope", "not now", "don't", "do not", "cancel it", "stop",
-        "ના", "નહી", "નહીં", "બંધ", "રોકો",
-        "नहीं", "ना", "मत", "रोकिए",
-    ]
-    yes_markers = [
-        "yes", "yeah", "yep", "ok", "okay", "confirm", "go ahead", "book it",
-        "હા", "હાં", "ઓકે", "કન્ફર્મ", "કરી દો",
-        "हाँ", "हा", "ठीक है", "कन्फर्म", "कर दो",
-    ]
-
-    if any(w in t for w in no_markers):
+    if any(w in t for w in _NO_MARKERS):
         return "no"
-    if any(w in t for w in yes_markers):
+    if any(w in t for w in _YES_MARKERS):
         return "yes"
     return None
 
@@ -676,6 +983,135 @@ def _build_tool_limit_reply(lang_code: str) -> str:
     return "Sorry, I ran into a small issue while completing that request. Please say it again clearly."
 
 
+def _build_action_done_reply(lang_code: str, action: str, payload: dict) -> str:
+    """Templated success reply for a confirmed action run by _execute_confirmed_action."""
+    lang_code = _normalize_lang_code(lang_code)
+    when = _fmt_dt_for_confirmation(payload.get("start_time_str"))
+    old_when = _fmt_dt_for_confirmation(payload.get("old_start_time_str"))
+    new_when = _fmt_dt_for_confirmation(payload.get("new_start_time_str"))
+    if lang_code == "gu-IN":
+        if action == "book":
+            return f"તમારી {when} ની એપોઇન્ટમેન્ટ બુક થઈ ગઈ છે."
+        if action == "cancel":
+            return f"તમારી {when} ની એપોઇન્ટમેન્ટ રદ કરી દીધી છે."
+        return f"તમારી એપોઇન્ટમેન્ટ {old_when} થી {new_when} પર ખસેડી દીધી છે."
+    if lang_code == "hi-IN":
+        if action == "book":
+            return f"आपकी {when} की अपॉइंटमेंट बुक हो गई है।"
+        if action == "cancel":
+            return f"आपकी {when} की अपॉइंटमेंट रद्द कर दी गई है।"
+        return f"आपकी अपॉइंटमेंट {old_when} से {new_when} पर कर दी गई है।"
+    if action == "book":
+        return f"Your appointment for {when} is booked."
+    if action == "cancel":
+        return f"Your appointment for {when} has been cancelled."
+    return f"Your appointment has been moved from {old_when} to {new_when}."
+
+
+def _build_action_failed_reply(lang_code: str, action: str, payload: dict, error_text: str) -> str:
+    """Templated failure reply; the reason is read from the calendar tool's error string."""
+    lang_code = _normalize_lang_code(lang_code)
+    err = (error_text or "").lower()
+    target = payload.get("new_start_time_str") if action == "reschedule" else payload.get("start_time_str")
+
+    ranges = _extract_hours_ranges(error_text or "")
+    if ranges:
+        try:
+            req_time = datetime.fromisoformat(str(target)).strftime("%I:%M %p").lstrip("0")
+        except Exception:
+            req_time = None
+        return _build_out_of_hours_reply(lang_code, req_time, ranges)
+
+    if "occupied" in err or "busy" in err:
+        reason = "taken"
+    elif "past" in err:
+        reason = "past"
+    elif "no appointment found" in err or "no calendar event found" in err:
+        reason, target = "not_found", payload.get("old_start_time_str") or payload.get("start_time_str")
+    else:
+        reason = "generic"
+    when = _fmt_dt_for_confirmation(target)
+
+    replies = {
+        "gu-IN": {
+            "taken": f"માફ કરશો, {when} નો સ્લોટ પહેલેથી બુક છે. કૃપા કરીને બીજો સમય જણાવો.",
+            "past": f"માફ કરશો, {when} નો સમય વીતી ગયો છે. કૃપા કરીને આગળનો સમય જણાવો.",
+            "not_found": f"માફ કરશો, {when} ના સમયે તમારી કોઈ એપોઇન્ટમેન્ટ મળી નથી.",
+            "generic": "માફ કરશો, અત્યારે આ કામ પૂર્ણ થઈ શક્યું નથી. કૃપા કરીને થોડી વાર પછી ફરી પ્રયત્ન કરો.",
+        },
+        "hi-IN": {
+            "taken": f"माफ़ कीजिए, {when} का स्लॉट पहले से बुक है। कृपया कोई दूसरा समय बताइए।",
+            "past": f"माफ़ कीजिए, {when} का समय निकल चुका है। कृपया आगे का कोई समय बताइए।",
+            "not_found": f"माफ़ कीजिए, {when} पर आपकी कोई अपॉइंटमेंट नहीं मिली।",
+            "generic": "माफ़ कीजिए, अभी यह काम पूरा नहीं हो सका। कृपया थोड़ी देर बाद फिर प्रयास करें।",
+        },
+        "en-IN": {
+            "taken": f"Sorry, the {when} slot is already taken. Please tell me another time.",
+            "past": f"Sorry, {when} is already in the past. Please choose a later time.",
+            "not_found": f"Sorry, I couldn't find an appointment at {when}.",
+            "generic": "Sorry, I couldn't complete that right now. Please try again shortly.",
+        },
+    }
+    return replies.get(lang_code, replies["en-IN"])[reason]
+
+
+def _build_booking_calendar_texts(lang_code: str) -> tuple:
+    """(calendar_prompt message, chat reply with <br> breaks) after a successful booking."""
+    if "gu" in lang_code:
+        cal_msg = "મેં તમારી નિમણૂક સફળતાપૂર્વક બુક કરી છે. શું તમે તેને તમારા કેલેન્ડરમાં ઉમેરવા માંગો છો?"
+        force_text = "મેં તમારી નિમણૂક સફળતાપૂર્વક બુક કરી છે.<br><br>શું તમે તેને તમારા કેલેન્ડરમાં ઉમેરવા માંગો છો?<br><br>"
+    elif "hi" in lang_code:
+        cal_msg = "मैंने आपकी अपॉइंटमेंट सफलतापूर्वक बुक कर ली है। क्या आप इसे अपने कैलेंडर में जोड़ना चाहेंगे?"
+        force_text = "मैंने आपकी अपॉइंटमेंट सफलतापूर्वक बुक कर ली है।<br><br>क्या आप इसे अपने कैलेंडर में जोड़ना चाहेंगे?<br><br>"
+    else:
+        cal_msg = "I've booked your appointment successfully. Would you like to add it to your calendar?"
+        force_text = "I've booked your appointment successfully.<br><br>Would you like to add it to your calendar?<br><br>"
+    return cal_msg, force_text
+
+
+def _build_language_question(lang_code: str, receptionist: str) -> str:
+    question_map = {
+        "gu-IN": f"નમસ્તે! હું {receptionist} છું. તમે ગુજરાતી, હિન્દી કે અંગ્રેજીમાં વાત કરશો?",
+        "hi-IN": f"नमस्ते! मैं {receptionist} हूँ। क्या आप गुजराती, हिन्दी या अंग्रेज़ी में बात करना चाहेंगे?",
+        "en-IN": f"Hello! I'm {receptionist}. Would you prefer Gujarati, Hindi, or English?",
+    }
+    return question_map.get(lang_code, question_map["en-IN"])
+
+
+_SUPPORTED_LANGS = ("gu-IN", "hi-IN", "en-IN")
+
+
+def fixed_tts_phrases(bot_config: dict) -> List[tuple]:
+    """
+    (text, speaker, lang) for every reply a tenant speaks verbatim — greeting,
+    unclear-input prompt, first-turn language question, tool-limit reply and
+    the error fallbacks. Used to pre-render services/tts_cache.py on config save.
+    Texts are passed through split_into_sentences exactly as they are spoken.
+    """
+    bot_config = bot_config or {}
+    speaker = bot_config.get("tts_speaker", "simran")
+    db_lang = _normalize_lang_code(bot_config.get("language_code", "gu-IN"))
+    receptionist = bot_config.get("receptionist_name") or "Priya"
+
+    phrases = []
+    greeting = (bot_config.get("greeting_message") or "").strip()
+    if greeting:
+        phrases.append((greeting, db_lang))
+    phrases.append((_build_language_question(db_lang, receptionist), db_lang))
+    # _get_fallback_message picks its text from keywords in the error string.
+    sample_errors = [Exception("rate_limit"), Exception("timeout"), Exception("connection"), Exception("")]
+    for lang in _SUPPORTED_LANGS:
+        phrases.append((prompts.LANG_PACK.get(lang, prompts.LANG_PACK["gu-IN"])["unclear_msg"], lang))
+        phrases.append((_build_tool_limit_reply(lang), lang))
+        phrases.extend((_get_fallback_message(err, lang), lang) for err in sample_errors)
+    # After a language switch run_brain speaks with "simran" (_SPEAKER_MAP).
+    speakers = {speaker, "simran"}
+    return [
+        (" ".join(split_into_sentences(text)), spk, lang)
+        for text, lang in phrases for spk in sorted(speakers)
+    ]
+
+
 def _extract_hours_ranges(error_text: str) -> Optional[str]:
     m = re.search(
         r"business hours:\s*(.+?)\.\s*Please choose a different time",
@@ -767,7 +1203,7 @@ def normalize_gujarati_time(text: str) -> str:
             text = text.replace(phrase, f"{h}:{m:02d}")
     text = normalize_variants(text)
     for prefix, minutes, offset in [("સવા", 15, 0), ("સાડા", 30, 0), ("પોણા", 45, -1)]:
-        match = re.search(rf"{prefix}\s*(\w+)", text)
+        match = re.search(rf"{prefix}\s*(\S+)", text)   # \S: \w stops at Gujarati vowel signs
         if match:
             hour_word = match.group(1)
             hour = GUJ_NUMBERS.get(hour_word) or GUJ_NUMBERS.get(hour_word.lower())
@@ -777,6 +1213,309 @@ def normalize_gujarati_time(text: str) -> str:
     return text
 
 
+# ── Rule-based memory extraction (fast path) ─────────────────────────────────
+# Simple turns — "હા", "કાલે 11 વાગ્યે", "tomorrow at 4", "Hindi please" —
+# are resolved here without the small LLM. extract_memory_rules() returns an
+# update shaped like extract_memory()'s output plus a confidence: the share of
+# the utterance's words the rules accounted for. Anything it cannot place
+# (a name, a bare number, a reschedule with two times) lowers the confidence,
+# and unless it is above MEMORY_RULES_MIN_CONFIDENCE the small LLM runs
+# instead. Questions ("is 4 pm free tomorrow?") always go to the LLM: they
+# name a slot but are queries, not bookings.
+# Input is expected after normalize_gujarati_time (સવા / સાડા / પોણા → H:MM).
+
+_INDIC_DIGITS = str.maketrans("૦૧૨૩૪૫૬૭૮૯०१२३४५६७८९", "01234567890123456789")
+_RULE_PUNCT_RE = _re.compile(r"[,!?;'\"()।॥]+|(?<!\d)\.|\.(?!\d)")
+_B, _E = r"(?<!\S)", r"(?!\S)"     # whitespace word boundaries (\b is unreliable for Indic text)
+
+_REL_DATES = [
+    (r"day after tomorrow|પરમ(?:\s*દિવસે|દિવસે|ે)?|परसों|परसो|parso|parsho|param", 2),
+    (r"tomorrow|આવતીકાલે|આવતીકાલ|કાલે|કાલ(?:ની|નો|ના|નું)?|कल|kale|kal|kaale", 1),
+    (r"today|આજે|આજ(?:ની|નો|ના|નું)?|आज|aaje|aaj|aje", 0),
+]
+_WEEKDAYS = {
+    0: ["monday", "સોમવાર", "सोमवार", "somvar"],
+    1: ["tuesday", "મંગળવાર", "मंगलवार", "mangalvar"],
+    2: ["wednesday", "બુધવાર", "बुधवार", "budhvar"],
+    3: ["thursday", "ગુરુવાર", "ગુરૂવાર", "गुरुवार", "बृहस्पतिवार", "guruvar"],
+    4: ["friday", "શુક્રવાર", "शुक्रवार", "shukravar"],
+    5: ["saturday", "શનિવાર", "शनिवार", "shanivar"],
+    6: ["sunday", "રવિવાર", "रविवार", "ravivar"],
+}
+_MONTHS = {
+    1: ["january", "jan", "જાન્યુઆરી", "जनवरी"],
+    2: ["february", "feb", "ફેબ્રુઆરી", "फरवरी"],
+    3: ["march", "mar", "માર્ચ", "मार्च"],
+    4: ["april", "apr", "એપ્રિલ", "अप्रैल"],
+    5: ["may", "મે", "मई"],
+    6: ["june", "jun", "જૂન", "જુન", "जून"],
+    7: ["july", "jul", "જુલાઈ", "जुलाई"],
+    8: ["august", "aug", "ઓગસ્ટ", "अगस्त"],
+    9: ["september", "sep", "sept", "સપ્ટેમ્બર", "सितंबर", "सितम्बर"],
+    10: ["october", "oct", "ઓક્ટોબર", "अक्टूबर"],
+    11: ["november", "nov", "નવેમ્બર", "नवंबर", "नवम्बर"],
+    12: ["december", "dec", "ડિસેમ્બર", "दिसंबर", "दिसम्बर"],
+}
+_DATE_SUFFIX = r"(?:ે|ના|ની|નો|નું|e|th|st|nd|rd)?"
+
+_HOUR_WORDS = {
+    **{k: v for k, v in GUJ_NUMBERS.items() if not k.isdigit()},
+    "एक": 1, "दो": 2, "तीन": 3, "चार": 4, "पांच": 5, "पाँच": 5, "छह": 6, "छः": 6,
+    "सात": 7, "आठ": 8, "नौ": 9, "दस": 10, "ग्यारह": 11, "बारह": 12,
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10,
+}
+_HOUR = r"(\d{1,2}|" + "|".join(sorted(map(_re.escape, _HOUR_WORDS), key=len, reverse=True)) + r")"
+_TIME_MARK = r"(?:વાગ્યે|વાગે|વાગ્યા(?:ની|નો|ના|નું)?|वाग्ये|बजे|बजकर|baje|vagye|vage|vagya|o\s?clock|oclock)"
+_MERIDIEM = r"(a\s?m|p\s?m)"
+_DAYPARTS = [
+    (r"સવારે|સવારના|સવાર|सुबह|morning|savare|subah", "am"),
+    (r"બપોરે|બપોરના|બપોર|दोपहर|afternoon|noon|bapore|dopahar", "pm"),
+    (r"સાંજે|સાંજના|સાંજ|शाम|evening|sanje|shaam|sham", "pm"),
+    (r"રાત્રે|રાતના|રાત|रात|night|ratre|raat", "pm"),
+]
+_HINDI_FRACTIONS = [            # Gujarati forms are rewritten by normalize_gujarati_time
+    (r"सवा|sava", 15, 0), (r"साढ़े|साढे|sadhe|saade", 30, 0), (r"पौने|paune", 45, -1),
+]
+
+_INTENT_WORDS = [
+    ("cancel", r"cancel|કેન્સલ|કૅન્સલ|રદ|कैंसल|कैंसिल|रद्द|radd"),
+    ("reschedule", r"reschedule|re schedule|રીશેડ્યૂલ|રિશેડ્યૂલ|રીશેડ્યુલ|બદલ\S*|बदल\S*|badal\S*|change|shift|postpone|prepone"),
+    ("book", r"book|booking|બુક|બુકિંગ|बुक|बुकिंग"),
+]
+_APPOINTMENT_WORDS = (r"appointment|અપોઇન્ટમેન્ટ|એપોઇન્ટમેન્ટ|અપોઈન્ટમેન્ટ|એપોઈન્ટમેન્ટ|"
+                      r"अपॉइंटमेंट|अपोइंटमेंट|slot|સ્લોટ|स्लॉट")
+
+_QUESTION_WORDS = (
+    r"what|when|which|where|who|why|how|available|availability|free|open|vacant|"
+    r"શું|શુ|ક્યારે|કયો|કયા|કઈ|કઇ|કયું|કેટલા|કેટલી|કેટલું|કેટલો|ક્યાં|કેમ|કોણ|ખાલી|ઉપલબ્ધ|"
+    r"क्या|कब|कौन|कौनसा|कितने|कितना|कितनी|कहाँ|कहां|क्यों|कैसे|खाली|उपलब्ध|"
+    r"kya|kab|kaun|kitne|kitna|kahan|kyare|kyaare|shu|ketla|ketli|khali"
+)
+_QUESTION_LEAD = r"^\s*(?:is|are|do|does|did|have|has)\s"     # "is 4 pm ok", "do you have ..."
+
+
+def _is_question(text: str) -> bool:
+    t = text.lower()
+    return (
+        "?" in t
+        or _re.search(_QUESTION_LEAD, t) is not None
+        or _re.search(_B + r"(?:" + _QUESTION_WORDS + r")" + _E, _RULE_PUNCT_RE.sub(" ", t)) is not None
+    )
+
+
+_RULE_FILLERS = set("""
+મને મારે મારી મારો મારું માટે છે છું જોઈએ જોઇએ કરો કરી કરવી કરવું કરવાની કરાવવી દો દેજો આપો આપજો
+કરજો ચાલશે ચાલે બરાબર પ્લીઝ જી સર મેડમ તો એ પણ નું ની નો ને થી માં વાળો વાળી વાળું સમય ટાઇમ ટાઈમ
+ઠીક હું તમે આભાર આવતા આવતી આવતે આવતો માં આવવું આવીશ આવું
+मुझे मेरा मेरी मेरे चाहिए के लिए है हैं को का की में से वाला वाली करो करें करना कर दीजिए दें
+ठीक जी प्लीज़ प्लीज सर मैडम अगले अगला अगली भी तो समय टाइम धन्यवाद मैं आप
+i d want would like need to an a the at for on is it that this please fine works work me my can
+you time of next sir madam thanks thank make set schedule do will be good great just continue
+mane mare mate che chhe joie joiye karo kari dejo aapo chalse chalshe valo vaalo ji
+""".split())
+
+
+def _consume(text: str, pattern: str):
+    """Match pattern as whole words; returns (match or None, text with the match blanked)."""
+    m = _re.search(_B + r"(?:" + pattern + r")" + _E, text)
+    if not m:
+        return None, text
+    return m, text[:m.start()] + " " * (m.end() - m.start()) + text[m.end():]
+
+
+def _rule_hour(word: str) -> Optional[int]:
+    return int(word) if word.isdigit() else _HOUR_WORDS.get(word)
+
+
+def _rule_clock(hour: int, minute: int, meridiem: Optional[str], daypart: Optional[str]) -> Optional[str]:
+    if meridiem == "am" or (meridiem is None and daypart == "am"):
+        hour = 0 if hour == 12 and meridiem == "am" else hour
+    elif meridiem == "pm" or daypart == "pm":
+        hour = hour + 12 if hour < 12 else hour
+    elif 1 <= hour <= 7:
+        hour += 12                 # "1 વાગ્યે" → 13:00, as in the memory prompt's example
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+
+def _rule_date(text: str, today):
+    """(text, "YYYY-MM-DD", source) for the first date expression found, else (text, None, None)."""
+    for pattern, days in _REL_DATES:
+        m, text = _consume(text, pattern)
+        if m:
+            return text, (today + timedelta(days=days)).isoformat(), "relative"
+
+    for weekday, names in _WEEKDAYS.items():
+        m, text = _consume(text, "(?:" + "|".join(names) + ")" + _DATE_SUFFIX)
+        if m:
+            ahead = (weekday - today.weekday()) % 7 or 7
+            return text, (today + timedelta(days=ahead)).isoformat(), "relative"
+
+    def _build(day: int, month: int, year: Optional[int]):
+        try:
+            d = datetime(year or today.year, month, day).date()
+        except ValueError:
+            return None
+        if year is None and d < today:
+            d = d.replace(year=d.year + 1)
+        return d.isoformat()
+
+    m, rest = _consume(text, r"(\d{4})-(\d{1,2})-(\d{1,2})")
+    if m:
+        return rest, _build(int(m.group(3)), int(m.group(2)), int(m.group(1))), "absolute"
+    m, rest = _consume(text, r"(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))?")
+    if m:
+        year = int(m.group(3)) if m.group(3) else None
+        if year is not None and year < 100:
+            year += 2000
+        return rest, _build(int(m.group(1)), int(m.group(2)), year), "absolute"
+    month_alt = "|".join(n for names in _MONTHS.values() for n in names)
+    month_of = {n: num for num, names in _MONTHS.items() for n in names}
+    m, rest = _consume(text, r"(\d{1,2})" + _DATE_SUFFIX + r"\s+(" + month_alt + r")" + _DATE_SUFFIX)
+    if m:
+        return rest, _build(int(m.group(1)), month_of[m.group(2)], None), "absolute"
+    m, rest = _consume(text, r"(" + month_alt + r")\s+(\d{1,2})" + _DATE_SUFFIX)
+    if m:
+        return rest, _build(int(m.group(2)), month_of[m.group(1)], None), "absolute"
+    m, rest = _consume(text, r"(\d{1,2})\s*(?:તારીખે|તારીખ|तारीख|tarikh|tarikhe|tareekh)(?:\s*को)?")
+    if m:
+        day = int(m.group(1))
+        try:
+            d = today.replace(day=day)
+        except ValueError:
+            return rest, None, None
+        if d < today:
+            nxt = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+            try:
+                d = nxt.replace(day=day)
+            except ValueError:
+                return rest, None, None
+        return rest, d.isoformat(), "absolute"
+    return text, None, None
+
+
+def _rule_time(text: str):
+    """(text, "HH:MM") for the first time expression found, else (text, None)."""
+    daypart = None
+    for pattern, part in _DAYPARTS:
+        m, text = _consume(text, pattern)
+        if m:
+            daypart = part
+            break
+
+    m, rest = _consume(text, r"(\d{1,2})[:.](\d{2})(?:\s*" + _MERIDIEM + r")?(?:\s*" + _TIME_MARK + r")?")
+    if m:
+        return rest, _rule_clock(int(m.group(1)), int(m.group(2)), (m.group(3) or "").replace(" ", "") or None, daypart)
+    for pattern, minutes, offset in _HINDI_FRACTIONS:
+        m, rest = _consume(text, r"(?:" + pattern + r")\s+" + _HOUR + r"(?:\s*" + _TIME_MARK + r")?")
+        if m and _rule_hour(m.group(1)):
+            return rest, _rule_clock(_rule_hour(m.group(1)) + offset, minutes, None, daypart)
+    m, rest = _consume(text, r"(?:डेढ़|डेढ|dedh|ढाई|dhai)(?:\s*" + _TIME_MARK + r")?")
+    if m:
+        return rest, _rule_clock(1 if m.group(0).startswith(("डे", "de")) else 2, 30, None, daypart)
+    m, rest = _consume(text, _HOUR + r"\s*" + _MERIDIEM + r"(?:\s*" + _TIME_MARK + r")?")
+    if m and _rule_hour(m.group(1)):
+        return rest, _rule_clock(_rule_hour(m.group(1)), 0, m.group(2).replace(" ", ""), daypart)
+    m, rest = _consume(text, _HOUR + r"\s*" + _TIME_MARK)
+    if m and _rule_hour(m.group(1)):
+        return rest, _rule_clock(_rule_hour(m.group(1)), 0, None, daypart)
+    m, rest = _consume(text, r"(?:at|@)\s+(\d{1,2})")
+    if m:
+        return rest, _rule_clock(int(m.group(1)), 0, None, daypart)
+    if daypart:
+        m, rest = _consume(text, r"(\d{1,2})")           # "સવારે 9", "morning 9"
+        if m:
+            return rest, _rule_clock(int(m.group(1)), 0, None, daypart)
+    return text, None
+
+
+def extract_memory_rules(user_text: str, memory: dict, enabled_modules: List[str] = None,
+                         today=None):
+    """
+    Deterministic memory update for simple turns.
+    Returns (update, confidence, signals); confidence is 0.0 when nothing was
+    recognised or the turn needs the LLM (question, reschedule times,
+    disabled module).
+    """
+    if enabled_modules is None:
+        enabled_modules = [BOOKING_MODULE]
+    today = today or datetime.now().date()
+    memory = memory or {}
+
+    text = _RULE_PUNCT_RE.sub(" ", user_text.lower().translate(_INDIC_DIGITS))
+    text = _re.sub(r"(\d)(?=[^\d\s:./-])", r"\1 ", text)      # "11વાગ્યે" → "11 વાગ્યે"
+    total = len(text.split())
+    if total == 0:
+        return {}, 0.0, []
+    if _is_question(user_text):
+        return {}, 0.0, ["question"]
+    signals: List[str] = []
+    update: dict = {}
+
+    requested_lang = detect_requested_language(user_text)
+    if requested_lang:
+        for verb in sorted(_REQUEST_VERBS, key=len, reverse=True):
+            _, text = _consume(text, _re.escape(verb))
+        for names in _LANG_NAMES.values():
+            for name in names:
+                _, text = _consume(text, _re.escape(name))
+        update["language_preference"] = requested_lang
+        signals.append("language")
+
+    no_m, text = _consume(text, "|".join(map(_re.escape, sorted(_NO_MARKERS, key=len, reverse=True))))
+    yes_m, text = _consume(text, "|".join(map(_re.escape, sorted(_YES_MARKERS, key=len, reverse=True))))
+    if no_m and yes_m:
+        return {}, 0.0, ["yes+no"]
+    if no_m or yes_m:
+        signals.append("no" if no_m else "yes")
+
+    intent = None
+    for name, pattern in _INTENT_WORDS:
+        m, text = _consume(text, pattern)
+        if m and intent is None:
+            intent = name
+    appt_m, text = _consume(text, _APPOINTMENT_WORDS)
+
+    text, date, source = _rule_date(text, today)
+    text, hhmm = _rule_time(text)
+    if date:
+        signals.append("date")
+    if hhmm:
+        signals.append("time")
+
+    if intent is None and (appt_m or date or hhmm) and memory.get("intent") in (None, "none", "query"):
+        intent = "book"
+    if intent:
+        signals.append(f"intent:{intent}")
+        update["intent"] = intent
+
+    if no_m and (date or hhmm):
+        return {}, 0.0, signals + ["no+slot"]            # "not tomorrow at 4": rejects the slot it names
+    if (intent or date or hhmm) and BOOKING_MODULE not in enabled_modules:
+        return {}, 0.0, signals + ["booking disabled"]
+    if (intent or memory.get("intent")) == "reschedule" and (date or hhmm):
+        return {}, 0.0, signals + ["reschedule times"]   # old vs new time: leave to the LLM
+
+    if date:
+        update.setdefault("appointment", {})["date"] = date
+        update["date_context"] = {"resolved_date": date, "source": source}
+    if hhmm:
+        update.setdefault("appointment", {})["time"] = hhmm
+    if date or hhmm:
+        if (intent or memory.get("intent")) in ("book", "cancel"):
+            update["pending_action"] = "waiting_for_confirmation"
+    elif yes_m:
+        update["pending_action"] = "none"
+
+    if not signals:
+        return {}, 0.0, []
+    unknown = [w for w in text.split() if w not in _RULE_FILLERS]
+    confidence = round(1.0 - len(unknown) / total, 3)
+    return update, max(confidence, 0.0), signals
+
+
 # ── TTS helpers ───────────────────────────────────────────────────────────────
 
 _TOOL_BLOCK_RE = re.compile(
@@ -827,6 +1566,85 @@ def split_into_sentences(text: str) -> List[str]:
     return chunks or [text]
 
 
+class SentenceStreamer:
+    """
+    Incremental split_into_sentences for streamed LLM text: same boundary regex
+    and min_chunk_chars. feed(delta) returns the chunks completed so far,
+    flush() the remainder (a short tail becomes its own chunk, since the
+    previous one has already been spoken).
+
+    Tool-call markup is filtered on the fly: text is only released up to a
+    boundary outside any open {...} / <function=...> block, then cleaned with
+    clean_for_tts. A reply that starts as tool output is muted entirely, like
+    the is_tool_output check on the full reply.
+    """
+
+    _BOUNDARY_RE = re.compile(r'(?<=[.!?।\u0964])\s+')
+    _TOOL_PREFIXES = ("{", "[{", "<function=")
+
+    def __init__(self):
+        self.text = ""      # raw text received so far
+        self.muted = False
+        self._pos = 0       # self.text[:_pos] has been consumed
+        self._buffer = ""   # parts waiting to reach min_chunk_chars
+
+    @staticmethod
+    def _block_open(text: str) -> bool:
+        return (
+            text.count("{") > text.count("}")
+            or text.rfind("<function=") > text.rfind("</function>")
+        )
+
+    def _muted_by_prefix(self) -> bool:
+        head = self.text.lstrip()
+        if is_tool_output(head):
+            self.muted = True
+        return self.muted
+
+    def _take(self, segment: str) -> List[str]:
+        out = []
+        for part in self._BOUNDARY_RE.split(clean_for_tts(segment)):
+            part = part.strip()
+            if not part:
+                continue
+            self._buffer = (self._buffer + " " + part).strip() if self._buffer else part
+            if len(self._buffer) >= min_chunk_chars:
+                out.append(self._buffer)
+                self._buffer = ""
+        return out
+
+    def feed(self, delta: str) -> List[str]:
+        self.text += delta
+        if self.muted:
+            return []
+        head = self.text.lstrip()
+        # Too short to tell whether this is "[{..." / "<function=..." yet.
+        if any(p.startswith(head) and p != head for p in self._TOOL_PREFIXES):
+            return []
+        if self._muted_by_prefix():
+            return []
+
+        cut = None
+        for m in self._BOUNDARY_RE.finditer(self.text, self._pos):
+            if self._block_open(self.text[:m.end()]):
+                break
+            cut = m.end()
+        if cut is None:
+            return []
+        segment, self._pos = self.text[self._pos:cut], cut
+        return self._take(segment)
+
+    def flush(self) -> List[str]:
+        if self.muted or self._muted_by_prefix():
+            return []
+        out = self._take(self.text[self._pos:])
+        self._pos = len(self.text)
+        if self._buffer:
+            out.append(self._buffer)
+            self._buffer = ""
+        return out
+
+
 def safe_json_parse(text):
     try:
         return json.loads(text)
@@ -837,13 +1655,6 @@ def safe_json_parse(text):
         raise
 
 
-def compute_rms(raw_bytes: bytes) -> float:
-    if len(raw_bytes) < 2:
-        return 0.0
-    samples = struct.unpack(f"<{len(raw_bytes)//2}h", raw_bytes)
-    return (sum(s * s for s in samples) / len(samples)) ** 0.5
-
-
 def _get_fallback_message(exc: Exception, lang_code: str = "gu-IN") -> str:
     lang_code = _normalize_lang_code(lang_code)
     err_str = str(exc).lower()
@@ -883,50 +1694,198 @@ def print_token_usage(msg, step_name):
 
 # ── Tool context injection ────────────────────────────────────────────────────
 
-def _inject_tool_context(session_id: str, chat_sessions: dict, enabled_modules: List[str]):
-    """Injects session context into module tools so they can resolve tenant_id."""
-
-    class _Ctx:
+async def _run_tool_async(tool_name: str, args: dict, ctx: Optional[ToolContext] = None):
+    """
+    Dynamically resolve and run a tool by name in a thread. `ctx` is visible to
+    the tool (and only to this call) via current_tool_context(); to_thread
+    copies the context into the worker thread.
+    """
+    func = None
+    try:
+        import calendar_tool
+        func = getattr(calendar_tool, tool_name, None)
+    except ImportError:
         pass
 
-    ctx = _Ctx()
-    ctx.session_id    = session_id
-    ctx.chat_sessions = chat_sessions
-
-    if BOOKING_MODULE in enabled_modules:
-        try:
-            import calendar_tool
-            calendar_tool.tenant_context = ctx
-        except ImportError:
-            pass
-
-    if FACTS_MODULE in enabled_modules:
+    if func is None:
         try:
             from modules import facts_module
-            facts_module.tenant_context = ctx
+            func = getattr(facts_module, tool_name, None)
         except ImportError:
             pass
 
+    if func is None:
+        raise ValueError(f"Unknown tool: {tool_name}")
+    with use_tool_context(ctx):
+        return await asyncio.to_thread(func, **args)
 
-async def _run_tool_async(tool_name: str, args: dict):
-    """Dynamically resolve and run a tool by name in a thread."""
-    try:
-        import calendar_tool
-        func = getattr(calendar_tool, tool_name, None)
-        if func:
-            return await asyncio.to_thread(func, **args)
-    except ImportError:
-        pass
 
+# ── Direct executor for confirmed actions ─────────────────────────────────────
+# On a "yes" that matches the awaiting payload, the action is already decided:
+# the mutating tool is called with the canonical payload and the reply is
+# templated, instead of two main-LLM round trips that re-emit the same call.
+
+_ACTION_TOOLS = {
+    "book": "book_appointment",
+    "cancel": "cancel_appointment",
+    "reschedule": "reschedule_appointment",
+}
+
+_direct_action_stats = {
+    "executed":   0,
+    "succeeded":  0,
+    "failed":     0,
+    "calendar_ms_total": 0.0,
+}
+
+
+def get_direct_action_stats() -> dict:
+    stats = dict(_direct_action_stats)
+    n = stats["executed"]
+    stats["avg_calendar_ms"] = round(stats["calendar_ms_total"] / n, 1) if n else 0.0
+    stats["calendar_ms_total"] = round(stats["calendar_ms_total"], 1)
+    stats["llm_round_trips_saved"] = 2 * n
+    return stats
+
+
+async def _execute_confirmed_action(
+    action: str,
+    payload: dict,
+    session_data: dict,
+    tool_ctx: ToolContext,
+    websocket,
+    phone_number: Optional[str],
+    lang_code: str,
+) -> str:
+    """Run the confirmed mutating tool once; returns the reply text (not yet spoken)."""
+    tname = _ACTION_TOOLS[action]
+    targs = dict(payload)
+    if phone_number:
+        targs["phone_number"] = phone_number
+    allowed = session_data.get("_confirmed_action")
+    if allowed:
+        allowed["consumed"] = True
+
+    log("[DIRECT_ACTION]", f"Executing '{tname}' | args={targs}")
+    await websocket.send_json({"type": "tool_call", "name": tname, "args": targs, "status": "running"})
+    t_tool = datetime.now()
+    obs_obj = None
     try:
-        from modules import facts_module
-        func = getattr(facts_module, tool_name, None)
-        if func:
-            return await asyncio.to_thread(func, **args)
-    except ImportError:
-        pass
+        obs = await _run_tool_async(tname, targs, tool_ctx)
+        if isinstance(obs, (dict, list)):
+            obs_text, obs_obj = json.dumps(obs, ensure_ascii=False), obs
+        else:
+            obs_text = str(obs)
+        ok = "success" in obs_text.lower()
+        status = "ok"
+    except Exception as e:
+        obs, obs_text, ok, status = None, f"Error: {e}", False, "error"
+    elapsed_ms = (datetime.now() - t_tool).total_seconds() * 1000.0
+
+    tool_payload = {"type": "tool_call", "name": tname, "args": targs, "status": status, "result": obs_text}
+    if obs_obj is not None:
+        tool_payload["result_obj"] = obs_obj
+    await websocket.send_json(tool_payload)
+
+    _direct_action_stats["executed"] += 1
+    _direct_action_stats["calendar_ms_total"] += elapsed_ms
+    if ok:
+        _direct_action_stats["succeeded"] += 1
+        log("[DIRECT_ACTION]", f"'{tname}' OK in {elapsed_ms:.0f} ms")
+        _reset_after_completed_action(session_data)
+        if action == "book" and isinstance(obs, dict) and obs.get("calendar_link"):
+            cal_msg, reply = _build_booking_calendar_texts(lang_code)
+            await websocket.send_json({
+                "type": "calendar_prompt",
+                "status": "SUCCESS",
+                "message": cal_msg,
+                "calendar_link": obs.get("calendar_link"),
+                "start_time": obs.get("start_time"),
+                "end_time": obs.get("end_time"),
+            })
+            return reply
+        return _build_action_done_reply(lang_code, action, payload)
+
+    _direct_action_stats["failed"] += 1
+    log("[DIRECT_ACTION]", f"'{tname}' FAILED in {elapsed_ms:.0f} ms: {obs_text}")
+    # Not done: the caller gives a new time (or retries) and confirms again.
+    session_data["confirmation_state"] = _confirmation_state_default()
+    session_data.pop("_confirmed_action", None)
+    session_data.get("memory", {})["pending_action"] = "none"
+    return _build_action_failed_reply(lang_code, action, payload, obs_text)
+
+
+# ── Speaking a complete reply ─────────────────────────────────────────────────
+
+async def _speak_reply(websocket, tts_session, tts_convert_fn, text: str, sentences: List[str],
+                       speaker: str, lang: str, cacheable: bool = False):
+    """
+    Send ai_text for a reply that is already complete and speak its sentences:
+    through the call's StreamingTTSSession (cacheable=True lets fixed phrases
+    come from the TTS audio cache), or one tts_convert_fn call per sentence
+    when there is no session. Returns once the audio has been sent.
+    """
+    await websocket.send_json({"type": "ai_text", "text": text, "chunk_count": len(sentences)})
+    await websocket.send_json({"type": "ai_speaking_start"})
+    if tts_session:
+        done_evt = asyncio.Event()
+        await tts_session.speak(sentences, speaker, lang, random.randint(1, 999999), done_evt,
+                                cacheable=cacheable)
+        await done_evt.wait()
+        return
+    for idx, sentence in enumerate(sentences):
+        audio_b64 = await tts_convert_fn(sentence, speaker, lang)
+        await websocket.send_json({
+            "type": "audio_chunk", "index": idx, "total": len(sentences),
+            "text": sentence, "audio": audio_b64, "is_last": idx == len(sentences) - 1
+        })
+    await websocket.send_json({"type": "tts_done"})
+
+
+# ── Streamed reply (LLM tokens → TTS) ─────────────────────────────────────────
+
+class _SpokenStream:
+    """
+    One streamed bot response. The TTS job is opened on the first sentence
+    (ai_speaking_start + StreamingTTSSession.speak with a queue), later
+    sentences are pushed while the LLM is still generating. `after` are the
+    earlier streams of the same turn (a preamble spoken before a tool call):
+    they finish first, since ai_speaking_start clears the browser's audio queue.
+    """
+
+    def __init__(self, websocket, tts_session, speaker: str, lang: str,
+                 after: Sequence["_SpokenStream"] = ()):
+        self._websocket   = websocket
+        self._tts_session = tts_session
+        self._speaker     = speaker
+        self._lang        = lang
+        self._after       = list(after)
+        self._queue: Optional[asyncio.Queue] = None
+        self._done: Optional[asyncio.Event] = None
+        self.sentences: List[str] = []
+
+    async def push(self, sentence: str):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._done  = asyncio.Event()
+            log("[TTS_STREAM]", f"First sentence ready: '{sentence[:60]}'")
+            for earlier in self._after:
+                await earlier.wait()
+            await self._websocket.send_json({"type": "ai_speaking_start"})
+            await self._tts_session.speak(
+                self._queue, self._speaker, self._lang, random.randint(1, 999999), self._done
+            )
+        self.sentences.append(sentence)
+        await self._queue.put(sentence)
 
-    raise ValueError(f"Unknown tool: {tool_name}")
+    async def finish(self):
+        """Close the sentence queue (no more text for this response)."""
+        if self._queue is not None:
+            await self._queue.put(None)
+
+    async def wait(self):
+        if self._done is not None:
+            await self._done.wait()
 
 
 # ── Main brain (run_brain) ────────────────────────────────────────────────────
@@ -938,6 +1897,7 @@ async def run_brain(
     tts_session,
     chat_sessions: Dict,
     tts_convert_fn,
+    speculation: Optional["SpeculativeTurn"] = None,
 ):
     """
     Core reasoning loop.
@@ -947,10 +1907,12 @@ async def run_brain(
       2. Handle unclear/noisy transcripts (early return)
       3. Resolve enabled modules for tenant (cached in session)
       4. FIX 5: Parallelise memory extraction + module/LLM resolution
+         (or take the result already started on a stable partial)
       5. Build system prompt (module-aware)
-      6. Run main LLM with tools
+      6. Run main LLM with tools (streamed when a TTS session is open:
+         each sentence is spoken as soon as it completes)
       7. Tool execution loop
-      8. Stream TTS response
+      8. Stream TTS response (forced / non-streamed replies)
     """
     t0    = datetime.now()
     today = t0.strftime("%Y-%m-%d")
@@ -971,20 +1933,8 @@ async def run_brain(
         clarification = prompts.LANG_PACK.get(fb_lang, prompts.LANG_PACK["gu-IN"])["unclear_msg"]
         log("[BRAIN]", "Noisy input — sending clarification")
         sentences = split_into_sentences(clarification)
-        await websocket.send_json({"type": "ai_text", "text": clarification, "chunk_count": len(sentences)})
-        await websocket.send_json({"type": "ai_speaking_start"})
-        if tts_session:
-            done_evt = asyncio.Event()
-            await tts_session.speak(sentences, fb_speaker, fb_lang, 0, done_evt)
-            await done_evt.wait()
-        else:
-            for idx, sentence in enumerate(sentences):
-                audio_b64 = await tts_convert_fn(sentence, fb_speaker, fb_lang)
-                await websocket.send_json({
-                    "type": "audio_chunk", "index": idx, "total": len(sentences),
-                    "text": sentence, "audio": audio_b64, "is_last": idx == len(sentences) - 1
-                })
-            await websocket.send_json({"type": "tts_done"})
+        await _speak_reply(websocket, tts_session, tts_convert_fn, clarification, sentences,
+                           fb_speaker, fb_lang, cacheable=True)
         return
 
     # ── Init session ──────────────────────────────────────────────────────────
@@ -1038,8 +1988,8 @@ async def run_brain(
     enabled_modules = session_data.get("enabled_modules")
     if enabled_modules is None:
         if tenant_id:
-            # Run in thread so the synchronous DB call doesn't block the event loop
-            enabled_modules = await asyncio.to_thread(get_enabled_modules_for_tenant, tenant_id)
+            # asyncpg query on the event loop (thread fallback if the pool is down)
+            enabled_modules = await aget_enabled_modules_for_tenant(tenant_id)
         else:
             enabled_modules = [BOOKING_MODULE]
         session_data["enabled_modules"] = enabled_modules
@@ -1052,12 +2002,18 @@ async def run_brain(
     # Running both concurrently shaves the memory-LLM round-trip off the critical path.
     memory = session_data.get("memory", {})
 
-    mem_task    = asyncio.create_task(extract_memory(user_text, memory, tts_lang, enabled_modules))
-    llm_task    = asyncio.get_event_loop().run_in_executor(
-        None, get_llm_with_tools, tenant_id or "", enabled_modules
-    )
+    if speculation is not None and speculation.usable_for(
+        user_text, memory, tts_lang, tenant_id, enabled_modules
+    ):
+        # Started on a stable partial while Sarvam was still endpointing.
+        new_memory_result, llm_result = await speculation.commit()
+    else:
+        mem_task    = asyncio.create_task(extract_memory_fast(user_text, memory, tts_lang, enabled_modules))
+        llm_task    = asyncio.get_event_loop().run_in_executor(
+            None, get_llm_with_tools, tenant_id or "", enabled_modules
+        )
 
-    new_memory_result, llm_result = await asyncio.gather(mem_task, llm_task)
+        new_memory_result, llm_result = await asyncio.gather(mem_task, llm_task)
 
     llm_with_tools, active_tools = llm_result
 
@@ -1117,33 +2073,14 @@ async def run_brain(
         and requested_lang is None
     ):
         receptionist = bot_config.get("receptionist_name") or "Priya"
-        question_map = {
-            "gu-IN": f"નમસ્તે! હું {receptionist} છું. તમે ગુજરાતી, હિન્દી કે અંગ્રેજીમાં વાત કરશો?",
-            "hi-IN": f"नमस्ते! मैं {receptionist} हूँ। क्या आप गुजराती, हिन्दी या अंग्रेज़ी में बात करना चाहेंगे?",
-            "en-IN": f"Hello! I'm {receptionist}. Would you prefer Gujarati, Hindi, or English?",
-        }
-        ask_text = question_map.get(tts_lang, question_map["en-IN"])
+        ask_text = _build_language_question(tts_lang, receptionist)
         session_data["language_prompt_asked"] = True
         history.append(AIMessage(content=ask_text))
         session_data["last_ai_text"] = ask_text
         sentences = split_into_sentences(ask_text)
         log("[BRAIN]", f"Reply: '{ask_text[:100]}' | {len(sentences)} sentence(s) [forced language ask]")
-        await websocket.send_json({"type": "ai_text", "text": ask_text, "chunk_count": len(sentences)})
-        await websocket.send_json({"type": "ai_speaking_start"})
-        if tts_session:
-            done_evt = asyncio.Event()
-            import random as _rand
-            resp_id = _rand.randint(1, 999999)
-            await tts_session.speak(sentences, tts_speaker, tts_lang, resp_id, done_evt)
-            await done_evt.wait()
-        else:
-            for idx, sentence in enumerate(sentences):
-                audio_b64 = await tts_convert_fn(sentence, tts_speaker, tts_lang)
-                await websocket.send_json({
-                    "type": "audio_chunk", "index": idx, "total": len(sentences),
-                    "text": sentence, "audio": audio_b64, "is_last": idx == len(sentences) - 1
-                })
-            await websocket.send_json({"type": "tts_done"})
+        await _speak_reply(websocket, tts_session, tts_convert_fn, ask_text, sentences,
+                           tts_speaker, tts_lang, cacheable=True)
         log("[BRAIN]", f"DONE in {(datetime.now()-t0).total_seconds():.2f}s")
         return
 
@@ -1196,6 +2133,33 @@ async def run_brain(
                 "consumed": False,
             }
             log("[CONFIRM]", f"Confirmed by user for action={action} payload={signature}")
+
+            bound = {getattr(t, "name", None) for t in active_tools}
+            if config.DIRECT_ACTION_EXECUTOR and _ACTION_TOOLS.get(action) in bound:
+                session_data["memory"] = updated_memory
+                history.append(HumanMessage(content=user_text))
+                async def direct_round():
+                    reply = await _execute_confirmed_action(
+                        action, payload, session_data, ToolContext(session_id, chat_sessions),
+                        websocket, phone_number, turn_lang,
+                    )
+                    history.append(AIMessage(content=reply))
+                    session_data["last_ai_text"] = reply
+                    return reply
+
+                # Shielded: a barge-in may cut the reply, not a half-applied calendar change
+                # or its record in history (see settle_interrupted_turn).
+                tool_round = asyncio.ensure_future(direct_round())
+                session_data["_tool_round"] = tool_round
+                reply_text = await asyncio.shield(tool_round)
+                session_data.pop("_tool_round", None)
+                tts_text = clean_for_tts(reply_text)
+                sentences = split_into_sentences(tts_text)
+                log("[BRAIN]", f"Reply: '{tts_text[:100]}' | {len(sentences)} sentence(s) [direct action]")
+                await _speak_reply(websocket, tts_session, tts_convert_fn, reply_text, sentences,
+                                   tts_speaker, turn_lang)
+                log("[BRAIN]", f"DONE in {(datetime.now()-t0).total_seconds():.2f}s")
+                return
         else:
             confirmation_state.update({
                 "status": "awaiting_confirmation",
@@ -1214,22 +2178,8 @@ async def run_brain(
             sentences = split_into_sentences(ask_text)
             log("[CONFIRM]", f"Awaiting explicit confirmation for action={action}")
             log("[BRAIN]", f"Reply: '{ask_text[:100]}' | {len(sentences)} sentence(s) [forced confirmation]")
-            await websocket.send_json({"type": "ai_text", "text": ask_text, "chunk_count": len(sentences)})
-            await websocket.send_json({"type": "ai_speaking_start"})
-            if tts_session:
-                done_evt = asyncio.Event()
-                import random as _rand
-                resp_id = _rand.randint(1, 999999)
-                await tts_session.speak(sentences, tts_speaker, turn_lang, resp_id, done_evt)
-                await done_evt.wait()
-            else:
-                for idx, sentence in enumerate(sentences):
-                    audio_b64 = await tts_convert_fn(sentence, tts_speaker, turn_lang)
-                    await websocket.send_json({
-                        "type": "audio_chunk", "index": idx, "total": len(sentences),
-                        "text": sentence, "audio": audio_b64, "is_last": idx == len(sentences) - 1
-                    })
-                await websocket.send_json({"type": "tts_done"})
+            await _speak_reply(websocket, tts_session, tts_convert_fn, ask_text, sentences,
+                               tts_speaker, turn_lang)
             log("[BRAIN]", f"DONE in {(datetime.now()-t0).total_seconds():.2f}s")
             return
     else:
@@ -1241,7 +2191,7 @@ async def run_brain(
 
     session_data["memory"] = updated_memory
 
-    _inject_tool_context(session_id, chat_sessions, enabled_modules)
+    tool_ctx = ToolContext(session_id, chat_sessions)
 
     # ── Build system prompt ───────────────────────────────────────────────────
     memory_context = f"\n\n=== MEMORY STATE ===\n{json.dumps(updated_memory)}"
@@ -1281,8 +2231,27 @@ async def run_brain(
         log("[LLM]", "Bound tools    : <none>")
     # Log message shape for diagnosis
     _log_messages_sent(recent_history, "[LLM_MSGS]")
+
+    # With a streaming TTS session, sentences are spoken while the LLM is still
+    # generating. reply_stream is the stream that produced the current ai_msg
+    # (None once ai_msg is replaced by a forced / recovered reply).
+    spoken_streams: List[_SpokenStream] = []
+    reply_stream: Optional[_SpokenStream] = None
+
+    async def llm_call(messages):
+        nonlocal reply_stream
+        if not (tts_session and config.LLM_STREAM_TTS):
+            reply_stream = None
+            return await safe_llm_call(llm_with_tools, messages)
+        reply_stream = _SpokenStream(websocket, tts_session, tts_speaker, tts_lang, after=spoken_streams)
+        spoken_streams.append(reply_stream)
+        try:
+            return await safe_llm_stream(llm_with_tools, messages, reply_stream.push)
+        finally:
+            await reply_stream.finish()
+
     try:
-        ai_msg = await safe_llm_call(llm_with_tools, recent_history)
+        ai_msg = await llm_call(recent_history)
         log("[LLM]", f"Done in {(datetime.now()-t_llm).total_seconds():.2f}s | "
             f"tool_calls={len(ai_msg.tool_calls)}")
         print_token_usage(ai_msg, "Initial LLM")
@@ -1293,6 +2262,7 @@ async def run_brain(
         if recovered:
             log("[LLM]", f"Recovery successful — executing '{recovered.tool_calls[0]['name']}'")
             ai_msg = recovered
+            reply_stream = None
         else:
             log("[LLM]", "Recovery failed — re-raising")
             raise
@@ -1312,6 +2282,7 @@ async def run_brain(
                 or "en-IN"
             )
             ai_msg = AIMessage(content=_build_tool_limit_reply(active_lang))
+            reply_stream = None
             break
         log("[TOOLS]", f"Iteration #{tool_iteration} — {len(ai_msg.tool_calls)} tool(s)")
         history.append(ai_msg)
@@ -1352,7 +2323,7 @@ async def run_brain(
             t_tool = datetime.now()
 
             try:
-                obs = await _run_tool_async(tname, targs)
+                obs = await _run_tool_async(tname, targs, tool_ctx)
                 obs_obj = None
                 if isinstance(obs, (dict, list)):
                     obs_text = json.dumps(obs, ensure_ascii=False)
@@ -1375,15 +2346,7 @@ async def run_brain(
                     and obs.get("calendar_link")
                 ):
                     active_lang = session_data.get("memory", {}).get("language_preference") or tts_lang or "en-IN"
-                    if "gu" in active_lang:
-                        cal_msg = "મેં તમારી નિમણૂક સફળતાપૂર્વક બુક કરી છે. શું તમે તેને તમારા કેલેન્ડરમાં ઉમેરવા માંગો છો?"
-                        force_text = "મેં તમારી નિમણૂક સફળતાપૂર્વક બુક કરી છે.<br><br>શું તમે તેને તમારા કેલેન્ડરમાં ઉમેરવા માંગો છો?<br><br>"
-                    elif "hi" in active_lang:
-                        cal_msg = "मैंने आपकी अपॉइंटमेंट सफलतापूर्वक बुक कर ली है। क्या आप इसे अपने कैलेंडर में जोड़ना चाहेंगे?"
-                        force_text = "मैंने आपकी अपॉइंटमेंट सफलतापूर्वक बुक कर ली है।<br><br>क्या आप इसे अपने कैलेंडर में जोड़ना चाहेंगे?<br><br>"
-                    else:
-                        cal_msg = "I've booked your appointment successfully. Would you like to add it to your calendar?"
-                        force_text = "I've booked your appointment successfully.<br><br>Would you like to add it to your calendar?<br><br>"
+                    cal_msg, force_text = _build_booking_calendar_texts(active_lang)
 
                     await websocket.send_json({
                         "type": "calendar_prompt",
@@ -1397,20 +2360,7 @@ async def run_brain(
                     session_data["_force_reply"] = force_text
 
                 if "success" in obs_text.lower():
-                    print("$$$state memory cleared after success$$$")
-                    lang_pref = session_data.get("memory", {}).get("language_preference")
-                    session_data["memory"] = {
-                        "intent": "none",
-                        "language_preference": lang_pref,
-                        "pending_action": "none",
-                        "appointment": {"date": None, "time": None, "duration": None},
-                        "reschedule": {"old_time": None, "new_time": None},
-                        "date_context": {"resolved_date": None, "source": "none"}
-                    }
-                    session_data["confirmation_state"] = _confirmation_state_default()
-                    session_data.pop("_confirmed_action", None)
-                    # Force module re-fetch next turn in case config changed
-                    session_data.pop("enabled_modules", None)
+                    _reset_after_completed_action(session_data)
 
                 status = "ok"
                 log("[TOOL]", f"'{tname}' OK in {(datetime.now()-t_tool).total_seconds():.2f}s")
@@ -1433,13 +2383,27 @@ async def run_brain(
             await websocket.send_json(payload)
             return ToolMessage(content=obs_text, tool_call_id=tool_call["id"])
 
-        tool_results   = await asyncio.gather(*[execute_tool(tc) for tc in ai_msg.tool_calls])
-        history.extend(tool_results)
+        async def run_tool_round(tool_calls):
+            results = await asyncio.gather(*[execute_tool(tc) for tc in tool_calls])
+            history.extend(results)
+            return results
+
+        if any(_is_mutating_tool(tc["name"]) for tc in ai_msg.tool_calls):
+            # Shielded like the direct executor: a barge-in may cut the reply, but the
+            # calendar write, its state reset and its ToolMessages always complete
+            # (the consumer waits for them via settle_interrupted_turn).
+            tool_round = asyncio.ensure_future(run_tool_round(ai_msg.tool_calls))
+            session_data["_tool_round"] = tool_round
+            tool_results = await asyncio.shield(tool_round)
+            session_data.pop("_tool_round", None)
+        else:
+            tool_results = await run_tool_round(ai_msg.tool_calls)
         recent_history = [history[0]] + history[-max_history:]
 
         forced_reply = session_data.pop("_force_reply", None)
         if forced_reply:
             ai_msg = AIMessage(content=forced_reply)
+            reply_stream = None
             break
 
         out_of_hours = session_data.pop("_out_of_hours_error", None)
@@ -1469,13 +2433,14 @@ async def run_brain(
             reply = _build_out_of_hours_reply(active_lang, req_time, ranges)
             log("[OUT_OF_HOURS]", f"reply='{reply[:120]}'")
             ai_msg = AIMessage(content=reply)
+            reply_stream = None
             break
 
         t_llm2 = datetime.now()
         log("[LLM]", "Post-tool ainvoke()")
         _log_messages_sent(recent_history, "[LLM_POST_MSGS]")
         try:
-            ai_msg = await safe_llm_call(llm_with_tools, recent_history)
+            ai_msg = await llm_call(recent_history)
             log("[LLM]", f"Done in {(datetime.now()-t_llm2).total_seconds():.2f}s")
             print_token_usage(ai_msg, "Post-tool LLM")
         except BadRequestError as e:
@@ -1485,6 +2450,7 @@ async def run_brain(
             if recovered:
                 log("[LLM]", "Post-tool recovery successful")
                 ai_msg = recovered
+                reply_stream = None
             else:
                 log("[LLM]", "Post-tool recovery failed — re-raising")
                 raise
@@ -1502,6 +2468,21 @@ async def run_brain(
 
     session_data["last_ai_text"] = reply_text
 
+    # Already spoken sentence by sentence while the LLM was generating.
+    if reply_stream is not None and reply_stream.sentences:
+        await websocket.send_json({
+            "type": "ai_text", "text": reply_text, "chunk_count": len(reply_stream.sentences)
+        })
+        await reply_stream.wait()
+        log("[BRAIN]", f"Reply: '{reply_text[:100]}' | {len(reply_stream.sentences)} sentence(s) [streamed]")
+        log("[BRAIN]", f"DONE in {(datetime.now()-t0).total_seconds():.2f}s")
+        return
+
+    # A preamble spoken before a tool call must finish before the next
+    # ai_speaking_start (which clears the browser's audio queue).
+    for stream in spoken_streams:
+        await stream.wait()
+
     if is_tool_output(reply_text):
         log("[TTS_FILTER]", f"Blocked tool output from TTS: '{reply_text[:80]}'")
         log("[BRAIN]", f"DONE (tool-only, no TTS) in {(datetime.now()-t0).total_seconds():.2f}s")
@@ -1516,25 +2497,7 @@ async def run_brain(
     sentences = split_into_sentences(tts_text)
     log("[BRAIN]", f"Reply: '{tts_text[:100]}' | {len(sentences)} sentence(s)")
 
-    import random as _rand
-    resp_id = _rand.randint(1, 999999)
-
-    await websocket.send_json({
-        "type": "ai_text", "text": reply_text, "chunk_count": len(sentences)
-    })
-    await websocket.send_json({"type": "ai_speaking_start"})
-
-    if tts_session:
-        done_evt = asyncio.Event()
-        await tts_session.speak(sentences, tts_speaker, tts_lang, resp_id, done_evt)
-        await done_evt.wait()
-    else:
-        for idx, sentence in enumerate(sentences):
-            audio_b64 = await tts_convert_fn(sentence, tts_speaker, tts_lang)
-            await websocket.send_json({
-                "type": "audio_chunk", "index": idx, "total": len(sentences),
-                "text": sentence, "audio": audio_b64, "is_last": idx == len(sentences) - 1
-            })
-        await websocket.send_json({"type": "tts_done"})
+    await _speak_reply(websocket, tts_session, tts_convert_fn, reply_text, sentences,
+                       tts_speaker, tts_lang)
 
     log("[BRAIN]", f"DONE in {(datetime.now()-t0).total_seconds():.2f}s")
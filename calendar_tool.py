@@ -15,7 +15,7 @@ import datetime
 import os
 import pytz
 import urllib.parse
-from typing import Optional
+from typing import List, Optional
 from dotenv import load_dotenv
 import config
 
@@ -27,30 +27,33 @@ from services.calendar_provider import (
     CalendarNotConnectedError,
     InvalidCalendarCredentialsError,
 )
+from services import calendar_mirror
+from services.availability_engine import (
+    get_engine as get_availability_engine,
+    AFTER, BEFORE, DIRECTIONS,
+)
+from services.availability_grid import AvailabilityGrid, cell_minutes_for
+from services.tool_context import current_tool_context
 
-# ── Tenant Context (injected by main.py before every tool call) ───────────────
-# main.py sets `calendar_tool.tenant_context` before calling any tool so every
-# function knows which tenant (and which phone number) is active — without
-# needing those values as explicit tool arguments.
-tenant_context = None
+# ── Tenant Context (set by brain._run_tool_async around every tool call) ──────
+# Every function knows which tenant (and which phone number) is active without
+# needing those values as explicit tool arguments. The context is a ContextVar
+# (services/tool_context.py), so concurrent sessions never see each other's.
 
 
 def get_session_context():
     """Return (tenant_id, phone_number) from the active WebSocket session.
-    Returns (None, None) if context has not been injected yet."""
-    if tenant_context is None:
-        return None, None
-    session = tenant_context.chat_sessions.get(tenant_context.session_id)
-    if not session:
+    Returns (None, None) outside a tool call."""
+    ctx = current_tool_context()
+    if ctx is None:
         return None, None
-    return session.get("tenant_id"), session.get("phone_number")
+    return ctx.tenant_and_phone()
 
 
 def get_tenant_config():
     """Return bot_config from the active WebSocket session."""
-    if tenant_context is None:
-        return {}
-    session = tenant_context.chat_sessions.get(tenant_context.session_id)
+    ctx = current_tool_context()
+    session = ctx.session() if ctx else None
     if not session:
         return {}
     return session.get("bot_config", {})
@@ -225,6 +228,57 @@ def is_within_business_hours(start_time_str: str, duration_minutes: int = 0) ->
     return False
 
 
+# ── Busy time lookup ──────────────────────────────────────────────────────────
+
+def _get_busy_intervals(service, calendar_id: str, tenant_id: str,
+                        start_dt: datetime.datetime, end_dt: datetime.datetime,
+                        live: bool = False):
+    """
+    Busy (start, end) aware datetimes overlapping [start_dt, end_dt).
+    Served from services/calendar_mirror.py when it is fresh; otherwise (or with
+    live=True, the guard before a write) one live freebusy().query round trip.
+    """
+    if not live:
+        busy = calendar_mirror.get_busy_intervals(tenant_id, start_dt, end_dt)
+        if busy is not None:
+            return busy
+
+    body = {
+        "timeMin": start_dt.isoformat(),
+        "timeMax": end_dt.isoformat(),
+        "items": [{"id": calendar_id}],
+    }
+    query = service.freebusy().query(body=body).execute()
+    return [
+        (datetime.datetime.fromisoformat(slot["start"]), datetime.datetime.fromisoformat(slot["end"]))
+        for slot in query["calendars"][calendar_id]["busy"]
+    ]
+
+
+def _get_busy_by_calendar(service, calendar_ids: List[str],
+                          start_dt: datetime.datetime, end_dt: datetime.datetime):
+    """
+    {calendar_id: [(start, end), ...]} for extra calendars (e.g. other staff),
+    in a single live freebusy().query — these are not mirrored.
+    """
+    body = {
+        "timeMin": start_dt.isoformat(),
+        "timeMax": end_dt.isoformat(),
+        "items": [{"id": cid} for cid in calendar_ids],
+    }
+    query = service.freebusy().query(body=body).execute()
+    out = {}
+    for cid in calendar_ids:
+        entry = query.get("calendars", {}).get(cid, {})
+        if entry.get("errors"):
+            raise ValueError(f"calendar '{cid}' is not accessible")
+        out[cid] = [
+            (datetime.datetime.fromisoformat(slot["start"]), datetime.datetime.fromisoformat(slot["end"]))
+            for slot in entry.get("busy", [])
+        ]
+    return out
+
+
 # ── Tool: check_calendar_availability ────────────────────────────────────────
 
 def check_calendar_availability(
@@ -233,6 +287,12 @@ def check_calendar_availability(
     phone_number: Optional[str] = None,
 ):
     """Checks if a time slot is free in this tenant's Google Calendar."""
+    return _slot_availability(start_time_str, duration_minutes)
+
+
+def _slot_availability(start_time_str: str, duration_minutes: Optional[int] = None,
+                       live: bool = False) -> str:
+    """check_calendar_availability; live=True bypasses the mirror (book / reschedule guard)."""
     tenant_id, _ = get_session_context()
     bot_cfg = get_tenant_config()
     if duration_minutes is None:
@@ -258,14 +318,7 @@ def check_calendar_availability(
     start_dt = IST.localize(naive_dt)
     end_dt = start_dt + datetime.timedelta(minutes=duration_minutes)
 
-    body = {
-        "timeMin": start_dt.isoformat(),
-        "timeMax": end_dt.isoformat(),
-        "items": [{"id": calendar_id}],
-    }
-
-    query = service.freebusy().query(body=body).execute()
-    busy_slots = query["calendars"][calendar_id]["busy"]
+    busy_slots = _get_busy_intervals(service, calendar_id, tenant_id, start_dt, end_dt, live=live)
 
     if not busy_slots:
         return f"Slot {start_time_str} is FREE."
@@ -281,11 +334,23 @@ def suggest_next_available_slot(
     search_hours: int = 4,
     max_slots: int = 3,
     phone_number: Optional[str] = None,
+    search_days: Optional[int] = None,
+    direction: str = "after",
 ):
+    """
+    Suggest free slots near start_time_str.
+    search_days widens the window from search_hours to whole days (e.g. 7 for "this week").
+    direction: "after" (default), "before", or "both" (closest on either side).
+    """
     tenant_id, _ = get_session_context()
     bot_cfg = get_tenant_config()
     if duration_minutes is None:
         duration_minutes = bot_cfg.get("slot_duration_mins", config.DEFAULT_APPOINTMENT_DURATION)
+    duration_minutes = int(duration_minutes)
+
+    direction = (direction or AFTER).strip().lower()
+    if direction not in DIRECTIONS:
+        direction = AFTER
 
     try:
         service, calendar_id = _get_service_and_calendar(tenant_id)
@@ -303,54 +368,112 @@ def suggest_next_available_slot(
     if search_start < now_dt:
         search_start = _ceil_dt_to_slot(now_dt, duration_minutes)
 
-    end_search = search_start + datetime.timedelta(hours=search_hours)
+    if search_days:
+        horizon = datetime.timedelta(days=min(int(search_days), config.AVAILABILITY_MAX_SEARCH_DAYS))
+    else:
+        horizon = datetime.timedelta(hours=search_hours)
+    duration = datetime.timedelta(minutes=duration_minutes)
+
+    lookup_start = search_start if direction == AFTER else max(search_start - horizon, now_dt)
+    lookup_end = search_start + duration if direction == BEFORE else search_start + horizon
+
+    # 🔥 SINGLE LOOKUP (local mirror, or one freebusy call)
+    busy_intervals = _get_busy_intervals(service, calendar_id, tenant_id, lookup_start, lookup_end)
+
+    # 🧠 FIND FREE SLOTS LOCALLY (periods precomputed, busy coalesced, one sweep)
+    engine = get_availability_engine(_normalize_business_periods(bot_cfg), config.CALENDAR_TIMEZONE)
+    slots = engine.find_slots(
+        busy_intervals,
+        anchor=search_start,
+        duration_minutes=duration_minutes,
+        max_slots=max_slots,
+        horizon=horizon,
+        direction=direction,
+        earliest=now_dt,
+    )
+    available_slots = [s.astimezone(IST).strftime("%Y-%m-%dT%H:%M:%S") for s in slots]
 
-    # 🔥 SINGLE API CALL
-    body = {
-        "timeMin": search_start.isoformat(),
-        "timeMax": end_search.isoformat(),
-        "items": [{"id": calendar_id}],
-    }
+    if available_slots:
+        return f"AVAILABLE_SLOTS: {available_slots}"
 
-    query = service.freebusy().query(body=body).execute()
-    busy_slots = query["calendars"][calendar_id]["busy"]
+    if search_days:
+        return f"No available slots found in the next {horizon.days} days."
+    return "No available slots found in the next few hours."
 
-    # Convert busy slots to datetime
-    busy_intervals = []
-    for slot in busy_slots:
-        busy_start = datetime.datetime.fromisoformat(slot["start"])
-        busy_end = datetime.datetime.fromisoformat(slot["end"])
-        busy_intervals.append((busy_start, busy_end))
 
-    # Sort intervals (important)
-    busy_intervals.sort()
+# ── Tool: find_available_times ───────────────────────────────────────────────
 
-    # 🧠 FIND FREE SLOTS LOCALLY
-    available_slots = []
-    current = search_start
+def find_available_times(
+    start_date: str,
+    days: int = 7,
+    duration_minutes: Optional[int] = None,
+    earliest_time: Optional[str] = None,
+    latest_time: Optional[str] = None,
+    max_per_day: int = 3,
+    max_results: int = 10,
+    calendar_ids: Optional[List[str]] = None,
+    phone_number: Optional[str] = None,
+):
+    """
+    Free appointment times across several days (e.g. "any time this week?").
+    start_date: YYYY-MM-DD. earliest_time / latest_time (HH:MM) narrow the day,
+    e.g. latest_time="12:00" for mornings only. calendar_ids: extra calendars
+    (other staff) that must all be free at the same time.
+    """
+    tenant_id, _ = get_session_context()
+    bot_cfg = get_tenant_config()
+    if duration_minutes is None:
+        duration_minutes = bot_cfg.get("slot_duration_mins", config.DEFAULT_APPOINTMENT_DURATION)
+    duration_minutes = int(duration_minutes)
+    days = max(1, min(int(days or 1), config.AVAILABILITY_GRID_MAX_DAYS))
 
-    while current < end_search and len(available_slots) < max_slots:
-        end_time = current + datetime.timedelta(minutes=duration_minutes)
+    try:
+        first_day = datetime.date.fromisoformat(str(start_date)[:10])
+    except ValueError:
+        return "Error: start_date must be in YYYY-MM-DD format."
+    earliest_min = _time_to_minutes(earliest_time) if earliest_time else None
+    latest_min = _time_to_minutes(latest_time) if latest_time else None
 
-        # Check overlap with any busy slot
-        is_busy = False
-        for busy_start, busy_end in busy_intervals:
-            if not (end_time <= busy_start or current >= busy_end):
-                is_busy = True
-                break
+    try:
+        service, calendar_id = _get_service_and_calendar(tenant_id)
+    except Exception as e:
+        return f"Error: Calendar not available — {e}"
 
-        if not is_busy and is_within_business_hours(
-            current.strftime("%Y-%m-%dT%H:%M:%S"),
-            duration_minutes=duration_minutes
-        ):
-            available_slots.append(current.strftime("%Y-%m-%dT%H:%M:%S"))
+    now_dt = datetime.datetime.now(IST)
+    first_day = max(first_day, now_dt.date())
+    periods = _normalize_business_periods(bot_cfg)
+    grid = AvailabilityGrid(
+        periods, first_day, days, config.CALENDAR_TIMEZONE,
+        cell_minutes=cell_minutes_for(periods, duration_minutes),
+    )
 
-        current += datetime.timedelta(minutes=duration_minutes)
+    # One lookup per source: the tenant calendar (mirror or freebusy), plus one
+    # freebusy call covering every extra calendar. Each is ANDed into the grid.
+    grid.block(_get_busy_intervals(service, calendar_id, tenant_id, grid.origin, grid.end))
+    extra = [cid for cid in (calendar_ids or []) if cid and cid != calendar_id]
+    if extra:
+        try:
+            for busy in _get_busy_by_calendar(service, extra, grid.origin, grid.end).values():
+                grid.block(busy)
+        except Exception as e:
+            return f"Error: Could not read the other calendars — {e}"
+
+    by_day = grid.start_times(
+        duration_minutes,
+        max_per_day=max(1, int(max_per_day)),
+        max_results=max(1, int(max_results)),
+        step_minutes=duration_minutes,
+        not_before=now_dt,
+        earliest_minute=earliest_min,
+        latest_minute=latest_min,
+    )
+    available_slots = [
+        s.astimezone(IST).strftime("%Y-%m-%dT%H:%M:%S") for starts in by_day.values() for s in starts
+    ]
 
     if available_slots:
         return f"AVAILABLE_SLOTS: {available_slots}"
-
-    return "No available slots found in the next few hours."
+    return f"No available slots found in the next {days} days."
 
 # ── Tool: book_appointment ────────────────────────────────────────────────────
 
@@ -373,7 +496,7 @@ def book_appointment(
     if is_past_time(start_time_str):
         return "Error: Cannot book an appointment in the past."
 
-    availability = check_calendar_availability(start_time_str, duration_minutes=duration_minutes)
+    availability = _slot_availability(start_time_str, duration_minutes=duration_minutes, live=True)
     if "BUSY" in availability:
         return "Error: Slot already occupied."
     if "Error" in availability:
@@ -408,6 +531,7 @@ def book_appointment(
 
     created_event = service.events().insert(calendarId=calendar_id, body=event).execute()
     calendar_event_id = created_event.get("id")
+    calendar_mirror.record_event(tenant_id, created_event)
 
     if phone_number and calendar_event_id:
         _try_db(
@@ -481,6 +605,7 @@ def cancel_appointment(
         return f"Error: Calendar not available — {e}"
 
     service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+    calendar_mirror.forget_event(tenant_id, event_id)
 
     # 4. Mark CANCELLED in DB
     _try_db(update_status_by_event_id, event_id, "CANCELLED")
@@ -531,7 +656,7 @@ def reschedule_appointment(
         return f"Error: No appointment found at {old_start_time_str}."
 
     # 3. Check new slot is free
-    availability = check_calendar_availability(new_start_time_str, duration_minutes=duration_minutes)
+    availability = _slot_availability(new_start_time_str, duration_minutes=duration_minutes, live=True)
     if "BUSY" in availability:
         return f"Error: The new slot {new_start_time_str} is already occupied."
     if "Error" in availability:
@@ -551,7 +676,8 @@ def reschedule_appointment(
     event["start"]["dateTime"] = new_naive_dt.strftime("%Y-%m-%dT%H:%M:%S")
     event["end"]["dateTime"] = new_end_dt.strftime("%Y-%m-%dT%H:%M:%S")
 
-    service.events().update(calendarId=calendar_id, eventId=event_id, body=event).execute()
+    updated_event = service.events().update(calendarId=calendar_id, eventId=event_id, body=event).execute()
+    calendar_mirror.record_event(tenant_id, updated_event)
 
     # 5. Update DB
     if phone_number:
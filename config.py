@@ -14,16 +14,177 @@ MAX_TOOL_ITERATIONS = 2
 
 MIN_CHUNK_CHARS = 20
 
+#----------- stream LLM tokens and speak each sentence as soon as it completes
+LLM_STREAM_TTS = True
+
 #-------- frames sent to Sarvam STT to warm it up before actual conversation
 WARMUP_FRAMES = 10
 
 #------------ max reconnect attempts to Sarvam STT on idle disconnect
 MAX_RECONNECTS = 15
 
+STT_MODEL = "saaras:v3"
+
+#------------ pool of connected + warmed-up STT sockets per language (services/stt_pool.py);
+#------------ sessions and language switches check one out instead of connecting
+STT_POOL_ENABLED     = True
+STT_POOL_SIZES       = {"gu-IN": 1, "hi-IN": 1, "en-IN": 1}   # idle sockets kept per language
+STT_POOL_MAX_TOTAL   = 4        # idle + opening, across languages
+STT_POOL_KEEPALIVE_S = 15.0     # silence frame to idle pooled sockets
+STT_POOL_MAX_IDLE_S  = 240.0    # recycle pooled sockets older than this
+STT_POOL_RETRY_S     = 2.0      # first back-off after a failed open (doubles, max 60 s)
+
+#------------ STT sender: a silence frame keeps the Sarvam socket alive after this much quiet
+STT_KEEPALIVE_INTERVAL_S = 20.0
+
+#------------ STT sender batching: queued mic frames are joined into one transcribe() call
+#------------ of up to ~TARGET_BYTES (16 kHz PCM16 → 8192 B = 256 ms, one browser frame);
+#------------ a short batch waits at most MAX_WAIT_MS for the next frame
+STT_BATCH_TARGET_BYTES = 8192
+STT_BATCH_MAX_WAIT_MS  = 20
+
+#--------------chat session registry (services/session_registry.py)----------------
+SESSION_IDLE_TTL_S   = 1800.0   # sessions without an open socket, untouched this long, are evicted
+SESSION_MAX_COUNT    = 2000     # LRU eviction past this many sessions (open sockets are never evicted)
+SESSION_MAX_TOTAL_MB = 256.0    # approximate memory budget across sessions, checked on each sweep
+SESSION_SWEEP_S      = 60.0
+
+#--------------shared session store (services/session_store.py)----------------
+#----------- "memory" = per process (single worker); "redis" = shared, required for
+#----------- several uvicorn workers. Both can be overridden by SESSION_STORE / REDIS_URL.
+SESSION_STORE_BACKEND = "memory"
+REDIS_URL             = "redis://localhost:6379/0"
+SESSION_STORE_PREFIX  = "samaysetu"
+ADMIN_TOKEN_TTL_S     = 12 * 3600
+VOICE_SESSION_TTL_S   = 1800     # durable voice state kept this long after the last turn
+
+#--------------barge-in (caller talks over the bot → reply cancelled)----------------
+#----------- negotiated per call ("barge_in": true in init); VAD speech for MIN_SPEECH_MS
+#----------- or a non-echo STT partial of MIN_PARTIAL_WORDS words interrupts the reply
+BARGE_IN_ENABLED            = True
+BARGE_IN_MIN_SPEECH_MS      = 500
+BARGE_IN_MIN_PARTIAL_WORDS  = 2
+BARGE_IN_PLAYBACK_WINDOW_S  = 15.0   # after synthesis ends, still flush the browser queue this long
+TTS_CHARS_PER_SECOND        = 14.0   # rough speaking rate, for the audio-saved estimate
+
+#--------------turn queue (services/turn_queue.py)----------------
+#----------- utterances arriving while a turn runs are held, not dropped; fragments
+#----------- within DEBOUNCE_MS of each other are merged into a single run_brain call
+TURN_DEBOUNCE_MS          = 300
+TURN_DEBOUNCE_MAX_MS      = 1500   # never hold the first fragment longer than this
+TURN_QUEUE_MAX_FRAGMENTS  = 8
+TURN_REPEAT_WINDOW_MS     = 3000   # a repeat of the turn just released (late commit echo) is dropped
+
+#--------------rule-based memory extraction (brain.extract_memory_rules)----------------
+#----------- dates / times / yes-no / language names are parsed locally; the small-LLM
+#----------- extraction is skipped only when the rules account for more than MIN_CONFIDENCE
+#----------- of the utterance's words (questions always go to the LLM)
+MEMORY_RULES_ENABLED        = True
+MEMORY_RULES_MIN_CONFIDENCE = 0.8
+
+#----------- a "yes" matching the pending booking / cancel / reschedule runs the calendar
+#----------- tool directly with a templated reply, skipping the main LLM
+DIRECT_ACTION_EXECUTOR = True
+
+#--------------main-LLM provider router (services/llm_router.py)----------------
+#----------- with keys for both Groq and NVIDIA, a call the primary has not answered within
+#----------- its recent p95 (clamped to MIN/MAX_DELAY_MS) is also sent to the other provider;
+#----------- the first answer wins. LLM_SECONDARY_PROVIDER (env) picks / disables ("none") it
+LLM_HEDGE_ENABLED           = True
+LLM_HEDGE_DEFAULT_DELAY_MS  = 1500    # until LLM_HEDGE_MIN_SAMPLES latencies are known
+LLM_HEDGE_MIN_DELAY_MS      = 400
+LLM_HEDGE_MAX_DELAY_MS      = 4000
+LLM_HEDGE_MIN_SAMPLES       = 10
+LLM_LATENCY_WINDOW          = 200     # recent latencies per provider kept for the p95
+LLM_EWMA_ALPHA              = 0.2
+LLM_ROUTE_SWITCH_RATIO      = 0.7     # secondary becomes first once its score is 30% better
+#----------- consecutive 429s that open a provider's circuit, and for how long
+LLM_BREAKER_429_THRESHOLD   = 3
+LLM_BREAKER_OPEN_S          = 30.0
+LLM_PROVIDER_RETRY_S        = 60.0    # a secondary whose client failed to build is retried after this
+
+#--------------speculative turn start (brain.SpeculativeTurn)----------------
+#----------- a partial transcript unchanged for STABLE_MS starts memory extraction and
+#----------- the LLM/tool binding before Sarvam's final; kept if the final is this similar
+#----------- and names the same numbers / date / time / intent
+SPECULATION_ENABLED        = True
+SPECULATION_STABLE_MS      = 400
+SPECULATION_MIN_SIMILARITY = 0.9
+
+#--------------voice activity gate (services/vad.py)----------------
+#----------- silent mic frames are dropped before Sarvam STT; speech onsets keep
+#----------- PREROLL_MS of the preceding audio, and HANGOVER_MS of trailing silence
+#----------- is still sent so STT can detect the end of the utterance
+VAD_ENABLED       = True
+VAD_SUBFRAME_MS   = 20
+VAD_MIN_RMS       = 300.0   # absolute floor on the speech threshold (PCM16 units)
+VAD_NOISE_RATIO   = 3.0     # speech = sub-frame RMS above noise floor × this
+VAD_NOISE_ADAPT   = 0.05    # EMA weight of each silent frame in the noise floor
+VAD_NOISE_WINDOW_MS = 3000  # min-statistics window: quietest sub-frame over this long …
+VAD_NOISE_RISE    = 0.1     # … pulls the floor up by this weight per frame, speech or not
+VAD_USE_ZCR       = True    # also accept quiet, high zero-crossing sub-frames (fricatives)
+VAD_FRICATIVE_ZCR = 0.25
+VAD_PREROLL_MS    = 300
+VAD_HANGOVER_MS   = 800
+
+TTS_MODEL = "bulbul:v3"
+
+#----------- Sarvam TTS WebSocket is kept open per voice call; ping it this often
+#----------- (server closes sockets after ~60 s of inactivity; 0 disables)
+TTS_WS_KEEPALIVE_S = 40.0
+
+#----------- a TTS response ends when Sarvam's "final" event arrives for every flush;
+#----------- the idle timeout (no audio for this long) is only a safety net
+TTS_COMPLETION_EVENTS = True
+TTS_IDLE_TIMEOUT_S    = 1.2
+
+#--------------TTS audio cache (services/tts_cache.py)----------------
+TTS_CACHE_ENABLED                 = True
+TTS_CACHE_DIR                     = "tts_cache"   # relative to the working directory
+TTS_CACHE_MEMORY_MAX_MB           = 32.0          # hot tier (LRU)
+TTS_CACHE_DISK_MAX_MB             = 512.0         # oldest files evicted past this
+TTS_CACHE_PRECOMPUTE_CONCURRENCY  = 4             # parallel renders on config save
+
 #----------- extra buffer after AI finishes speaking (prevents echo)
 AI_POST_TTS_BUFFER = 0.90
 
 
+#--------------database connection pool----------------
+DB_POOL_MIN_SIZE            = 2      # connections opened at startup
+DB_POOL_MAX_SIZE            = 10     # hard cap per process
+DB_POOL_ACQUIRE_TIMEOUT_S   = 5.0    # wait this long for a free connection, then fail
+DB_POOL_HEALTHCHECK_IDLE_S  = 30.0   # ping (SELECT 1) connections idle longer than this
+DB_POOL_MAX_LIFETIME_S      = 1800.0 # recycle connections older than this
+
+# asyncpg pool used by database/async_crud.py (acquire timeout shared with the above)
+ASYNC_DB_POOL_MIN_SIZE      = 2
+ASYNC_DB_POOL_MAX_SIZE      = 10
+ASYNC_DB_COMMAND_TIMEOUT_S  = 10.0   # per-statement timeout
+
+#--------------tenant config cache (database/tenant_cache.py)----------------
+TENANT_CACHE_TTL_S            = 300.0  # safety net if a NOTIFY is ever missed
+TENANT_CACHE_LISTEN_POLL_S    = 5.0    # select() timeout in the LISTEN thread
+TENANT_CACHE_LISTEN_RETRY_S   = 5.0    # reconnect delay after the LISTEN connection drops
+
+
+#--------------slot search (services/availability_engine.py)----------------
+AVAILABILITY_MAX_SEARCH_DAYS = 28   # cap for suggest_next_available_slot(search_days=...)
+AVAILABILITY_GRID_MAX_DAYS   = 90   # cap for find_available_times(days=...) (services/availability_grid.py)
+
+
+#--------------Google Calendar client cache (services/calendar_provider.py)----------------
+CALENDAR_CLIENT_TTL_S            = 3600.0  # rebuild a tenant's client at most this often
+CALENDAR_TOKEN_REFRESH_MARGIN_S  = 300.0   # refresh the access token this long before expiry
+CALENDAR_HTTP_TIMEOUT_S          = 15.0
+
+#--------------Google Calendar busy-time mirror (services/calendar_mirror.py)----------------
+CALENDAR_MIRROR_ENABLED          = True
+CALENDAR_MIRROR_REFRESH_S        = 30.0    # background incremental sync interval
+CALENDAR_MIRROR_MAX_STALENESS_S  = 120.0   # older than this → live freebusy fallback
+CALENDAR_MIRROR_LOOKBACK_HOURS   = 24      # full sync starts this far in the past
+CALENDAR_MIRROR_IDLE_EVICT_S     = 3600.0  # stop syncing tenants with no lookups for this long
+
+
 #--------------FACTS_MODULE (RAG)----------------
 # Qdrant local binary URL (run: ./qdrant in your terminal)
 QDRANT_URL        = "http://localhost:6333"
@@ -35,5 +196,9 @@ EMBEDDING_DIM     = 384
 KNOWLEDGE_CHUNK_MIN_WORDS = 20
 KNOWLEDGE_CHUNK_MAX_WORDS = 30
 
+# Bulk insert into knowledge_base (database/crud.py insert_knowledge_chunks)
+KNOWLEDGE_COPY_THRESHOLD  = 1000    # above this many chunks use COPY instead of multi-row INSERT
+KNOWLEDGE_COPY_BATCH_ROWS = 10000   # rows per COPY stream (bounds client memory)
+
 # RAG retrieval
 FACTS_TOP_K = 3
@@ -0,0 +1,562 @@
+"""
+database/async_crud.py
+----------------------
+asyncio counterpart of database/crud.py, built on the asyncpg pool in
+database/async_db.py. Function names, arguments and return shapes match
+crud.py one-for-one so call sites only swap `await asyncio.to_thread(fn, ...)`
+for `await fn(...)`.
+
+Every function falls back to the sync crud version in a worker thread when the
+asyncpg pool is not available, so the app keeps working without asyncpg.
+
+Only the calls made from FastAPI handlers / brain.py are ported natively.
+Rarely-hit helpers (module request workflow, which also runs DDL) are exposed
+here as thread-backed wrappers.
+"""
+
+import asyncio
+import functools
+import uuid
+from typing import Optional, List, Dict, Any
+
+import pytz
+
+import config
+from database import crud
+from database import async_db
+from database.crud import (
+    BOOKING_MODULE, FACTS_MODULE,
+    _serialize, _normalize_business_hours_periods, _prepare_bot_config_fields, _to_dt,
+)
+
+_INT_CONFIG_FIELDS = {
+    "business_hours_start", "business_hours_end", "slot_duration_mins", "silence_timeout_ms",
+}
+
+
+def _sync_fallback(sync_fn):
+    """Run `sync_fn` in a thread when the asyncpg pool is not ready."""
+    def decorator(async_fn):
+        @functools.wraps(async_fn)
+        async def wrapper(*args, **kwargs):
+            if not async_db.is_ready():
+                return await asyncio.to_thread(sync_fn, *args, **kwargs)
+            return await async_fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _threaded(sync_fn):
+    """Expose a sync crud function as a coroutine (always via a worker thread)."""
+    @functools.wraps(sync_fn)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(sync_fn, *args, **kwargs)
+    return wrapper
+
+
+def _to_timestamp(s):
+    """
+    Value for a TIMESTAMP column: naive CALENDAR_TIMEZONE wall time, as
+    calendar_tool writes through crud.py. asyncpg rejects aware datetimes there.
+    """
+    dt = _to_dt(s)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(pytz.timezone(config.CALENDAR_TIMEZONE)).replace(tzinfo=None)
+    return dt
+
+
+def _rowcount(status: str) -> int:
+    """asyncpg returns a status string like 'UPDATE 1' / 'DELETE 3'."""
+    try:
+        return int(status.split()[-1])
+    except Exception:
+        return 0
+
+
+# ══════════════════════════════════════════════════════════
+#  TENANT operations
+# ══════════════════════════════════════════════════════════
+
+@_sync_fallback(crud.create_tenant)
+async def create_tenant(business_name: str, business_type: str, owner_email: str) -> Dict[str, Any]:
+    async with async_db.acquire() as conn:
+        async with conn.transaction():
+            row = await conn.fetchrow(
+                """
+                INSERT INTO tenants (business_name, business_type, owner_email)
+                VALUES ($1, $2, $3)
+                RETURNING *;
+                """,
+                business_name, business_type, owner_email,
+            )
+            tenant = _serialize(row)
+            # Seed default modules: BOOKING enabled, FACTS disabled
+            await conn.execute(
+                """
+                INSERT INTO module_configs (tenant_id, module_name, is_enabled)
+                VALUES ($1, $2, TRUE), ($1, $3, FALSE)
+                ON CONFLICT (tenant_id, module_name) DO NOTHING;
+                """,
+                tenant["tenant_id"], BOOKING_MODULE, FACTS_MODULE,
+            )
+    return tenant
+
+
+@_sync_fallback(crud.get_all_tenants)
+async def get_all_tenants() -> List[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT t.*, bc.bot_name, bc.language_code,
+                   bc.business_hours_start, bc.business_hours_end, bc.business_hours_periods
+            FROM tenants t
+            LEFT JOIN bot_configs bc ON bc.tenant_id = t.tenant_id
+            ORDER BY t.created_at DESC;
+            """
+        )
+    result = [_serialize(r) for r in rows]
+    for row in result:
+        _normalize_business_hours_periods(row)
+    return result
+
+
+@_sync_fallback(crud.get_tenant_by_id)
+async def get_tenant_by_id(tenant_id: str) -> Optional[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow("SELECT * FROM tenants WHERE tenant_id = $1;", tenant_id)
+    return _serialize(row) if row else None
+
+
+@_sync_fallback(crud.update_tenant_status)
+async def update_tenant_status(tenant_id: str, is_active: bool) -> bool:
+    async with async_db.acquire() as conn:
+        status = await conn.execute(
+            "UPDATE tenants SET is_active = $1 WHERE tenant_id = $2;", is_active, tenant_id
+        )
+    return _rowcount(status) > 0
+
+
+@_sync_fallback(crud.get_platform_stats)
+async def get_platform_stats() -> Dict[str, Any]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM tenants)                          AS total_tenants,
+                (SELECT COUNT(*) FROM tenants WHERE is_active = TRUE)   AS active_tenants,
+                (SELECT COUNT(*) FROM users)                            AS total_users,
+                (SELECT COUNT(*) FROM appointments)                     AS total_appointments,
+                (SELECT COUNT(*) FROM appointments WHERE status='BOOKED'
+                 AND start_time >= NOW())                               AS upcoming_appointments,
+                (SELECT COUNT(*) FROM appointments
+                 WHERE created_at >= NOW() - INTERVAL '24 hours')       AS appointments_today;
+            """
+        )
+    return _serialize(row)
+
+
+# ══════════════════════════════════════════════════════════
+#  ADMIN (tenant admin) operations
+# ══════════════════════════════════════════════════════════
+
+@_sync_fallback(crud.create_tenant_admin)
+async def create_tenant_admin(tenant_id: str, email: str, password_hash: str, role: str = "admin") -> Dict[str, Any]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            INSERT INTO tenant_admins (tenant_id, email, password_hash, role)
+            VALUES ($1, $2, $3, $4)
+            RETURNING *;
+            """,
+            tenant_id, email, password_hash, role,
+        )
+    return _serialize(row)
+
+
+@_sync_fallback(crud.get_admin_by_email)
+async def get_admin_by_email(email: str) -> Optional[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT a.*, t.business_name, t.business_type, t.is_active AS tenant_active
+            FROM tenant_admins a
+            JOIN tenants t ON t.tenant_id = a.tenant_id
+            WHERE a.email = $1;
+            """,
+            email,
+        )
+    return _serialize(row) if row else None
+
+
+# ══════════════════════════════════════════════════════════
+#  BOT CONFIG operations
+# ══════════════════════════════════════════════════════════
+
+@_sync_fallback(crud.get_bot_config)
+async def get_bot_config(tenant_id: str) -> Optional[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow("SELECT * FROM bot_configs WHERE tenant_id = $1;", tenant_id)
+    cfg = _serialize(row) if row else None
+    if cfg:
+        _normalize_business_hours_periods(cfg)
+    return cfg
+
+
+@_sync_fallback(crud.upsert_bot_config)
+async def upsert_bot_config(tenant_id: str, **fields) -> Dict[str, Any]:
+    """Insert or update bot configuration for a tenant."""
+    filtered = _prepare_bot_config_fields(fields)
+    if not filtered:
+        return {}
+    # psycopg2 lets the server coerce '9' → 9; asyncpg encodes client-side.
+    for k in _INT_CONFIG_FIELDS & filtered.keys():
+        if filtered[k] is not None:
+            filtered[k] = int(filtered[k])
+
+    cols = ", ".join(filtered.keys())
+    placeholders = ", ".join(f"${i}" for i in range(2, len(filtered) + 2))
+    updates = ", ".join(f"{k} = EXCLUDED.{k}" for k in filtered)
+    sql = f"""
+        INSERT INTO bot_configs (tenant_id, {cols})
+        VALUES ($1, {placeholders})
+        ON CONFLICT (tenant_id) DO UPDATE SET {updates}, updated_at = NOW()
+        RETURNING *;
+    """
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow(sql, tenant_id, *filtered.values())
+    saved = _serialize(row)
+    _normalize_business_hours_periods(saved)
+    return saved
+
+
+# ══════════════════════════════════════════════════════════
+#  MODULE CONFIG operations
+# ══════════════════════════════════════════════════════════
+
+@_sync_fallback(crud.get_tenant_modules)
+async def get_tenant_modules(tenant_id: str) -> Dict[str, bool]:
+    async with async_db.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT module_name, is_enabled FROM module_configs WHERE tenant_id = $1;", tenant_id
+        )
+    result = {BOOKING_MODULE: True, FACTS_MODULE: False}   # safe defaults
+    for row in rows:
+        result[row["module_name"]] = row["is_enabled"]
+    return result
+
+
+@_sync_fallback(crud.get_module_configs_list)
+async def get_module_configs_list(tenant_id: str) -> List[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO module_configs (tenant_id, module_name, is_enabled)
+            VALUES ($1, 'BOOKING_MODULE', TRUE), ($1, 'FACTS_MODULE', FALSE)
+            ON CONFLICT (tenant_id, module_name) DO NOTHING;
+            """,
+            tenant_id,
+        )
+        rows = await conn.fetch(
+            """
+            SELECT module_name, is_enabled, updated_at
+            FROM module_configs
+            WHERE tenant_id = $1
+            ORDER BY module_name ASC;
+            """,
+            tenant_id,
+        )
+    return [_serialize(r) for r in rows]
+
+
+@_sync_fallback(crud.set_module_enabled)
+async def set_module_enabled(tenant_id: str, module_name: str, is_enabled: bool) -> Dict[str, Any]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            INSERT INTO module_configs (tenant_id, module_name, is_enabled)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (tenant_id, module_name)
+            DO UPDATE SET is_enabled = EXCLUDED.is_enabled, updated_at = NOW()
+            RETURNING *;
+            """,
+            tenant_id, module_name, is_enabled,
+        )
+    return _serialize(row)
+
+
+async def get_enabled_modules(tenant_id: str) -> list:
+    """Returns list of enabled module name strings."""
+    modules_dict = await get_tenant_modules(tenant_id)
+    return [name for name, on in modules_dict.items() if on]
+
+
+# ══════════════════════════════════════════════════════════
+#  KNOWLEDGE BASE operations  (FACTS_MODULE)
+# ══════════════════════════════════════════════════════════
+
+async def add_knowledge_chunks(tenant_id: str, chunks: List[str]) -> int:
+    """Insert text chunks into knowledge_base. Returns count inserted."""
+    return len(await insert_knowledge_chunks(tenant_id, chunks))
+
+
+@_sync_fallback(crud.insert_knowledge_chunks)
+async def insert_knowledge_chunks(tenant_id: str, chunks: List[str]) -> List[str]:
+    """
+    Bulk-insert chunks; returns new ids in input order (see crud.insert_knowledge_chunks).
+    Small batches use one INSERT ... SELECT unnest(...), large ones binary COPY.
+    """
+    contents = [chunk.strip() for chunk in chunks]
+    if not contents:
+        return []
+    ids = [uuid.uuid4() for _ in contents]
+
+    async with async_db.acquire() as conn:
+        async with conn.transaction():
+            if len(contents) <= config.KNOWLEDGE_COPY_THRESHOLD:
+                await conn.execute(
+                    """
+                    INSERT INTO knowledge_base (id, tenant_id, content)
+                    SELECT unnest($2::uuid[]), $1, unnest($3::text[]);
+                    """,
+                    tenant_id, ids, contents,
+                )
+            else:
+                tenant_uuid = uuid.UUID(str(tenant_id))
+                step = config.KNOWLEDGE_COPY_BATCH_ROWS
+                for start in range(0, len(contents), step):
+                    await conn.copy_records_to_table(
+                        "knowledge_base",
+                        columns=("id", "tenant_id", "content"),
+                        records=[
+                            (ids[i], tenant_uuid, contents[i])
+                            for i in range(start, min(start + step, len(contents)))
+                        ],
+                    )
+    return [str(i) for i in ids]
+
+
+@_sync_fallback(crud.get_knowledge_chunks)
+async def get_knowledge_chunks(tenant_id: str) -> List[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT * FROM knowledge_base WHERE tenant_id = $1 ORDER BY created_at ASC;", tenant_id
+        )
+    return [_serialize(r) for r in rows]
+
+
+@_sync_fallback(crud.delete_all_knowledge)
+async def delete_all_knowledge(tenant_id: str) -> int:
+    async with async_db.acquire() as conn:
+        status = await conn.execute("DELETE FROM knowledge_base WHERE tenant_id = $1;", tenant_id)
+    return _rowcount(status)
+
+
+@_sync_fallback(crud.delete_knowledge)
+async def delete_knowledge(knowledge_id: str, tenant_id: str) -> bool:
+    async with async_db.acquire() as conn:
+        status = await conn.execute(
+            "DELETE FROM knowledge_base WHERE id = $1 AND tenant_id = $2;", knowledge_id, tenant_id
+        )
+    return _rowcount(status) > 0
+
+
+# ══════════════════════════════════════════════════════════
+#  USER operations
+# ══════════════════════════════════════════════════════════
+
+@_sync_fallback(crud.create_user_if_not_exists)
+async def create_user_if_not_exists(phone_number: str, name: Optional[str] = None,
+                                    tenant_id: Optional[str] = None) -> Dict[str, Any]:
+    async with async_db.acquire() as conn:
+        if tenant_id:
+            await conn.execute(
+                """
+                INSERT INTO users (tenant_id, phone_number, name)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (tenant_id, phone_number) DO NOTHING;
+                """,
+                tenant_id, phone_number, name,
+            )
+            row = await conn.fetchrow(
+                "SELECT * FROM users WHERE tenant_id = $1 AND phone_number = $2;",
+                tenant_id, phone_number,
+            )
+        else:
+            await conn.execute(
+                """
+                INSERT INTO users (tenant_id, phone_number, name)
+                VALUES ((SELECT tenant_id FROM tenants LIMIT 1), $1, $2)
+                ON CONFLICT DO NOTHING;
+                """,
+                phone_number, name,
+            )
+            row = await conn.fetchrow(
+                "SELECT * FROM users WHERE phone_number = $1 LIMIT 1;", phone_number
+            )
+    return _serialize(row) if row else {}
+
+
+@_sync_fallback(crud.get_user_appointments)
+async def get_user_appointments(phone_number: str, tenant_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        if tenant_id:
+            rows = await conn.fetch(
+                """
+                SELECT * FROM appointments
+                WHERE tenant_id = $1 AND phone_number = $2
+                ORDER BY start_time DESC;
+                """,
+                tenant_id, phone_number,
+            )
+        else:
+            rows = await conn.fetch(
+                "SELECT * FROM appointments WHERE phone_number = $1 ORDER BY start_time DESC;",
+                phone_number,
+            )
+    return [_serialize(r) for r in rows]
+
+
+@_sync_fallback(crud.get_tenant_users)
+async def get_tenant_users(tenant_id: str) -> List[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT u.*, COUNT(a.appointment_id) AS appointment_count
+            FROM users u
+            LEFT JOIN appointments a ON a.tenant_id = u.tenant_id AND a.phone_number = u.phone_number
+            WHERE u.tenant_id = $1
+            GROUP BY u.user_id
+            ORDER BY u.created_at DESC;
+            """,
+            tenant_id,
+        )
+    return [_serialize(r) for r in rows]
+
+
+# ══════════════════════════════════════════════════════════
+#  APPOINTMENT operations
+# ══════════════════════════════════════════════════════════
+
+@_sync_fallback(crud.get_tenant_appointments_for_date)
+async def get_tenant_appointments_for_date(tenant_id: str, date_str: str) -> List[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT a.*, u.name AS customer_name
+            FROM appointments a
+            LEFT JOIN users u ON u.tenant_id = a.tenant_id AND u.phone_number = a.phone_number
+            WHERE a.tenant_id = $1 AND a.start_time::date = $2::text::date
+            ORDER BY a.start_time ASC;
+            """,
+            tenant_id, date_str,
+        )
+    return [_serialize(r) for r in rows]
+
+
+@_sync_fallback(crud.get_tenant_appointments_range)
+async def get_tenant_appointments_range(tenant_id: str, from_date: str, to_date: str) -> List[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT a.*, u.name AS customer_name
+            FROM appointments a
+            LEFT JOIN users u ON u.tenant_id = a.tenant_id AND u.phone_number = a.phone_number
+            WHERE a.tenant_id = $1
+              AND a.start_time BETWEEN $2::text::timestamp AND $3::text::timestamp
+            ORDER BY a.start_time ASC;
+            """,
+            tenant_id, from_date, to_date,
+        )
+    return [_serialize(r) for r in rows]
+
+
+@_sync_fallback(crud.get_tenant_stats)
+async def get_tenant_stats(tenant_id: str) -> Dict[str, Any]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT
+                COUNT(*) FILTER (WHERE status = 'BOOKED' AND start_time >= NOW())   AS upcoming,
+                COUNT(*) FILTER (WHERE start_time::date = CURRENT_DATE)             AS today_total,
+                COUNT(*) FILTER (WHERE status = 'CANCELLED'
+                                 AND created_at >= NOW() - INTERVAL '30 days')      AS cancelled_30d,
+                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '30 days')    AS booked_30d,
+                COUNT(DISTINCT phone_number)                                         AS unique_customers
+            FROM appointments
+            WHERE tenant_id = $1;
+            """,
+            tenant_id,
+        )
+    return _serialize(row)
+
+
+@_sync_fallback(crud.cancel_tenant_appointment_by_id)
+async def cancel_tenant_appointment_by_id(tenant_id: str, appointment_id: str) -> bool:
+    """Cancel a booked appointment by primary id for a tenant."""
+    async with async_db.acquire() as conn:
+        status = await conn.execute(
+            """
+            UPDATE appointments
+            SET status = 'CANCELLED'
+            WHERE tenant_id = $1
+              AND appointment_id = $2
+              AND status = 'BOOKED';
+            """,
+            tenant_id, appointment_id,
+        )
+    return _rowcount(status) > 0
+
+
+@_sync_fallback(crud.create_appointment)
+async def create_appointment(phone_number: str, start_time: str, end_time: str,
+                             calendar_event_id: str, tenant_id: Optional[str] = None) -> Dict[str, Any]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            INSERT INTO appointments
+                (tenant_id, phone_number, start_time, end_time, calendar_event_id)
+            VALUES ($1, $2, $3, $4, $5)
+            RETURNING *;
+            """,
+            tenant_id, phone_number, _to_timestamp(start_time), _to_timestamp(end_time), calendar_event_id,
+        )
+    return _serialize(row)
+
+
+# ══════════════════════════════════════════════════════════
+#  CALENDAR TOKEN operations
+# ══════════════════════════════════════════════════════════
+
+@_sync_fallback(crud.save_calendar_token)
+async def save_calendar_token(tenant_id: str, calendar_id: str, token_json: str) -> Dict[str, Any]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            INSERT INTO calendar_tokens (tenant_id, calendar_id, token_json)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (tenant_id) DO UPDATE
+                SET calendar_id = EXCLUDED.calendar_id,
+                    token_json  = EXCLUDED.token_json,
+                    connected_at = NOW()
+            RETURNING *;
+            """,
+            tenant_id, calendar_id, token_json,
+        )
+    return _serialize(row)
+
+
+@_sync_fallback(crud.get_calendar_token)
+async def get_calendar_token(tenant_id: str) -> Optional[Dict[str, Any]]:
+    async with async_db.acquire() as conn:
+        row = await conn.fetchrow("SELECT * FROM calendar_tokens WHERE tenant_id = $1;", tenant_id)
+    return _serialize(row) if row else None
+
+
+# ══════════════════════════════════════════════════════════
+#  Thread-backed wrappers (cold paths)
+# ══════════════════════════════════════════════════════════
+
+create_module_request    = _threaded(crud.create_module_request)
+get_all_module_requests  = _threaded(crud.get_all_module_requests)
+get_module_request_by_id = _threaded(crud.get_module_request_by_id)
+resolve_module_request   = _threaded(crud.resolve_module_request)
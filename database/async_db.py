@@ -0,0 +1,132 @@
+"""
+database/async_db.py
+--------------------
+Native asyncio PostgreSQL pool (asyncpg) for SamaySetu AI.
+
+The FastAPI handlers and brain.py talk to Postgres through database/async_crud.py,
+which borrows connections from this pool directly on the event loop — no
+asyncio.to_thread() hop and no default-executor slot per query.
+
+The psycopg2 pool in database/db.py stays in place for code that still runs in
+worker threads (calendar_tool.py tools, create_tables, etc.).
+
+If asyncpg is not installed (or the pool failed to start) is_ready() is False and
+async_crud transparently falls back to the sync crud functions in a thread.
+"""
+
+import asyncio
+import os
+import ssl
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import config
+from database.db import DATABASE_URL, CA_CERT_PATH
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    asyncpg = None
+    ASYNCPG_AVAILABLE = False
+
+
+_pool = None
+
+# ── stats ──────────────────────────────────────────────────────────────────
+_stats = {
+    "acquired_total": 0,
+    "timeouts_total": 0,
+    "wait_total_s":   0.0,
+    "wait_max_s":     0.0,
+}
+
+
+def _ssl_context() -> Optional[ssl.SSLContext]:
+    """Mirror database/db.py: verify-ca against ca.pem for Aiven."""
+    if os.path.exists(CA_CERT_PATH) and DATABASE_URL and "aivencloud" in DATABASE_URL:
+        ctx = ssl.create_default_context(cafile=CA_CERT_PATH)
+        ctx.check_hostname = False   # verify-ca, not verify-full
+        return ctx
+    return None
+
+
+async def init_async_pool():
+    """Create the asyncpg pool (called from FastAPI lifespan)."""
+    global _pool
+    if not ASYNCPG_AVAILABLE:
+        print("[DB_ASYNC] asyncpg not installed — async layer will use thread fallback.")
+        return
+    if _pool is not None:
+        return
+    try:
+        kwargs = {
+            "dsn": DATABASE_URL,
+            "min_size": config.ASYNC_DB_POOL_MIN_SIZE,
+            "max_size": config.ASYNC_DB_POOL_MAX_SIZE,
+            "command_timeout": config.ASYNC_DB_COMMAND_TIMEOUT_S,
+        }
+        ssl_ctx = _ssl_context()
+        if ssl_ctx is not None:
+            kwargs["ssl"] = ssl_ctx
+        _pool = await asyncpg.create_pool(**kwargs)
+        print(f"[DB_ASYNC] asyncpg pool ready: {get_async_pool_stats()}")
+    except Exception as e:
+        _pool = None
+        print(f"[DB_ASYNC] Warning: asyncpg pool unavailable, using thread fallback.\n{e}")
+
+
+async def close_async_pool():
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+def is_ready() -> bool:
+    return _pool is not None
+
+
+@asynccontextmanager
+async def acquire():
+    """Borrow an asyncpg connection; raises ConnectionError on acquire timeout."""
+    # Bound once: close_async_pool() may clear _pool while the connection is out.
+    pool = _pool
+    if pool is None:
+        raise ConnectionError("[DB_ASYNC] asyncpg pool is not initialised.")
+    t0 = time.monotonic()
+    try:
+        conn = await pool.acquire(timeout=config.DB_POOL_ACQUIRE_TIMEOUT_S)
+    except asyncio.TimeoutError as e:
+        _stats["timeouts_total"] += 1
+        raise ConnectionError(
+            f"[DB_ASYNC] No free connection within {config.DB_POOL_ACQUIRE_TIMEOUT_S:.1f}s."
+        ) from e
+    waited = time.monotonic() - t0
+    _stats["acquired_total"] += 1
+    _stats["wait_total_s"] += waited
+    _stats["wait_max_s"] = max(_stats["wait_max_s"], waited)
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
+
+
+def get_async_pool_stats() -> dict:
+    acquired = _stats["acquired_total"]
+    stats = {
+        "ready":          _pool is not None,
+        "acquired_total": acquired,
+        "timeouts_total": _stats["timeouts_total"],
+        "wait_avg_ms":    round(_stats["wait_total_s"] / acquired * 1000, 3) if acquired else 0.0,
+        "wait_max_ms":    round(_stats["wait_max_s"] * 1000, 3),
+    }
+    if _pool is not None:
+        stats.update({
+            "min_size": _pool.get_min_size(),
+            "max_size": _pool.get_max_size(),
+            "size":     _pool.get_size(),
+            "idle":     _pool.get_idle_size(),
+        })
+    return stats
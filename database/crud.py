@@ -7,8 +7,15 @@ always isolated between different business owners.
 """
 
 from datetime import datetime
+import csv
+import io
 import json
+import uuid
 from typing import Optional, List, Dict, Any
+
+from psycopg2.extras import execute_values
+
+import config
 from database.db import get_db_connection
 
 # ── Known module names ────────────────────────────────────────────────────────
@@ -193,35 +200,9 @@ def get_bot_config(tenant_id: str) -> Optional[Dict[str, Any]]:
 
 def upsert_bot_config(tenant_id: str, **fields) -> Dict[str, Any]:
     """Insert or update bot configuration for a tenant."""
-    allowed = {
-        "bot_name", "receptionist_name", "language_code", "tts_speaker",
-        "business_hours_start", "business_hours_end", "slot_duration_mins",
-        "silence_timeout_ms", "greeting_message", "business_description",
-        "extra_prompt_context", "calendar_id", "business_hours_periods",
-    }
-    filtered = {k: v for k, v in fields.items() if k in allowed}
+    filtered = _prepare_bot_config_fields(fields)
     if not filtered:
         return {}
-    if "business_hours_periods" not in filtered:
-        if "business_hours_start" in filtered or "business_hours_end" in filtered:
-            try:
-                s = int(filtered.get("business_hours_start", 9))
-            except Exception:
-                s = 9
-            try:
-                e = int(filtered.get("business_hours_end", 18))
-            except Exception:
-                e = 18
-            if s < e:
-                filtered["business_hours_periods"] = json.dumps(
-                    [{"start": f"{s:02d}:00", "end": f"{e:02d}:00"}]
-                )
-    if (
-        "business_hours_periods" in filtered
-        and filtered["business_hours_periods"] is not None
-        and not isinstance(filtered["business_hours_periods"], str)
-    ):
-        filtered["business_hours_periods"] = json.dumps(filtered["business_hours_periods"])
 
     cols = ", ".join(filtered.keys())
     placeholders = ", ".join(["%s"] * len(filtered))
@@ -337,21 +318,65 @@ def set_module_enabled(tenant_id: str, module_name: str, is_enabled: bool) -> Di
 
 def add_knowledge_chunks(tenant_id: str, chunks: List[str]) -> int:
     """Insert text chunks into knowledge_base. Returns count inserted."""
-    sql = """
-        INSERT INTO knowledge_base (tenant_id, content)
-        VALUES (%s, %s);
+    return len(insert_knowledge_chunks(tenant_id, chunks))
+
+
+def insert_knowledge_chunks(tenant_id: str, chunks: List[str]) -> List[str]:
     """
+    Bulk-insert text chunks into knowledge_base in one transaction.
+    Returns the new row ids in the same order as `chunks`.
+
+    Up to KNOWLEDGE_COPY_THRESHOLD chunks go in a single multi-row
+    INSERT ... RETURNING id. Larger uploads are streamed with COPY in batches of
+    KNOWLEDGE_COPY_BATCH_ROWS; ids are generated client-side (uuid4) since COPY
+    cannot return them.
+    """
+    contents = [chunk.strip() for chunk in chunks]
+    if not contents:
+        return []
+
     conn = get_db_connection()
     try:
         with conn.cursor() as cur:
-            for chunk in chunks:
-                cur.execute(sql, (tenant_id, chunk.strip()))
+            if len(contents) <= config.KNOWLEDGE_COPY_THRESHOLD:
+                rows = execute_values(
+                    cur,
+                    "INSERT INTO knowledge_base (tenant_id, content) VALUES %s RETURNING id;",
+                    [(tenant_id, c) for c in contents],
+                    page_size=len(contents),
+                    fetch=True,
+                )
+                ids = [str(r["id"]) for r in rows]
+            else:
+                ids = [str(uuid.uuid4()) for _ in contents]
+                step = config.KNOWLEDGE_COPY_BATCH_ROWS
+                for start in range(0, len(contents), step):
+                    cur.copy_expert(
+                        "COPY knowledge_base (id, tenant_id, content) FROM STDIN "
+                        "WITH (FORMAT csv, FORCE_NOT_NULL (content))",
+                        _knowledge_csv(tenant_id, ids[start:start + step], contents[start:start + step]),
+                    )
         conn.commit()
-        return len(chunks)
+        return ids
     finally:
         conn.close()
 
 
+def _knowledge_csv(tenant_id: str, ids: List[str], contents: List[str]) -> io.StringIO:
+    """
+    Render one COPY batch as CSV (handles quotes/newlines inside chunks). An
+    empty chunk is written as an unquoted empty field, which CSV COPY reads as
+    NULL — the COPY statement's FORCE_NOT_NULL (content) keeps it '', as the
+    INSERT path stores it.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row_id, content in zip(ids, contents):
+        writer.writerow((row_id, tenant_id, content))
+    buf.seek(0)
+    return buf
+
+
 def get_knowledge_chunks(tenant_id: str) -> List[Dict[str, Any]]:
     """Return all knowledge chunks for a tenant (used for admin preview)."""
     sql = "SELECT * FROM knowledge_base WHERE tenant_id = %s ORDER BY created_at ASC;"
@@ -739,6 +764,43 @@ def _serialize(row) -> Dict[str, Any]:
     return r
 
 
+def _prepare_bot_config_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Keep only known bot_configs columns and derive/serialise business_hours_periods.
+    Shared by the sync (crud) and async (async_crud) upsert paths.
+    """
+    allowed = {
+        "bot_name", "receptionist_name", "language_code", "tts_speaker",
+        "business_hours_start", "business_hours_end", "slot_duration_mins",
+        "silence_timeout_ms", "greeting_message", "business_description",
+        "extra_prompt_context", "calendar_id", "business_hours_periods",
+    }
+    filtered = {k: v for k, v in fields.items() if k in allowed}
+    if not filtered:
+        return {}
+    if "business_hours_periods" not in filtered:
+        if "business_hours_start" in filtered or "business_hours_end" in filtered:
+            try:
+                s = int(filtered.get("business_hours_start", 9))
+            except Exception:
+                s = 9
+            try:
+                e = int(filtered.get("business_hours_end", 18))
+            except Exception:
+                e = 18
+            if s < e:
+                filtered["business_hours_periods"] = json.dumps(
+                    [{"start": f"{s:02d}:00", "end": f"{e:02d}:00"}]
+                )
+    if (
+        "business_hours_periods" in filtered
+        and filtered["business_hours_periods"] is not None
+        and not isinstance(filtered["business_hours_periods"], str)
+    ):
+        filtered["business_hours_periods"] = json.dumps(filtered["business_hours_periods"])
+    return filtered
+
+
 def _normalize_business_hours_periods(cfg: Dict[str, Any]) -> None:
     """
     Ensure business_hours_periods is always a normalized list:
@@ -11,43 +11,348 @@ DEVELOPER ACTION REQUIRED:
 To create the database in psql:
     CREATE USER samaysetu WITH PASSWORD 'secretpassword';
     CREATE DATABASE samaysetu_db OWNER samaysetu;
+
+CONNECTION POOLING:
+  get_db_connection() no longer opens a fresh connection (and, on Aiven, a fresh
+  verify-ca TLS handshake) per query. It borrows from a process-wide, bounded
+  pool; calling .close() on the returned object hands it back to the pool.
+  Sizes / timeouts live in config.py (DB_POOL_*).
 """
 
 import os
+import threading
+import time
+from collections import deque
+
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
 
+import config
+
 # ── Database URL ─────────────────────────────────────────────────────────────
 # Replace with your actual PostgreSQL credentials, or set DATABASE_URL env var.
 DATABASE_URL = os.getenv("DATABASE_URL")
 CA_CERT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ca.pem")
 
-def get_db_connection():
-    """
-    Returns a new psycopg2 connection using DATABASE_URL.
-    Caller is responsible for closing the connection.
 
-    Usage:
-        conn = get_db_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT 1")
-        finally:
-            conn.close()
-    """
+class PoolTimeoutError(ConnectionError):
+    """Raised when no pooled connection became free within DB_POOL_ACQUIRE_TIMEOUT_S."""
+    pass
+
+
+def _open_raw_connection():
+    """Open a brand-new psycopg2 connection (used only by the pool)."""
     try:
         connect_kwargs = {"cursor_factory": RealDictCursor}
-        
+
         # Configure SSL for Aiven PostgreSQL if ca.pem exists
         if os.path.exists(CA_CERT_PATH) and DATABASE_URL and "aivencloud" in DATABASE_URL:
             connect_kwargs["sslmode"] = "verify-ca"
             connect_kwargs["sslrootcert"] = CA_CERT_PATH
-            
-        conn = psycopg2.connect(DATABASE_URL, **connect_kwargs)
-        return conn
+
+        return psycopg2.connect(DATABASE_URL, **connect_kwargs)
     except psycopg2.OperationalError as e:
         raise ConnectionError(
             f"[DB] Could not connect to PostgreSQL.\n"
             f"Check your DATABASE_URL: {DATABASE_URL}\n"
             f"Original error: {e}"
         ) from e
+
+
+class _PooledConnection:
+    """
+    Thin proxy around a pooled psycopg2 connection.
+    Everything is delegated to the real connection except close(), which
+    returns the connection to the pool instead of tearing it down.
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw):
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+
+    def __getattr__(self, name):
+        if name in ("_pool", "_raw", "_released"):
+            raise AttributeError(name)
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._raw)
+
+    def __del__(self):
+        # Safety net for callers that forget close() — never leak a pool slot.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe, health-checked psycopg2 pool.
+
+    - Never holds more than `max_size` open connections.
+    - acquire() blocks up to `acquire_timeout` seconds for a free slot, then
+      raises PoolTimeoutError (a ConnectionError, so existing handlers apply).
+    - Connections idle longer than `healthcheck_idle_s` are pinged with
+      SELECT 1 before being handed out; dead ones are replaced transparently.
+    - Connections older than `max_lifetime_s` are recycled on return.
+    """
+
+    def __init__(self, min_size: int, max_size: int, acquire_timeout: float,
+                 healthcheck_idle_s: float, max_lifetime_s: float):
+        self.min_size = max(0, int(min_size))
+        self.max_size = max(1, int(max_size), self.min_size)
+        self.acquire_timeout = float(acquire_timeout)
+        self.healthcheck_idle_s = float(healthcheck_idle_s)
+        self.max_lifetime_s = float(max_lifetime_s)
+
+        self._cond = threading.Condition()
+        self._idle: deque = deque()     # (raw_conn, last_used_monotonic, created_monotonic)
+        self._created_at: dict = {}     # id(raw_conn) → created_monotonic
+        self._size = 0                  # open connections (idle + in use)
+        self._waiting = 0
+        self._closed = False
+
+        # ── stats ──────────────────────────────────────────────────────────
+        self._acquired = 0
+        self._connects = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._wait_total_s = 0.0
+        self._wait_max_s = 0.0
+
+    # ── public API ─────────────────────────────────────────────────────────
+
+    def warm(self):
+        """Open up to min_size connections ahead of the first request."""
+        opened = []
+        try:
+            while True:
+                with self._cond:
+                    if self._size >= self.min_size or self._closed:
+                        break
+                    self._size += 1
+                try:
+                    raw = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                opened.append(raw)
+        finally:
+            now = time.monotonic()
+            with self._cond:
+                for raw in opened:
+                    self._idle.append((raw, now, self._created_at.get(id(raw), now)))
+                self._cond.notify_all()
+
+    def acquire(self) -> _PooledConnection:
+        t0 = time.monotonic()
+        deadline = t0 + self.acquire_timeout
+        while True:
+            raw, last_used = self._checkout(deadline)
+            if raw is None:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(raw, last_used):
+                self._discard(raw)
+                continue
+
+            waited = time.monotonic() - t0
+            with self._cond:
+                self._acquired += 1
+                self._wait_total_s += waited
+                self._wait_max_s = max(self._wait_max_s, waited)
+            return _PooledConnection(self, raw)
+
+    def close_all(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for raw, _, _ in idle:
+            self._discard(raw)
+
+    def stats(self) -> dict:
+        with self._cond:
+            acquired = self._acquired
+            return {
+                "min_size":        self.min_size,
+                "max_size":        self.max_size,
+                "size":            self._size,
+                "idle":            len(self._idle),
+                "in_use":          self._size - len(self._idle),
+                "waiting":         self._waiting,
+                "acquired_total":  acquired,
+                "connects_total":  self._connects,
+                "discarded_total": self._discarded,
+                "timeouts_total":  self._timeouts,
+                "wait_avg_ms":     round(self._wait_total_s / acquired * 1000, 3) if acquired else 0.0,
+                "wait_max_ms":     round(self._wait_max_s * 1000, 3),
+            }
+
+    # ── internals ──────────────────────────────────────────────────────────
+
+    def _checkout(self, deadline: float):
+        """Return (raw, last_used) for an idle conn, or (None, None) when the
+        caller reserved a slot and must open a new connection."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ConnectionError("[DB] Connection pool is closed.")
+                if self._idle:
+                    raw, last_used, _ = self._idle.pop()   # LIFO → hottest connection
+                    return raw, last_used
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"[DB] No free connection within {self.acquire_timeout:.1f}s "
+                        f"(pool max_size={self.max_size})."
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+    def _connect(self):
+        raw = _open_raw_connection()
+        with self._cond:
+            self._connects += 1
+            self._created_at[id(raw)] = time.monotonic()
+        return raw
+
+    def _is_healthy(self, raw, last_used: float) -> bool:
+        if raw.closed:
+            return False
+        if time.monotonic() - last_used < self.healthcheck_idle_s:
+            return True
+        try:
+            with raw.cursor() as cur:
+                cur.execute("SELECT 1;")
+                cur.fetchone()
+            raw.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _release(self, raw):
+        try:
+            if not raw.closed and raw.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                # Read-only crud helpers never commit — end their implicit transaction.
+                raw.rollback()
+        except Exception:
+            self._discard(raw)
+            return
+
+        now = time.monotonic()
+        created = self._created_at.get(id(raw), now)
+        if raw.closed or now - created > self.max_lifetime_s:
+            self._discard(raw)
+            return
+
+        with self._cond:
+            if self._closed:
+                keep = False
+            else:
+                self._idle.append((raw, now, created))
+                keep = True
+            self._cond.notify()
+        if not keep:
+            self._discard(raw)
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created_at.pop(id(raw), None)
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+
+# ── Process-wide pool ────────────────────────────────────────────────────────
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide pool, creating it on first use (and after fork)."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = ConnectionPool(
+                min_size=config.DB_POOL_MIN_SIZE,
+                max_size=config.DB_POOL_MAX_SIZE,
+                acquire_timeout=config.DB_POOL_ACQUIRE_TIMEOUT_S,
+                healthcheck_idle_s=config.DB_POOL_HEALTHCHECK_IDLE_S,
+                max_lifetime_s=config.DB_POOL_MAX_LIFETIME_S,
+            )
+            _pool_pid = pid
+    return _pool
+
+
+def init_db_pool():
+    """Pre-open DB_POOL_MIN_SIZE connections (called from FastAPI lifespan)."""
+    try:
+        get_pool().warm()
+        print(f"[DB] Connection pool ready: {get_pool_stats()}")
+    except ConnectionError as e:
+        print(f"[DB] Warning: connection pool warm-up failed.\n{e}")
+
+
+def close_db_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+def get_pool_stats() -> dict:
+    return get_pool().stats()
+
+
+def get_db_connection():
+    """
+    Borrows a psycopg2 connection from the process-wide pool.
+    Caller is responsible for closing it — close() returns it to the pool.
+
+    Usage:
+        conn = get_db_connection()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("SELECT 1")
+        finally:
+            conn.close()
+    """
+    return get_pool().acquire()
@@ -138,6 +138,45 @@ def create_tables():
         "CREATE INDEX IF NOT EXISTS idx_users_tenant_phone  ON users (tenant_id, phone_number);",
         "CREATE INDEX IF NOT EXISTS idx_module_configs_tenant ON module_configs (tenant_id, module_name);",
         "CREATE INDEX IF NOT EXISTS idx_knowledge_tenant    ON knowledge_base (tenant_id);",
+
+        # ── Tenant config change notifications (database/tenant_cache.py) ────
+        # Every worker LISTENs on this channel and drops its cached copy.
+        """
+        CREATE OR REPLACE FUNCTION notify_tenant_config_changed() RETURNS trigger AS $$
+        DECLARE
+            row_tenant UUID;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_tenant := OLD.tenant_id;
+            ELSE
+                row_tenant := NEW.tenant_id;
+            END IF;
+            PERFORM pg_notify(
+                'tenant_config_changed',
+                json_build_object('table', TG_TABLE_NAME, 'tenant_id', row_tenant)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        "DROP TRIGGER IF EXISTS trg_bot_configs_notify ON bot_configs;",
+        """
+        CREATE TRIGGER trg_bot_configs_notify
+        AFTER INSERT OR UPDATE OR DELETE ON bot_configs
+        FOR EACH ROW EXECUTE FUNCTION notify_tenant_config_changed();
+        """,
+        "DROP TRIGGER IF EXISTS trg_module_configs_notify ON module_configs;",
+        """
+        CREATE TRIGGER trg_module_configs_notify
+        AFTER INSERT OR UPDATE OR DELETE ON module_configs
+        FOR EACH ROW EXECUTE FUNCTION notify_tenant_config_changed();
+        """,
+        "DROP TRIGGER IF EXISTS trg_calendar_tokens_notify ON calendar_tokens;",
+        """
+        CREATE TRIGGER trg_calendar_tokens_notify
+        AFTER INSERT OR UPDATE OR DELETE ON calendar_tokens
+        FOR EACH ROW EXECUTE FUNCTION notify_tenant_config_changed();
+        """,
     ]
 
     try:
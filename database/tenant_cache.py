@@ -0,0 +1,282 @@
+"""
+database/tenant_cache.py
+------------------------
+In-process, versioned cache of rarely-changing tenant configuration:
+
+  bot_config      — bot_configs row           (voice init, preview chat)
+  modules         — {module_name: is_enabled} (run_brain / module_registry)
+  calendar_token  — calendar_tokens row       (services/calendar_provider.py)
+
+INVALIDATION:
+  database/models.py installs AFTER INSERT/UPDATE/DELETE triggers on bot_configs,
+  module_configs and calendar_tokens that pg_notify('tenant_config_changed',
+  {"table": ..., "tenant_id": ...}). start_listener() runs a daemon thread per
+  worker that LISTENs on that channel, bumps the tenant's version and drops the
+  affected entry, so every uvicorn worker sees admin changes within milliseconds.
+  Whenever the LISTEN connection (re)connects the whole cache is cleared, since
+  notifications sent while it was down are lost. TENANT_CACHE_TTL_S is only a
+  safety net.
+
+  A load that races with an invalidation is not stored: entries are tagged with
+  the (global epoch, tenant version) read before the DB query. A global
+  invalidation bumps the epoch, so it also covers tenants the cache has not
+  seen yet.
+
+Values are deep-copied on the way out — callers (e.g. run_brain) mutate
+session bot_config in place.
+"""
+
+import copy
+import json
+import select
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+
+CHANNEL = "tenant_config_changed"
+
+BOT_CONFIG     = "bot_config"
+MODULES        = "modules"
+CALENDAR_TOKEN = "calendar_token"
+
+# table name in the NOTIFY payload → cache kind
+_TABLE_KINDS = {
+    "bot_configs":     BOT_CONFIG,
+    "module_configs":  MODULES,
+    "calendar_tokens": CALENDAR_TOKEN,
+}
+
+_lock = threading.Lock()
+_entries: Dict[Tuple[str, str], Tuple[Tuple[int, int], float, Any]] = {}   # (kind, tenant) → (version, loaded_at, value)
+_versions: Dict[str, int] = {}                                  # tenant → version
+_epoch = 0                                                      # bumped by invalidate(None)
+_hooks: List[Callable[[str, Optional[str]], None]] = []
+
+_stats = {
+    "hits":           0,
+    "misses":         0,
+    "stale_loads":    0,
+    "invalidations":  0,
+    "notifications":  0,
+    "listener_reconnects": 0,
+}
+_listener_connected = False
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Core cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _current_version(tenant_id: str) -> Tuple[int, int]:
+    # caller holds _lock
+    return _epoch, _versions.get(tenant_id, 0)
+
+
+def _lookup(kind: str, tenant_id: str) -> Tuple[bool, Any, Tuple[int, int]]:
+    """Return (hit, value, current_version)."""
+    key = (kind, str(tenant_id))
+    now = time.monotonic()
+    with _lock:
+        version = _current_version(key[1])
+        entry = _entries.get(key)
+        if entry is not None:
+            ver, loaded_at, value = entry
+            if ver == version and now - loaded_at < config.TENANT_CACHE_TTL_S:
+                _stats["hits"] += 1
+                return True, value, version
+            del _entries[key]
+        _stats["misses"] += 1
+        return False, None, version
+
+
+def _store(kind: str, tenant_id: str, version: Tuple[int, int], value: Any):
+    key = (kind, str(tenant_id))
+    with _lock:
+        if _current_version(key[1]) != version:
+            # Invalidated while we were loading — don't cache a stale row.
+            _stats["stale_loads"] += 1
+            return
+        _entries[key] = (version, time.monotonic(), copy.deepcopy(value))
+
+
+def _cached(kind: str, tenant_id: str, loader: Callable[[str], Any]) -> Any:
+    hit, value, version = _lookup(kind, tenant_id)
+    if hit:
+        return copy.deepcopy(value)
+    value = loader(tenant_id)
+    _store(kind, tenant_id, version, value)
+    return value
+
+
+async def _acached(kind: str, tenant_id: str, loader) -> Any:
+    hit, value, version = _lookup(kind, tenant_id)
+    if hit:
+        return copy.deepcopy(value)
+    value = await loader(tenant_id)
+    _store(kind, tenant_id, version, value)
+    return value
+
+
+def invalidate(tenant_id: Optional[str] = None, kind: Optional[str] = None):
+    """
+    Drop cached config. tenant_id=None clears every tenant; kind=None clears all
+    kinds for the tenant. Registered hooks run after the cache is updated.
+    """
+    global _epoch
+    with _lock:
+        _stats["invalidations"] += 1
+        if tenant_id is None:
+            _epoch += 1
+            _entries.clear()
+        else:
+            tenant_id = str(tenant_id)
+            _versions[tenant_id] = _versions.get(tenant_id, 0) + 1
+            for k in [BOT_CONFIG, MODULES, CALENDAR_TOKEN] if kind is None else [kind]:
+                _entries.pop((k, tenant_id), None)
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook(tenant_id, kind)
+        except Exception as e:
+            print(f"[TENANT_CACHE] Invalidation hook failed: {e}")
+
+
+def register_invalidation_hook(fn: Callable[[Optional[str], Optional[str]], None]):
+    """
+    fn(tenant_id, kind) is called after every invalidation (tenant_id/kind may be
+    None = everything). Hooks can run on the LISTEN thread — keep them
+    thread-safe or hop onto the event loop with call_soon_threadsafe.
+    """
+    with _lock:
+        if fn not in _hooks:
+            _hooks.append(fn)
+
+
+def get_version(tenant_id: str) -> Tuple[int, int]:
+    with _lock:
+        return _current_version(str(tenant_id))
+
+
+def get_cache_stats() -> dict:
+    with _lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+        return {
+            **_stats,
+            "hit_ratio":          round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "entries":            len(_entries),
+            "listener_connected": _listener_connected,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Getters  (same return shapes as database/crud.py)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def get_bot_config(tenant_id: str) -> Optional[Dict[str, Any]]:
+    from database.crud import get_bot_config as _load
+    return _cached(BOT_CONFIG, tenant_id, _load)
+
+
+def get_tenant_modules(tenant_id: str) -> Dict[str, bool]:
+    from database.crud import get_tenant_modules as _load
+    return _cached(MODULES, tenant_id, _load)
+
+
+def get_calendar_token(tenant_id: str) -> Optional[Dict[str, Any]]:
+    from database.crud import get_calendar_token as _load
+    return _cached(CALENDAR_TOKEN, tenant_id, _load)
+
+
+async def aget_bot_config(tenant_id: str) -> Optional[Dict[str, Any]]:
+    from database.async_crud import get_bot_config as _load
+    return await _acached(BOT_CONFIG, tenant_id, _load)
+
+
+async def aget_tenant_modules(tenant_id: str) -> Dict[str, bool]:
+    from database.async_crud import get_tenant_modules as _load
+    return await _acached(MODULES, tenant_id, _load)
+
+
+async def aget_calendar_token(tenant_id: str) -> Optional[Dict[str, Any]]:
+    from database.async_crud import get_calendar_token as _load
+    return await _acached(CALENDAR_TOKEN, tenant_id, _load)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LISTEN / NOTIFY thread
+# ─────────────────────────────────────────────────────────────────────────────
+
+_listener_thread: Optional[threading.Thread] = None
+_listener_stop = threading.Event()
+
+
+def _handle_notify(payload: str):
+    with _lock:
+        _stats["notifications"] += 1
+    try:
+        data = json.loads(payload)
+        tenant_id = data.get("tenant_id")
+        kind = _TABLE_KINDS.get(data.get("table"))
+    except (ValueError, AttributeError):
+        tenant_id, kind = None, None
+    # Unknown payload → be safe and clear everything.
+    invalidate(tenant_id, kind if tenant_id else None)
+
+
+def _listen_loop():
+    global _listener_connected
+    # Dedicated autocommit connection — never borrowed from the pool.
+    from database.db import _open_raw_connection
+
+    while not _listener_stop.is_set():
+        conn = None
+        try:
+            conn = _open_raw_connection()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL};")
+            with _lock:
+                _listener_connected = True
+                _stats["listener_reconnects"] += 1
+            # Anything sent while we were disconnected is gone.
+            invalidate()
+            print(f"[TENANT_CACHE] Listening on '{CHANNEL}'")
+
+            while not _listener_stop.is_set():
+                ready, _, _ = select.select([conn], [], [], config.TENANT_CACHE_LISTEN_POLL_S)
+                if not ready:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _handle_notify(conn.notifies.pop(0).payload)
+        except Exception as e:
+            print(f"[TENANT_CACHE] LISTEN connection lost: {e}")
+        finally:
+            with _lock:
+                _listener_connected = False
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        _listener_stop.wait(config.TENANT_CACHE_LISTEN_RETRY_S)
+
+
+def start_listener():
+    """Start the LISTEN thread (called from FastAPI lifespan, after create_tables)."""
+    global _listener_thread
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+    _listener_stop.clear()
+    _listener_thread = threading.Thread(target=_listen_loop, name="tenant-cache-listen", daemon=True)
+    _listener_thread.start()
+
+
+def stop_listener():
+    global _listener_thread
+    _listener_stop.set()
+    if _listener_thread is not None:
+        _listener_thread.join(timeout=config.TENANT_CACHE_LISTEN_POLL_S + 1)
+        _listener_thread = None
@@ -15,9 +15,11 @@ import base64
 import asyncio
 import secrets
 import hashlib
+import struct
+import time
 import traceback
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, date
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Depends, Header, Query
@@ -25,7 +27,7 @@ from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from sarvamai import AsyncSarvamAI, AudioOutput
+from sarvamai import AsyncSarvamAI, AudioOutput, EventResponse
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
@@ -36,13 +38,28 @@ import prompts
 from brain import (
     run_brain, log,
     is_noisy_transcript, is_echo_of_ai,
-    split_into_sentences, compute_rms, _get_fallback_message,
+    split_into_sentences, compute_rms, _get_fallback_message, fixed_tts_phrases,
+    settle_interrupted_turn, SpeculativeTurn, get_speculation_stats,
+    get_memory_extraction_stats, get_direct_action_stats, get_llm_router_stats,
+)
+from services import tts_cache
+from services.vad import VoiceActivityGate, get_vad_stats
+from services.turn_queue import UNCLEAR, TurnQueue, get_turn_queue_stats
+from services.stt_pool import STTConnectionPool
+from services.session_registry import SessionRegistry
+from services import session_store as store_ns
+from services.session_store import (
+    create_session_store, durable_voice_state, new_resume_token, take_voice_state,
 )
 
 # ── DB imports ────────────────────────────────────────────────────────────────
 try:
     from database.models import create_tables
-    from database.crud import (
+    from database.db import init_db_pool, close_db_pool, get_pool_stats
+    from database.async_db import init_async_pool, close_async_pool, get_async_pool_stats
+    from database import tenant_cache
+    # Coroutine versions of database/crud.py (asyncpg, thread fallback)
+    from database.async_crud import (
         create_user_if_not_exists, get_user_appointments,
         get_tenant_by_id, get_bot_config, upsert_bot_config,
         get_tenant_users, get_tenant_stats,
@@ -67,7 +84,10 @@ except ImportError as _db_err:
     print(f"[DB] Database module missing: {_db_err}")
 
 try:
-    from services.calendar_provider import verify_calendar_connection
+    from services.calendar_provider import (
+        verify_calendar_connection, invalidate_calendar_client, get_calendar_client_stats,
+    )
+    from services import calendar_mirror
     CALENDAR_SERVICE_AVAILABLE = True
 except ImportError:
     CALENDAR_SERVICE_AVAILABLE = False
@@ -136,10 +156,22 @@ class VoicePreviewRequest(BaseModel):
 async def lifespan(app: FastAPI):
     # ── Database setup ─────────────────────────────────────────────────────────
     if DB_AVAILABLE:
+        await asyncio.to_thread(init_db_pool)
         await asyncio.to_thread(create_tables)
+        await init_async_pool()
+        # Config changes (this or any other worker) → drop session/tool caches on the loop
+        _loop = asyncio.get_running_loop()
+        tenant_cache.register_invalidation_hook(
+            lambda tid, kind: _loop.call_soon_threadsafe(_on_tenant_config_invalidated, tid, kind)
+        )
+        tenant_cache.start_listener()
     else:
         print("[DB] Skipping table creation — psycopg2 unavailable.")
 
+    # ── Google Calendar busy-time mirror (background incremental sync) ────────
+    if CALENDAR_SERVICE_AVAILABLE:
+        calendar_mirror.start_mirror_refresher()
+
     # ── FIX 2: Pre-warm FACTS module (embedding model + Qdrant) ───────────────
     # facts_module._bootstrap() already ran at import time, loading the model.
     # This warmup call runs a dummy encode() to prime BLAS/ONNX routines so the
@@ -151,8 +183,24 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"[STARTUP] FACTS module warmup skipped (not installed?): {e}")
 
+    # ── Pre-warmed Sarvam STT sockets (services/stt_pool.py) ─────────────────
+    if config.STT_POOL_ENABLED:
+        stt_pool.start()
+
+    session_sweeper = asyncio.create_task(_sweep_chat_sessions())
+
     yield
 
+    session_sweeper.cancel()
+    await stt_pool.close()
+    await session_store.close()
+    if CALENDAR_SERVICE_AVAILABLE:
+        await asyncio.to_thread(calendar_mirror.stop_mirror_refresher)
+    if DB_AVAILABLE:
+        await asyncio.to_thread(tenant_cache.stop_listener)
+        await close_async_pool()
+        await asyncio.to_thread(close_db_pool)
+
 app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
@@ -162,9 +210,51 @@ app.add_middleware(
 
 
 # ── In-memory session stores ───────────────────────────────────────────────────
-chat_sessions:       Dict[str, dict] = {}
-admin_sessions:      Dict[str, dict] = {}
-superadmin_sessions: Dict[str, dict] = {}
+chat_sessions:       SessionRegistry = SessionRegistry()   # bounded, see services/session_registry.py
+# Shared across workers (SESSION_STORE=redis): admin tokens + durable voice-session state.
+session_store = create_session_store()
+
+
+
+async def _persist_voice_state(session_id: str):
+    """Write the durable part of a voice session to the shared store (best effort)."""
+    sess = chat_sessions.get(session_id)
+    if not sess or not sess.get("resume_token"):
+        return
+    try:
+        await session_store.set(store_ns.VOICE, sess["resume_token"], durable_voice_state(sess),
+                                ttl_s=config.VOICE_SESSION_TTL_S)
+    except Exception as e:
+        print(f"[SESSION_STORE] Persist failed for {session_id}: {e}")
+
+
+async def _restore_voice_state(session_id: str, resume_token: str, tenant_id: Optional[str]) -> bool:
+    """
+    Carry memory / confirmation state over from a previous connection (any
+    worker) of the same tenant and caller. Call after init has set the phone.
+    """
+    sess = chat_sessions.get(session_id)
+    if sess is None:
+        return False
+    try:
+        state = await take_voice_state(session_store, resume_token, tenant_id, sess.get("phone_number"))
+    except Exception as e:
+        print(f"[SESSION_STORE] Restore failed for {session_id}: {e}")
+        return False
+    if not state:
+        return False
+    sess.update(state)
+    return True
+
+
+async def _sweep_chat_sessions():
+    """Background: evict idle / over-budget chat sessions every SESSION_SWEEP_S."""
+    while True:
+        await asyncio.sleep(config.SESSION_SWEEP_S)
+        try:
+            chat_sessions.sweep()
+        except Exception as e:
+            print(f"[SESSIONS] Sweep failed: {e}")
 
 
 # ── Sarvam STT / TTS clients ──────────────────────────────────────────────────
@@ -181,10 +271,11 @@ _warmup_frames = config.WARMUP_FRAMES
 def _hash_password(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
 
-def _check_admin_token(x_admin_token: Optional[str] = Header(None)):
-    if not x_admin_token or x_admin_token not in admin_sessions:
+async def _check_admin_token(x_admin_token: Optional[str] = Header(None)):
+    session = await session_store.get(store_ns.ADMIN, x_admin_token) if x_admin_token else None
+    if not session:
         raise HTTPException(status_code=401, detail="Invalid or missing admin token")
-    return admin_sessions[x_admin_token]
+    return session
 
 def _check_superadmin_token(x_superadmin_token: Optional[str] = Header(None)):
     key = os.getenv("SUPERADMIN_SECRET", "changeme-superadmin")
@@ -215,27 +306,221 @@ def _normalize_tts_speaker(speaker: Optional[str]) -> str:
 async def tts_convert(text: str, speaker: str, lang: str) -> str:
     res = await client_tts.text_to_speech.convert(
         text=text, target_language_code=lang,
-        model="bulbul:v3", speaker=speaker
+        model=config.TTS_MODEL, speaker=speaker
     )
     return res.audios[0]
 
 
+async def _render_tts_wav(text: str, speaker: str, lang: str):
+    """tts_cache renderer: one HTTP convert → (wav bytes, "wav")."""
+    return base64.b64decode(await tts_convert(text, speaker, lang)), "wav"
+
+
+_background_tasks: set = set()
+
+
+def _precompute_tenant_tts(bot_cfg: dict):
+    """Pre-render the tenant's greeting and fixed phrases into tts_cache (background)."""
+    if not config.TTS_CACHE_ENABLED or not bot_cfg:
+        return
+    task = asyncio.create_task(tts_cache.precompute(fixed_tts_phrases(bot_cfg), _render_tts_wav))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
 # ── Streaming TTS session ──────────────────────────────────────────────────────
 
+# Process-wide counters for /superadmin/metrics (summed over all voice sessions)
+_tts_stream_stats = {
+    "connects":     0,   # new Sarvam TTS WebSocket handshakes
+    "reuses":       0,   # responses served on an already-open socket
+    "reconfigures": 0,   # configure() sent because speaker/language changed
+    "reconnects":   0,   # connects after the previous socket dropped
+    "responses":    0,
+    # End-of-response detection: provider "final" events vs the idle safety net
+    "completed_by_event": 0,
+    "completed_by_idle":  0,
+    "completed_by_barge_in": 0,
+    "tail_wait_ms_total": 0.0,  # last audio chunk → response declared done
+    # Browser delivery: binary frames (negotiated) vs base64-in-JSON
+    "binary_frames":      0,
+    "json_frames":        0,
+    "audio_bytes_out":    0,
+}
+
+# ── Binary audio frames (/ws/voice) ───────────────────────────────────────────
+# A client that sends {"type": "init", "binary_audio": true} receives TTS audio
+# as binary WebSocket messages instead of base64 "audio_chunk" JSON:
+#
+#   version u8 | response_id u32 | index u32 | format u8 | flags u8 | raw audio
+#
+# big-endian, 11-byte header; format 0 = mp3, 1 = wav; flags bit 0 = is_last.
+# Control messages (ai_speaking_start, tts_done, ...) stay JSON.
+AUDIO_FRAME_VERSION = 1
+AUDIO_FRAME_HEADER  = struct.Struct("!BIIBB")
+AUDIO_FRAME_FORMATS = {"mp3": 0, "wav": 1}
+AUDIO_FRAME_LAST    = 0x01
+
+
+def pack_audio_frame(audio: bytes, response_id: int, index: int, fmt: str, is_last: bool) -> bytes:
+    header = AUDIO_FRAME_HEADER.pack(
+        AUDIO_FRAME_VERSION, response_id & 0xFFFFFFFF, index & 0xFFFFFFFF,
+        AUDIO_FRAME_FORMATS[fmt], AUDIO_FRAME_LAST if is_last else 0,
+    )
+    return header + audio
+
+
+# Barge-in (caller speaks over the bot): what was cancelled and roughly how much
+# speech we never had to synthesize (unsent text / TTS_CHARS_PER_SECOND).
+_barge_in_stats = {
+    "barge_ins":          0,
+    "by_vad":             0,
+    "by_stt":             0,
+    "by_commit":          0,
+    "by_client":          0,
+    "llm_cancelled":      0,   # interrupted before any audio of the reply was synthesized
+    "playback_flushes":   0,   # synthesis already done — only the browser queue was flushed
+    "tts_chars_skipped":  0,
+    "audio_s_saved_est":  0.0,
+}
+
+
+def get_barge_in_stats() -> dict:
+    stats = dict(_barge_in_stats)
+    stats["audio_s_saved_est"] = round(stats["audio_s_saved_est"], 1)
+    return stats
+
+
+def get_tts_stream_stats() -> dict:
+    stats = dict(_tts_stream_stats)
+    stats["tail_wait_ms_total"] = round(stats["tail_wait_ms_total"], 1)
+    stats["tail_wait_ms_avg"] = (
+        round(stats["tail_wait_ms_total"] / stats["responses"], 1) if stats["responses"] else 0.0
+    )
+    return stats
+
+
 class StreamingTTSSession:
+    """
+    One Sarvam TTS WebSocket for the life of a voice call.
+
+    The socket is opened on the first response and reused for every later one;
+    configure() is only re-sent when speaker or language changes (e.g. after a
+    language switch in run_brain). A reader task moves incoming messages into
+    an inbox; when the server closes the socket (idle timeout, network) the
+    next response reconnects transparently. A keepalive ping every
+    TTS_WS_KEEPALIVE_S stops the server's idle timer while the call is quiet.
+
+    End of a response: the socket is opened with send_completion_event, and
+    Sarvam answers every flush() with a "final" event once that text's audio
+    is out. The response is done when every flush has its final — no fixed
+    tail. TTS_IDLE_TIMEOUT_S of audio silence is kept only as a safety net.
+
+    Audio goes to the browser through _send_audio(): binary frames when the
+    client negotiated binary_audio at init, base64 "audio_chunk" JSON otherwise.
+    """
+
     _SENTINEL = object()
+    _CLOSED = object()   # pushed into the inbox when the reader stops
 
     def __init__(self, browser_ws: WebSocket):
         self._browser_ws = browser_ws
+        self.binary_audio = False      # set from the client's init message
         self._queue: asyncio.Queue = asyncio.Queue()
         self._task: Optional[asyncio.Task] = None
+        # Persistent Sarvam socket
+        self._tts_cm = None
+        self._tts_ws = None
+        self._tts_config: Optional[tuple] = None      # (lang, speaker) last configured
+        self._inbox: Optional[asyncio.Queue] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self.stats = {k: 0 for k in _tts_stream_stats}
+        # Response being spoken right now (for interrupt()), and the last one that sent audio
+        self._active: Optional[dict] = None
+        self.last_audio_at = 0.0                       # time.monotonic()
+        self.last_response_id: Optional[int] = None
 
     def start(self):
         self._task = asyncio.create_task(self._run_forever())
 
-    async def speak(self, sentences: List[str], speaker: str, lang: str,
-                    response_id: int, done_event: asyncio.Event):
-        await self._queue.put((sentences, speaker, lang, response_id, done_event))
+    async def speak(self, sentences: Union[List[str], asyncio.Queue], speaker: str, lang: str,
+                    response_id: int, done_event: asyncio.Event, cacheable: bool = False):
+        """
+        Queue one response. `sentences` is either a list or an asyncio.Queue
+        that the caller keeps feeding while the LLM streams, ending with None.
+
+        A list whose text is in services/tts_cache.py is played from the cache.
+        cacheable=True (fixed phrases: greeting, fallbacks, ...) stores the
+        streamed audio there after the first synthesis.
+        """
+        await self._queue.put((sentences, speaker, lang, response_id, done_event, cacheable))
+
+    @staticmethod
+    async def _iter_sentences(sentences, seen: List[str]):
+        if isinstance(sentences, asyncio.Queue):
+            while True:
+                sentence = await sentences.get()
+                if sentence is None:
+                    sentences.put_nowait(None)   # keep the end marker for _drain()
+                    return
+                seen.append(sentence)
+                yield sentence
+        else:
+            for sentence in sentences:
+                seen.append(sentence)
+                yield sentence
+
+    @staticmethod
+    async def _drain(sentences, seen: List[str]) -> List[str]:
+        """Everything in the response: what was already sent plus the rest of the queue."""
+        if not isinstance(sentences, asyncio.Queue):
+            return list(sentences)
+        rest = list(seen)
+        while True:
+            sentence = await sentences.get()
+            if sentence is None:
+                return rest
+            rest.append(sentence)
+
+    def interrupt(self) -> Tuple[Optional[int], int]:
+        """
+        Barge-in: stop the response being spoken and drop queued ones. Returns
+        (response_id that was speaking, characters never sent to Sarvam).
+        """
+        skipped = 0
+        active, response_id = self._active, None
+        if active is not None:
+            response_id = active["response_id"]
+            active["cancel"].set()
+            if active["activity"] is not None:
+                active["activity"].set()
+            src = active["sentences"]
+            if isinstance(src, asyncio.Queue):
+                while not src.empty():
+                    sentence = src.get_nowait()
+                    if sentence is not None:
+                        skipped += len(sentence)
+            else:
+                skipped += sum(len(x) for x in src[len(active["seen"]):])
+        pending = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is self._SENTINEL:
+                pending.append(item)
+                continue
+            sentences, done_event = item[0], item[4]
+            if not isinstance(sentences, asyncio.Queue):
+                skipped += sum(len(x) for x in sentences)
+            done_event.set()
+        for item in pending:
+            self._queue.put_nowait(item)
+        return response_id, skipped
+
+    def speaking_text(self) -> str:
+        """Text of the response currently being spoken (for echo checks)."""
+        active = self._active
+        return " ".join(active["seen"]) if active else ""
 
     async def close(self):
         await self._queue.put(self._SENTINEL)
@@ -244,6 +529,12 @@ class StreamingTTSSession:
                 await asyncio.wait_for(self._task, timeout=8.0)
             except (asyncio.TimeoutError, asyncio.CancelledError):
                 self._task.cancel()
+        await self._disconnect()
+        log("[TTS_STREAM]", f"Closed | {self.stats}")
+
+    def _bump(self, key: str, n=1):
+        self.stats[key] += n
+        _tts_stream_stats[key] += n
 
     async def _run_forever(self):
         log("[TTS_STREAM]", "Worker started")
@@ -252,85 +543,275 @@ class StreamingTTSSession:
                 item = await self._queue.get()
                 if item is self._SENTINEL:
                     return
-                sentences, speaker, lang, response_id, done_event = item
+                sentences, speaker, lang, response_id, done_event, cacheable = item
+                seen: List[str] = []
+                cancel = asyncio.Event()
+                self._active = {
+                    "response_id": response_id, "sentences": sentences, "seen": seen,
+                    "cancel": cancel, "activity": None,
+                }
                 try:
-                    await self._do_speak(sentences, speaker, lang, response_id)
+                    text = None if isinstance(sentences, asyncio.Queue) else " ".join(sentences)
+                    cached = await tts_cache.aget(text, speaker, lang) if text else None
+                    if cached is not None:
+                        await self._play_cached(cached, response_id)
+                        continue
+                    capture: Optional[List[bytes]] = [] if (cacheable and text) else None
+                    await self._do_speak(sentences, speaker, lang, response_id, seen, capture)
+                    if capture:
+                        await tts_cache.aput(text, speaker, lang, b"".join(capture), "mp3")
                 except Exception as e:
+                    # The socket state is unknown after a failure — start fresh next time.
+                    await self._disconnect()
+                    if cancel.is_set():
+                        continue
                     log("[TTS_STREAM]", f"resp_id={response_id} streaming failed ({e}) — HTTP fallback")
-                    await self._fallback_http(sentences, speaker, lang, response_id)
+                    await self._fallback_http(await self._drain(sentences, seen), speaker, lang, response_id)
                 finally:
+                    self._active = None
                     done_event.set()
             except asyncio.CancelledError:
                 return
             except Exception as e:
                 log("[TTS_STREAM]", f"Unexpected worker error: {e}")
 
-    async def _do_speak(self, sentences, speaker, lang, response_id):
-        chunk_count = 0
-        send_done = asyncio.Event()
-        last_chunk_event = asyncio.Event()
-
-        async with client_tts.text_to_speech_streaming.connect(model="bulbul:v3") as tts_ws:
-            async def sender():
-                try:
-                    await tts_ws.configure(target_language_code=lang, speaker=speaker)
-                    for sentence in sentences:
-                        await tts_ws.convert(sentence)
-                        await tts_ws.flush()
-                except Exception as e:
-                    log("[TTS_STREAM]", f"resp_id={response_id} sender error: {e}")
-                finally:
-                    send_done.set()
+    # ── persistent Sarvam socket ──────────────────────────────────────────────
 
-            async def receiver():
-                nonlocal chunk_count
-                try:
-                    async for message in tts_ws:
-                        if not isinstance(message, AudioOutput):
-                            continue
-                        audio_b64 = message.data.audio
-                        chunk_count += 1
-                        try:
-                            await self._browser_ws.send_json({
-                                "type": "audio_chunk", "index": chunk_count - 1, "total": -1,
-                                "audio": audio_b64, "audio_format": "mp3",
-                                "is_last": False, "response_id": response_id,
-                            })
-                        except Exception:
-                            return
-                        last_chunk_event.set()
-                        last_chunk_event.clear()
-                except asyncio.CancelledError:
-                    pass
+    def _connected(self) -> bool:
+        return (
+            self._tts_ws is not None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
 
-            sender_task   = asyncio.create_task(sender())
-            receiver_task = asyncio.create_task(receiver())
+    async def _ensure_connection(self, speaker: str, lang: str):
+        if self._connected():
+            self._bump("reuses")
+        else:
+            dropped = self._tts_cm is not None
+            await self._disconnect()
+            t0 = asyncio.get_running_loop().time()
+            cm = client_tts.text_to_speech_streaming.connect(
+                model=config.TTS_MODEL,
+                send_completion_event="true" if config.TTS_COMPLETION_EVENTS else None,
+            )
+            self._tts_ws = await cm.__aenter__()
+            self._tts_cm = cm
+            self._tts_config = None
+            self._inbox = asyncio.Queue()
+            self._reader_task = asyncio.create_task(self._reader(self._tts_ws, self._inbox))
+            if config.TTS_WS_KEEPALIVE_S > 0:
+                self._keepalive_task = asyncio.create_task(self._keepalive(self._tts_ws))
+            self._bump("connects")
+            if dropped:
+                self._bump("reconnects")
+            log("[TTS_STREAM]", f"Connected in {(asyncio.get_running_loop().time() - t0) * 1000:.0f} ms"
+                                f"{' (reconnect)' if dropped else ''}")
+
+        if self._tts_config != (lang, speaker):
+            if self._tts_config is not None:
+                self._bump("reconfigures")
+                log("[TTS_STREAM]", f"Reconfigure {self._tts_config} → {(lang, speaker)}")
+            await self._tts_ws.configure(target_language_code=lang, speaker=speaker)
+            self._tts_config = (lang, speaker)
+
+    async def _reader(self, tts_ws, inbox: asyncio.Queue):
+        try:
+            async for message in tts_ws:
+                inbox.put_nowait(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log("[TTS_STREAM]", f"Socket reader stopped: {e}")
+        finally:
+            inbox.put_nowait(self._CLOSED)
 
-            IDLE_S = 1.2
-            await send_done.wait()
+    async def _keepalive(self, tts_ws):
+        try:
             while True:
-                try:
-                    await asyncio.wait_for(last_chunk_event.wait(), timeout=IDLE_S)
-                except asyncio.TimeoutError:
-                    break
+                await asyncio.sleep(config.TTS_WS_KEEPALIVE_S)
+                await tts_ws.ping()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log("[TTS_STREAM]", f"Keepalive ping failed: {e}")
 
-            receiver_task.cancel()
+    async def _disconnect(self):
+        for task in (self._keepalive_task, self._reader_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        cm = self._tts_cm
+        self._tts_cm = self._tts_ws = self._inbox = None
+        self._reader_task = self._keepalive_task = None
+        self._tts_config = None
+        if cm is not None:
             try:
-                await receiver_task
-            except asyncio.CancelledError:
+                await cm.__aexit__(None, None, None)
+            except Exception:
                 pass
-            sender_task.cancel()
+
+    async def _send_audio(self, response_id: int, index: int, total: int, fmt: str, is_last: bool,
+                          audio: Optional[bytes] = None, audio_b64: Optional[str] = None):
+        """One audio chunk to the browser; pass whichever of raw / base64 is already at hand."""
+        self.last_audio_at = time.monotonic()
+        self.last_response_id = response_id
+        if self.binary_audio:
+            if audio is None:
+                audio = base64.b64decode(audio_b64)
+            await self._browser_ws.send_bytes(pack_audio_frame(audio, response_id, index, fmt, is_last))
+            self._bump("binary_frames")
+            self._bump("audio_bytes_out", AUDIO_FRAME_HEADER.size + len(audio))
+        else:
+            if audio_b64 is None:
+                audio_b64 = base64.b64encode(audio).decode("ascii")
+            await self._browser_ws.send_json({
+                "type": "audio_chunk", "index": index, "total": total,
+                "audio": audio_b64, "audio_format": fmt,
+                "is_last": is_last, "response_id": response_id,
+            })
+            self._bump("json_frames")
+            self._bump("audio_bytes_out", len(audio_b64))
+
+    async def _play_cached(self, entry, response_id):
+        """Whole utterance from tts_cache, same audio_chunk / tts_done protocol as the HTTP path."""
+        audio, fmt = entry
+        await self._send_audio(response_id, 0, 1, fmt, True, audio=audio)
+        await self._browser_ws.send_json({
+            "type": "tts_done", "response_id": response_id, "total_chunks": 1, "cached": True,
+        })
+
+    async def _do_speak(self, sentences, speaker, lang, response_id, seen: List[str],
+                        capture: Optional[List[bytes]] = None):
+        loop = asyncio.get_running_loop()
+        chunk_count = 0
+        flushes = 0                  # flush() calls sent for this response
+        finals = 0                   # "final" events received back
+        send_done = asyncio.Event()
+        activity = asyncio.Event()   # set on every audio chunk / final event (and by interrupt())
+        last_audio_at = send_done_at = loop.time()
+        active = self._active
+        cancel = active["cancel"] if active else asyncio.Event()
+        if active:
+            active["activity"] = activity
+
+        await self._ensure_connection(speaker, lang)
+        self._bump("responses")
+        tts_ws, inbox = self._tts_ws, self._inbox
+        # Drop late audio / events left over from the previous response.
+        while not inbox.empty():
+            if inbox.get_nowait() is self._CLOSED:
+                raise ConnectionError("TTS socket closed")
+
+        def all_final() -> bool:
+            return send_done.is_set() and flushes > 0 and finals >= flushes
+
+        async def sender():
+            nonlocal flushes, send_done_at
+            try:
+                async for sentence in self._iter_sentences(sentences, seen):
+                    await tts_ws.convert(sentence)
+                    await tts_ws.flush()
+                    flushes += 1
+            except Exception as e:
+                log("[TTS_STREAM]", f"resp_id={response_id} sender error: {e}")
+            finally:
+                send_done_at = loop.time()
+                send_done.set()
+                activity.set()
+
+        async def receiver():
+            nonlocal chunk_count, finals, last_audio_at
             try:
-                await sender_task
+                while True:
+                    message = await inbox.get()
+                    if message is self._CLOSED:
+                        inbox.put_nowait(message)   # keep it visible to _connected()/next response
+                        activity.set()
+                        return
+                    if isinstance(message, EventResponse):
+                        if message.data.event_type == "final":
+                            finals += 1
+                            activity.set()
+                        continue
+                    if not isinstance(message, AudioOutput):
+                        continue
+                    audio_b64 = message.data.audio
+                    chunk_count += 1
+                    last_audio_at = loop.time()
+                    # Decode at most once, and only if someone needs raw bytes.
+                    audio = (base64.b64decode(audio_b64)
+                             if capture is not None or self.binary_audio else None)
+                    if capture is not None:
+                        capture.append(audio)
+                    try:
+                        await self._send_audio(response_id, chunk_count - 1, -1, "mp3", False,
+                                               audio=audio, audio_b64=audio_b64)
+                    except Exception:
+                        return
+                    activity.set()
             except asyncio.CancelledError:
                 pass
 
+        sender_task   = asyncio.create_task(sender())
+        receiver_task = asyncio.create_task(receiver())
+
+        # Done when every flush has its "final" event; otherwise when nothing
+        # has arrived for TTS_IDLE_TIMEOUT_S since the last audio / end of sending.
+        completed_by = "idle"
+        while True:
+            if cancel.is_set():
+                completed_by = "barge_in"
+                break
+            if all_final():
+                completed_by = "event"
+                break
+            if receiver_task.done():
+                break
+            activity.clear()
+            timeout = None
+            if send_done.is_set():
+                timeout = config.TTS_IDLE_TIMEOUT_S - (loop.time() - max(last_audio_at, send_done_at))
+                if timeout <= 0:
+                    break
+            try:
+                await asyncio.wait_for(activity.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+        tail_ms = max(0.0, (loop.time() - max(last_audio_at, send_done_at)) * 1000)
+
+        receiver_task.cancel()
+        try:
+            await receiver_task
+        except asyncio.CancelledError:
+            pass
+        sender_task.cancel()
+        try:
+            await sender_task
+        except asyncio.CancelledError:
+            pass
+
+        self._bump(f"completed_by_{completed_by}")
+        if completed_by == "barge_in":
+            # Sarvam is still sending audio for the dropped text; a fresh socket
+            # is cheaper than telling that audio apart from the next response's.
+            await self._disconnect()
+            log("[TTS_STREAM]", f"resp_id={response_id} interrupted (barge-in) | chunks={chunk_count}")
+            return
+        self._bump("tail_wait_ms_total", tail_ms)
+        log("[TTS_STREAM]", f"resp_id={response_id} done by {completed_by} | chunks={chunk_count} "
+                            f"finals={finals}/{flushes} | tail_wait={tail_ms:.0f} ms")
+
         if chunk_count == 0:
             raise RuntimeError("No audio chunks received from Bulbul")
 
         try:
             await self._browser_ws.send_json({
                 "type": "tts_done", "response_id": response_id, "total_chunks": chunk_count,
+                "tail_wait_ms": round(tail_ms),
             })
         except Exception:
             pass
@@ -339,11 +820,7 @@ class StreamingTTSSession:
         try:
             full_text = " ".join(sentences)
             audio_b64 = await tts_convert(full_text, speaker, lang)
-            await self._browser_ws.send_json({
-                "type": "audio_chunk", "index": 0, "total": 1,
-                "audio": audio_b64, "audio_format": "wav",
-                "is_last": True, "response_id": response_id,
-            })
+            await self._send_audio(response_id, 0, 1, "wav", True, audio_b64=audio_b64)
             await self._browser_ws.send_json({"type": "tts_done", "response_id": response_id})
         except Exception as e:
             log("[TTS_STREAM]", f"resp_id={response_id} HTTP fallback also failed: {e}")
@@ -374,7 +851,7 @@ async def public_bot_config(tenant_id: Optional[str] = None):
     if not tenant_id or not DB_AVAILABLE:
         return {}
     try:
-        cfg = await asyncio.to_thread(get_bot_config, tenant_id)
+        cfg = await tenant_cache.aget_bot_config(tenant_id)
         if not cfg:
             return {}
         return {k: cfg[k] for k in (
@@ -397,8 +874,7 @@ async def user_login(req: UserLoginRequest):
     if not DB_AVAILABLE:
         return {"status": "success", "phone_number": req.phone_number, "db": False}
     try:
-        await asyncio.to_thread(
-            create_user_if_not_exists,
+        await create_user_if_not_exists(
             req.phone_number.strip(), req.name, req.tenant_id
         )
         return {"status": "success", "phone_number": req.phone_number.strip()}
@@ -411,7 +887,7 @@ async def get_appointments(phone_number: str, tenant_id: Optional[str] = None):
     if not DB_AVAILABLE:
         return []
     try:
-        return await asyncio.to_thread(get_user_appointments, phone_number, tenant_id)
+        return await get_user_appointments(phone_number, tenant_id)
     except Exception:
         raise HTTPException(status_code=500, detail="Could not fetch appointments")
 
@@ -422,7 +898,7 @@ async def get_appointments(phone_number: str, tenant_id: Optional[str] = None):
 async def admin_login(req: AdminLoginRequest):
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database unavailable")
-    admin = await asyncio.to_thread(get_admin_by_email, req.email)
+    admin = await get_admin_by_email(req.email)
     if not admin:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if admin["password_hash"] != _hash_password(req.password):
@@ -430,20 +906,19 @@ async def admin_login(req: AdminLoginRequest):
     if not admin.get("tenant_active", True):
         raise HTTPException(status_code=403, detail="Your account has been suspended by the platform administrator. Please contact support.")
     token = secrets.token_hex(32)
-    admin_sessions[token] = {
+    await session_store.set(store_ns.ADMIN, token, {
         "tenant_id":     admin["tenant_id"],
         "email":         admin["email"],
         "role":          admin["role"],
         "business_name": admin.get("business_name", ""),
-    }
+    }, ttl_s=config.ADMIN_TOKEN_TTL_S)
     return {"token": token, "tenant_id": admin["tenant_id"],
             "role": admin["role"], "business_name": admin.get("business_name")}
 
 @app.post("/admin/logout")
 async def admin_logout(session=Depends(_check_admin_token),
                        x_admin_token: Optional[str] = Header(None)):
-    if x_admin_token in admin_sessions:
-        del admin_sessions[x_admin_token]
+    await session_store.delete(store_ns.ADMIN, x_admin_token)
     return {"status": "logged out"}
 
 
@@ -453,14 +928,14 @@ async def admin_logout(session=Depends(_check_admin_token),
 async def admin_stats(session=Depends(_check_admin_token)):
     if not DB_AVAILABLE:
         return {}
-    return await asyncio.to_thread(get_tenant_stats, session["tenant_id"])
+    return await get_tenant_stats(session["tenant_id"])
 
 @app.get("/admin/appointments/today")
 async def admin_today(session=Depends(_check_admin_token)):
     if not DB_AVAILABLE:
         return []
-    return await asyncio.to_thread(
-        get_tenant_appointments_for_date, session["tenant_id"], date.today().isoformat()
+    return await get_tenant_appointments_for_date(
+        session["tenant_id"], date.today().isoformat()
     )
 
 @app.get("/admin/appointments")
@@ -479,19 +954,19 @@ async def admin_appointments(session=Depends(_check_admin_token),
     to_date = to_date or to_alias
     appt_date = appt_date or date_alias
     if appt_date:
-        rows = await asyncio.to_thread(get_tenant_appointments_for_date, tenant_id, appt_date)
+        rows = await get_tenant_appointments_for_date(tenant_id, appt_date)
         for row in rows:
             if "id" not in row and row.get("appointment_id"):
                 row["id"] = row["appointment_id"]
         return rows
     if from_date and to_date:
-        rows = await asyncio.to_thread(get_tenant_appointments_range, tenant_id, from_date, to_date)
+        rows = await get_tenant_appointments_range(tenant_id, from_date, to_date)
         for row in rows:
             if "id" not in row and row.get("appointment_id"):
                 row["id"] = row["appointment_id"]
         return rows
-    rows = await asyncio.to_thread(
-        get_tenant_appointments_for_date, tenant_id, date.today().isoformat()
+    rows = await get_tenant_appointments_for_date(
+        tenant_id, date.today().isoformat()
     )
     for row in rows:
         if "id" not in row and row.get("appointment_id"):
@@ -504,7 +979,7 @@ async def admin_appointments_for_date(date: str, session=Depends(_check_admin_to
     """Compatibility endpoint for updated admin UI date picker."""
     if not DB_AVAILABLE:
         return []
-    rows = await asyncio.to_thread(get_tenant_appointments_for_date, session["tenant_id"], date)
+    rows = await get_tenant_appointments_for_date(session["tenant_id"], date)
     for row in rows:
         if "id" not in row and row.get("appointment_id"):
             row["id"] = row["appointment_id"]
@@ -516,7 +991,7 @@ async def admin_cancel_appointment(appointment_id: str, session=Depends(_check_a
     """Cancel appointment by id for admin panel actions."""
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database unavailable")
-    updated = await asyncio.to_thread(cancel_tenant_appointment_by_id, session["tenant_id"], appointment_id)
+    updated = await cancel_tenant_appointment_by_id(session["tenant_id"], appointment_id)
     if not updated:
         raise HTTPException(status_code=404, detail="Appointment not found or already cancelled")
     return {"status": "cancelled", "appointment_id": appointment_id}
@@ -525,7 +1000,7 @@ async def admin_cancel_appointment(appointment_id: str, session=Depends(_check_a
 async def admin_users(session=Depends(_check_admin_token)):
     if not DB_AVAILABLE:
         return []
-    return await asyncio.to_thread(get_tenant_users, session["tenant_id"])
+    return await get_tenant_users(session["tenant_id"])
 
 
 @app.get("/admin/customers")
@@ -533,7 +1008,7 @@ async def admin_customers(session=Depends(_check_admin_token)):
     """Compatibility endpoint mapping users -> customers shape expected by UI."""
     if not DB_AVAILABLE:
         return []
-    users = await asyncio.to_thread(get_tenant_users, session["tenant_id"])
+    users = await get_tenant_users(session["tenant_id"])
     return [{
         "name": u.get("name"),
         "phone_number": u.get("phone_number"),
@@ -545,7 +1020,7 @@ async def admin_customers(session=Depends(_check_admin_token)):
 async def admin_get_config(session=Depends(_check_admin_token)):
     if not DB_AVAILABLE:
         return {}
-    cfg = await asyncio.to_thread(get_bot_config, session["tenant_id"]) or {}
+    cfg = await get_bot_config(session["tenant_id"]) or {}
     # Compatibility key for redesigned admin UI
     if "business_hours_periods" in cfg and "available_hours_periods" not in cfg:
         cfg["available_hours_periods"] = cfg.get("business_hours_periods")
@@ -556,7 +1031,10 @@ async def admin_save_config(req: BotConfigRequest, session=Depends(_check_admin_
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database unavailable")
     fields = {k: v for k, v in req.dict().items() if v is not None}
-    return await asyncio.to_thread(upsert_bot_config, session["tenant_id"], **fields)
+    saved = await upsert_bot_config(session["tenant_id"], **fields)
+    tenant_cache.invalidate(session["tenant_id"], tenant_cache.BOT_CONFIG)
+    _precompute_tenant_tts(saved if isinstance(saved, dict) else fields)
+    return saved
 
 
 @app.get("/admin/config")
@@ -580,7 +1058,10 @@ async def admin_save_config_compat(req: Request, session=Depends(_check_admin_to
         "business_description", "extra_prompt_context", "calendar_id",
     }
     fields = {k: v for k, v in payload.items() if k in allowed and v is not None}
-    return await asyncio.to_thread(upsert_bot_config, session["tenant_id"], **fields)
+    saved = await upsert_bot_config(session["tenant_id"], **fields)
+    tenant_cache.invalidate(session["tenant_id"], tenant_cache.BOT_CONFIG)
+    _precompute_tenant_tts(saved if isinstance(saved, dict) else fields)
+    return saved
 
 @app.post("/admin/voice-preview")
 async def voice_preview(req: VoicePreviewRequest, session=Depends(_check_admin_token)):
@@ -605,15 +1086,11 @@ async def voice_preview(req: VoicePreviewRequest, session=Depends(_check_admin_t
 
         text = sample_texts.get(lang, sample_texts["en-IN"])
 
-        audio_b64 = await tts_convert(
-            text=text,
-            speaker=speaker,
-            lang=lang
-        )
+        audio, fmt = await tts_cache.aget_or_render(text, speaker, lang, _render_tts_wav)
 
         return {
-            "audio": audio_b64,
-            "format": "wav"
+            "audio": base64.b64encode(audio).decode("ascii"),
+            "format": fmt
         }
 
     except Exception as e:
@@ -644,7 +1121,7 @@ async def admin_preview_chat(req: PreviewChatRequest, session=Depends(_check_adm
     bot_cfg: dict = {}
     if DB_AVAILABLE:
         try:
-            bot_cfg = await asyncio.to_thread(get_bot_config, tenant_id) or {}
+            bot_cfg = await tenant_cache.aget_bot_config(tenant_id) or {}
         except Exception:
             pass
 
@@ -737,8 +1214,12 @@ async def admin_connect_calendar(req: CalendarConnectRequest,
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid service account JSON")
 
-    await asyncio.to_thread(save_calendar_token, tenant_id, req.calendar_id, req.service_account_json)
-    await asyncio.to_thread(upsert_bot_config, tenant_id, calendar_id=req.calendar_id)
+    await save_calendar_token(tenant_id, req.calendar_id, req.service_account_json)
+    await upsert_bot_config(tenant_id, calendar_id=req.calendar_id)
+    tenant_cache.invalidate(tenant_id)
+    if CALENDAR_SERVICE_AVAILABLE:
+        invalidate_calendar_client(tenant_id)   # next tool call builds with the new account
+        calendar_mirror.invalidate_mirror(tenant_id)
 
     if CALENDAR_SERVICE_AVAILABLE:
         result = await asyncio.to_thread(verify_calendar_connection, tenant_id)
@@ -755,7 +1236,7 @@ async def admin_calendar_status(session=Depends(_check_admin_token)):
     tenant_id = session["tenant_id"]
     if not DB_AVAILABLE:
         return {"connected": False}
-    token = await asyncio.to_thread(get_calendar_token, tenant_id)
+    token = await get_calendar_token(tenant_id)
     if not token:
         return {"connected": False}
     if CALENDAR_SERVICE_AVAILABLE:
@@ -780,7 +1261,7 @@ async def admin_get_modules(session=Depends(_check_admin_token)):
             {"module_name": "BOOKING_MODULE", "is_enabled": True},
             {"module_name": "FACTS_MODULE",   "is_enabled": False},
         ]
-    return await asyncio.to_thread(get_all_module_configs, tenant_id)
+    return await get_all_module_configs(tenant_id)
 
 
 @app.post("/admin/modules/toggle")
@@ -795,20 +1276,13 @@ async def admin_toggle_module(req: ModuleToggleRequest, session=Depends(_check_a
         raise HTTPException(status_code=400, detail=f"Unknown module: {req.module_name}. "
                             f"Valid: {ALL_MODULES}")
 
-    result = await asyncio.to_thread(set_module_enabled, tenant_id, req.module_name, req.is_enabled)
+    result = await set_module_enabled(tenant_id, req.module_name, req.is_enabled)
     if not result:
         raise HTTPException(status_code=500, detail="Failed to update module config")
 
-    # Invalidate cached module config and LLM cache for live sessions of this tenant
-    for sess in chat_sessions.values():
-        if sess.get("tenant_id") == tenant_id:
-            sess.pop("enabled_modules", None)
-
-    # Invalidate the tools + LLM cache so the next request rebuilds with new modules
-    from brain import invalidate_llm_cache
-    from modules.module_registry import invalidate_tools_cache
-    invalidate_llm_cache(tenant_id)
-    invalidate_tools_cache(tenant_id)
+    # Invalidate cached module config, tools and LLM cache for live sessions of this tenant
+    # (other workers are notified through the module_configs NOTIFY trigger)
+    _invalidate_tenant_runtime_caches(tenant_id)
 
     return {
         "module_name": req.module_name,
@@ -824,7 +1298,7 @@ async def admin_get_knowledge(session=Depends(_check_admin_token)):
     """List all knowledge entries for this tenant."""
     if not DB_AVAILABLE:
         return []
-    return await asyncio.to_thread(get_all_knowledge, session["tenant_id"])
+    return await get_all_knowledge(session["tenant_id"])
 
 
 @app.post("/admin/knowledge")
@@ -842,7 +1316,7 @@ async def admin_add_knowledge(req: KnowledgeUploadRequest, session=Depends(_chec
     # Save raw content to DB (add_knowledge_chunks takes a list of chunks)
     from modules.facts_module import chunk_text as _chunk_text
     raw_chunks = _chunk_text(req.content.strip())
-    rows_added = await asyncio.to_thread(add_knowledge, session["tenant_id"], raw_chunks)
+    rows_added = await add_knowledge(session["tenant_id"], raw_chunks)
 
     # Index into Qdrant (runs in thread to avoid blocking)
     chunks_indexed = 0
@@ -864,7 +1338,7 @@ async def admin_delete_knowledge(knowledge_id: str, session=Depends(_check_admin
     """Delete a single knowledge entry (DB only; Qdrant vectors remain until re-index)."""
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database unavailable")
-    deleted = await asyncio.to_thread(delete_knowledge, knowledge_id, session["tenant_id"])
+    deleted = await delete_knowledge(knowledge_id, session["tenant_id"])
     return {"deleted": deleted}
 
 
@@ -875,7 +1349,7 @@ async def admin_clear_knowledge(session=Depends(_check_admin_token)):
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-    count = await asyncio.to_thread(delete_all_knowledge, tenant_id)
+    count = await delete_all_knowledge(tenant_id)
 
     try:
         from modules.facts_module import delete_tenant_knowledge
@@ -893,7 +1367,7 @@ async def admin_reindex_knowledge(session=Depends(_check_admin_token)):
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-    rows = await asyncio.to_thread(get_all_knowledge, tenant_id)
+    rows = await get_all_knowledge(tenant_id)
     total_chunks = 0
     try:
         from modules.facts_module import index_knowledge, delete_tenant_knowledge
@@ -913,18 +1387,18 @@ async def admin_reindex_knowledge(session=Depends(_check_admin_token)):
 async def superadmin_tenants():
     if not DB_AVAILABLE:
         return []
-    return await asyncio.to_thread(get_all_tenants)
+    return await get_all_tenants()
 
 @app.post("/superadmin/tenants", dependencies=[Depends(_check_superadmin_token)])
 async def superadmin_create_tenant(req: TenantCreateRequest):
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database unavailable")
-    tenant = await asyncio.to_thread(
-        create_tenant, req.business_name, req.business_type, req.owner_email
+    tenant = await create_tenant(
+        req.business_name, req.business_type, req.owner_email
     )
-    await asyncio.to_thread(upsert_bot_config, tenant["tenant_id"], bot_name=req.business_name)
-    await asyncio.to_thread(
-        create_tenant_admin, tenant["tenant_id"], req.owner_email,
+    await upsert_bot_config(tenant["tenant_id"], bot_name=req.business_name)
+    await create_tenant_admin(
+        tenant["tenant_id"], req.owner_email,
         _hash_password(req.admin_password), "owner"
     )
     return tenant
@@ -934,13 +1408,38 @@ async def superadmin_create_tenant(req: TenantCreateRequest):
 async def superadmin_set_status(tenant_id: str, is_active: bool):
     if not DB_AVAILABLE:
         raise HTTPException(status_code=503, detail="Database unavailable")
-    return {"updated": await asyncio.to_thread(update_tenant_status, tenant_id, is_active)}
+    return {"updated": await update_tenant_status(tenant_id, is_active)}
 
 @app.get("/superadmin/stats", dependencies=[Depends(_check_superadmin_token)])
 async def superadmin_stats():
     if not DB_AVAILABLE:
         return {}
-    return await asyncio.to_thread(get_platform_stats)
+    return await get_platform_stats()
+
+@app.get("/superadmin/metrics", dependencies=[Depends(_check_superadmin_token)])
+async def superadmin_metrics():
+    """Process-level runtime counters (per uvicorn worker)."""
+    metrics = {}
+    if DB_AVAILABLE:
+        metrics["db_pool"] = get_pool_stats()
+        metrics["db_async_pool"] = get_async_pool_stats()
+        metrics["tenant_cache"] = tenant_cache.get_cache_stats()
+    metrics["tts_stream"] = get_tts_stream_stats()
+    metrics["barge_in"] = get_barge_in_stats()
+    metrics["turn_queue"] = get_turn_queue_stats()
+    metrics["speculation"] = get_speculation_stats()
+    metrics["memory_extraction"] = get_memory_extraction_stats()
+    metrics["direct_actions"] = get_direct_action_stats()
+    metrics["llm_router"] = get_llm_router_stats()
+    metrics["tts_cache"] = tts_cache.get_cache_stats()
+    metrics["vad"] = get_vad_stats()
+    metrics["stt_pool"] = stt_pool.get_stats()
+    metrics["chat_sessions"] = chat_sessions.get_stats()
+    metrics["session_store"] = await session_store.stats()
+    if CALENDAR_SERVICE_AVAILABLE:
+        metrics["calendar_clients"] = get_calendar_client_stats()
+        metrics["calendar_mirror"] = calendar_mirror.get_mirror_stats()
+    return metrics
 
 
 # ── Superadmin: Module requests ────────────────────────────────────────────────
@@ -955,11 +1454,23 @@ class ModuleRequestResolve(BaseModel):
 
 
 def _invalidate_tenant_runtime_caches(tenant_id: str):
-    for sess in chat_sessions.values():
-        if sess.get("tenant_id") == tenant_id:
-            sess.pop("enabled_modules", None)
+    # Session/tool caches are dropped by _on_tenant_config_invalidated (hook).
+    if DB_AVAILABLE:
+        tenant_cache.invalidate(tenant_id, tenant_cache.MODULES)
+    else:
+        _on_tenant_config_invalidated(tenant_id, None)
+
+
+def _on_tenant_config_invalidated(tenant_id: Optional[str], kind: Optional[str]):
+    """tenant_cache hook — runs on the event loop (scheduled via call_soon_threadsafe)."""
+    if kind not in (None, "modules"):
+        return
+    for sess in chat_sessions.sessions_for_tenant(tenant_id):
+        sess.pop("enabled_modules", None)
     try:
+        from brain import invalidate_llm_cache
         from modules.module_registry import invalidate_tools_cache
+        invalidate_llm_cache(tenant_id)
         invalidate_tools_cache(tenant_id)
     except Exception:
         pass
@@ -989,7 +1500,7 @@ async def superadmin_set_module(req: ModuleSetRequest):
     from modules.module_registry import ALL_MODULES
     if req.module_name not in ALL_MODULES:
         raise HTTPException(status_code=400, detail=f"Unknown module: {req.module_name}")
-    result = await asyncio.to_thread(set_module_enabled, req.tenant_id, req.module_name, req.is_enabled)
+    result = await set_module_enabled(req.tenant_id, req.module_name, req.is_enabled)
     if not result:
         raise HTTPException(status_code=500, detail="Failed to update module")
     _invalidate_tenant_runtime_caches(req.tenant_id)
@@ -1005,8 +1516,8 @@ async def superadmin_get_module_requests():
     if not DB_AVAILABLE:
         return []
     try:
-        from database.crud import get_all_module_requests
-        return await asyncio.to_thread(get_all_module_requests)
+        from database.async_crud import get_all_module_requests
+        return await get_all_module_requests()
     except (ImportError, Exception):
         return []  # table may not exist yet
 
@@ -1032,9 +1543,8 @@ async def admin_request_module(req: Request, session=Depends(_check_admin_token)
     if not DB_AVAILABLE:
         return {"ok": True, "queued": True}
     try:
-        from database.crud import create_module_request
-        result = await asyncio.to_thread(
-            create_module_request,
+        from database.async_crud import create_module_request
+        result = await create_module_request(
             session["tenant_id"], module_name, requested_state, note
         )
         email_sent = False
@@ -1070,9 +1580,8 @@ async def superadmin_resolve_module_request(request_id: str, req: ModuleRequestR
     if not DB_AVAILABLE:
         return {"ok": True}
     try:
-        from database.crud import resolve_module_request
-        updated = await asyncio.to_thread(
-            resolve_module_request,
+        from database.async_crud import resolve_module_request
+        updated = await resolve_module_request(
             request_id,
             req.status,
             os.getenv("SUPERADMIN_EMAIL", "superadmin-panel"),
@@ -1100,8 +1609,8 @@ async def email_module_request_decision(token: str = Query(...)):
     decision = payload.get("action")  # approved | rejected
 
     try:
-        from database.crud import get_module_request_by_id, resolve_module_request
-        req_row = await asyncio.to_thread(get_module_request_by_id, request_id)
+        from database.async_crud import get_module_request_by_id, resolve_module_request
+        req_row = await get_module_request_by_id(request_id)
     except Exception as e:
         return _decision_html(f"Failed to load request: {e}", ok=False)
 
@@ -1121,8 +1630,7 @@ async def email_module_request_decision(token: str = Query(...)):
 
     try:
         if decision == "approved":
-            result = await asyncio.to_thread(
-                set_module_enabled,
+            result = await set_module_enabled(
                 req_row["tenant_id"],
                 req_row["module_name"],
                 bool(req_row["requested_state"]),
@@ -1131,8 +1639,7 @@ async def email_module_request_decision(token: str = Query(...)):
                 return _decision_html("Could not apply module change.", ok=False)
             _invalidate_tenant_runtime_caches(req_row["tenant_id"])
 
-        await asyncio.to_thread(
-            resolve_module_request,
+        await resolve_module_request(
             request_id,
             decision,
             os.getenv("SUPERADMIN_EMAIL", "superadmin-email-link"),
@@ -1166,6 +1673,41 @@ async def _warmup_sarvam(sarvam_ws, label: str):
     return True
 
 
+stt_pool = STTConnectionPool(
+    lambda lang: client_stt.speech_to_text_streaming.connect(
+        model=config.STT_MODEL, language_code=lang, sample_rate=16000
+    ),
+    _warmup_sarvam,
+    _SILENCE_FRAME_B64,
+)
+
+
+async def _next_stt_batch(audio_buf: asyncio.Queue, first: bytes,
+                          target_bytes: int, max_wait_s: float) -> List[bytes]:
+    """
+    `first` plus whatever follows it: frames already queued are taken at once,
+    then the batch waits up to max_wait_s for more until it reaches
+    target_bytes. Browser frames that are already target-sized go out alone.
+    """
+    frames, size = [first], len(first)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_s
+    while size < target_bytes:
+        try:
+            raw = audio_buf.get_nowait()
+        except asyncio.QueueEmpty:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                raw = await asyncio.wait_for(audio_buf.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+        frames.append(raw)
+        size += len(raw)
+    return frames
+
+
 # ── WebSocket voice handler ────────────────────────────────────────────────────
 
 @app.websocket("/ws/voice")
@@ -1177,9 +1719,13 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
     # Event set by brain when a language switch is detected — causes STT to reconnect
     # with the new language_code. Stored in chat_sessions so brain.py can signal it.
     language_switch_event = asyncio.Event()
+    # Set once the browser's "init" (tenant / bot_config) has been handled.
+    init_done = asyncio.Event()
 
+    resume_token = new_resume_token()
     chat_sessions[session_id] = {
         "history":               [],
+        "resume_token":          resume_token,   # key of the durable state in session_store
         "phone_number":          phone_number,
         "tenant_id":             None,
         "bot_config":            {},
@@ -1199,6 +1745,10 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
         "language_prompt_asked": False,
         "language_switch_event": language_switch_event,   # brain signals this directly
     }
+    chat_sessions.pin(session_id)
+    # The client echoes resume_token back in its next init after a reconnect;
+    # session_id is only a log label.
+    await websocket.send_json({"type": "session", "session_id": session_id, "resume_token": resume_token})
 
     brain_lock = asyncio.Lock()
 
@@ -1209,13 +1759,100 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
     def _ai_is_speaking() -> bool:
         return _time.monotonic() < ai_speaking_until[0]
 
-    commit_queue: asyncio.Queue = asyncio.Queue()
+    turn_queue = TurnQueue(session_id)
     audio_buf:    asyncio.Queue = asyncio.Queue(maxsize=300)
+    vad = VoiceActivityGate(session_id)
 
     tts_session = StreamingTTSSession(websocket)
     tts_session.start()
     log("[WS]", "StreamingTTSSession started")
 
+    # ── Barge-in: caller speech during a reply cancels it ─────────────────────
+    # Negotiated in "init" (the client must keep streaming mic audio while the
+    # bot talks). current_turn holds the run_brain task brain_consumer awaits.
+    barge_in_enabled = [False]
+    current_turn: dict = {"task": None, "interrupted": False}
+    flushed_response: list = [None]      # response_id already flushed after synthesis
+
+    def _turn_in_flight() -> bool:
+        task = current_turn["task"]
+        return task is not None and not task.done() and not current_turn["interrupted"]
+
+    async def _barge_in(reason: str):
+        if not barge_in_enabled[0]:
+            return
+        if not _turn_in_flight():
+            # Reply fully synthesized but the browser may still be playing it.
+            rid = tts_session.last_response_id
+            recent = time.monotonic() - tts_session.last_audio_at < config.BARGE_IN_PLAYBACK_WINDOW_S
+            if reason != "commit" and rid is not None and recent and flushed_response[0] != rid:
+                flushed_response[0] = rid
+                _barge_in_stats["playback_flushes"] += 1
+                log("[BARGE_IN]", f"{reason} during playback → flush resp_id={rid}")
+                try:
+                    await websocket.send_json({"type": "barge_in", "response_id": rid, "reason": reason})
+                except Exception:
+                    pass
+            return
+
+        current_turn["interrupted"] = True
+        current_turn["task"].cancel()
+        rid, skipped = tts_session.interrupt()
+        flushed_response[0] = rid
+        saved_s = skipped / config.TTS_CHARS_PER_SECOND
+        _barge_in_stats["barge_ins"] += 1
+        _barge_in_stats[f"by_{reason}"] += 1
+        _barge_in_stats["tts_chars_skipped"] += skipped
+        _barge_in_stats["audio_s_saved_est"] += saved_s
+        if rid is None:
+            _barge_in_stats["llm_cancelled"] += 1
+        log("[BARGE_IN]", f"{reason} → turn cancelled | resp_id={rid} | "
+                          f"skipped {skipped} chars (~{saved_s:.1f}s of audio)")
+        try:
+            await websocket.send_json({"type": "barge_in", "response_id": rid, "reason": reason})
+        except Exception:
+            pass
+
+    async def _queue_utterance(text: str):
+        # Held (and merged) while a turn runs instead of being dropped.
+        busy = brain_lock.locked()
+        queued = turn_queue.put(text, busy=busy)
+        if busy and queued and text != UNCLEAR:
+            # Barge-in: the new utterance replaces the reply in progress
+            # (not the commit_transcript echo of the turn being answered).
+            await _barge_in("commit")
+
+    # ── Speculative turn start: memory extraction on a stable partial ─────────
+    speculation: list = [None]       # SpeculativeTurn for the latest stable partial
+    speculation_timer: list = [None]
+
+    def _drop_speculation(reason: str):
+        if speculation[0] is not None:
+            speculation[0].discard(reason)
+            speculation[0] = None
+
+    def _on_partial(text: str):
+        if not config.SPECULATION_ENABLED:
+            return
+        if speculation_timer[0] is not None:
+            speculation_timer[0].cancel()
+        speculation_timer[0] = asyncio.create_task(_speculate_when_stable(text))
+
+    async def _speculate_when_stable(text: str):
+        await asyncio.sleep(config.SPECULATION_STABLE_MS / 1000.0)
+        if brain_lock.locked() or _ai_is_speaking() or is_noisy_transcript(text):
+            return
+        session = chat_sessions.get(session_id) or {}
+        enabled_modules = session.get("enabled_modules")
+        if enabled_modules is None:
+            return                   # resolved by the first turn
+        if speculation[0] is not None and speculation[0].same_text(text):
+            return
+        _drop_speculation("superseded by a newer partial")
+        memory = session.get("memory") or {}
+        lang = memory.get("language_preference") or (session.get("bot_config") or {}).get("language_code", "gu-IN")
+        speculation[0] = SpeculativeTurn(text, memory, lang, session.get("tenant_id"), enabled_modules)
+
     _recv = _drop_ai = _sent = 0
 
     # ── Task 1: Browser receiver ──────────────────────────────────────────────
@@ -1238,14 +1875,25 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                         if ctrl_type == "init":
                             new_phone = ctrl.get("phone_number")
                             tenant_id = ctrl.get("tenant_id")
+                            # Before the greeting below, so its audio already uses binary frames.
+                            tts_session.binary_audio = bool(ctrl.get("binary_audio"))
+                            if tts_session.binary_audio:
+                                log("[WS]", "Client negotiated binary audio frames")
+                            barge_in_enabled[0] = config.BARGE_IN_ENABLED and bool(ctrl.get("barge_in"))
+                            if barge_in_enabled[0]:
+                                log("[WS]", "Client negotiated barge-in")
                             if new_phone:
                                 phone_number = new_phone
                                 chat_sessions[session_id]["phone_number"] = new_phone
+                            resume_from = ctrl.get("resume_token")
+                            if resume_from and resume_from != resume_token:
+                                if await _restore_voice_state(session_id, resume_from, tenant_id):
+                                    log("[WS]", "Restored durable state from the previous connection")
                             if tenant_id:
-                                chat_sessions[session_id]["tenant_id"] = tenant_id
+                                chat_sessions.set_tenant(session_id, tenant_id)
                                 if DB_AVAILABLE:
                                     try:
-                                        bot_cfg = await asyncio.to_thread(get_bot_config, tenant_id)
+                                        bot_cfg = await tenant_cache.aget_bot_config(tenant_id)
                                         chat_sessions[session_id]["bot_config"] = bot_cfg or {}
                                         log("[WS]", f"Bot config loaded for tenant={tenant_id}")
 
@@ -1267,7 +1915,8 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                                                         import random as _rand
                                                         resp_id = _rand.randint(1, 999999)
                                                         await tts_session.speak(
-                                                            sentences, tts_speaker, tts_lang, resp_id, done_evt
+                                                            sentences, tts_speaker, tts_lang, resp_id, done_evt,
+                                                            cacheable=True,
                                                         )
                                                         await done_evt.wait()
                                                 except Exception as e:
@@ -1278,6 +1927,7 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                                         log("[WS]", f"Bot config load failed: {cfg_err}")
 
                             log("[WS]", f"init | session={session_id} phone={phone_number} tenant={tenant_id}")
+                            init_done.set()
 
                         elif ctrl_type == "set_user":
                             phone = ctrl.get("phone_number")
@@ -1286,6 +1936,9 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                                 chat_sessions[session_id]["phone_number"] = phone
                                 log("[WS]", f"set_user phone={phone}")
 
+                        elif ctrl_type == "barge_in":
+                            await _barge_in("client")
+
                         elif ctrl_type == "ai_speaking_start":
                             ai_speaking_until[0] = _time.monotonic() + 30.0
                             log("[CTRL]", "ai_speaking_start → mic MUTED")
@@ -1300,15 +1953,17 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                             if not text:
                                 pass
                             elif speaking_now:
+                                turn_queue.drop("ai_speaking")
                                 log("[COMMIT]", f"DROPPED (AI speaking): '{text}'")
                             elif is_noisy_transcript(text):
-                                await commit_queue.put("__UNCLEAR__")
+                                await _queue_utterance(UNCLEAR)
                             else:
                                 last_ai = chat_sessions.get(session_id, {}).get("last_ai_text", "")
                                 if is_echo_of_ai(text, last_ai):
+                                    turn_queue.drop("echo")
                                     log("[COMMIT]", f"DROPPED (echo): '{text}'")
                                 else:
-                                    await commit_queue.put(text)
+                                    await _queue_utterance(text)
 
                     except Exception as e:
                         log("[CTRL]", f"JSON parse error: {e}")
@@ -1319,15 +1974,19 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                     raw = msg["bytes"]
                     if _ai_is_speaking():
                         _drop_ai += 1
+                        vad.reset()
                         continue
-                    try:
-                        audio_buf.put_nowait(raw)
-                    except asyncio.QueueFull:
+                    for frame in vad.process(raw):
                         try:
-                            audio_buf.get_nowait()
-                        except asyncio.QueueEmpty:
-                            pass
-                        audio_buf.put_nowait(raw)
+                            audio_buf.put_nowait(frame)
+                        except asyncio.QueueFull:
+                            try:
+                                audio_buf.get_nowait()
+                            except asyncio.QueueEmpty:
+                                pass
+                            audio_buf.put_nowait(frame)
+                    if barge_in_enabled[0] and vad.speech_run_ms >= config.BARGE_IN_MIN_SPEECH_MS:
+                        await _barge_in("vad")
 
         except Exception as e:
             log("[AUDIO_TASK]", f"Crashed: {e}\n{traceback.format_exc()}")
@@ -1346,10 +2005,10 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                 # Wait up to 5 s for bot_config to arrive via the async "init" message.
                 # The DB fetch happens in browser_to_sarvam() after the frontend sends "init",
                 # which can take 2-3 s — previously only 1.5 s was waited, causing a race.
-                for _ in range(50):
-                    if chat_sessions.get(session_id, {}).get("bot_config"):
-                        break
-                    await asyncio.sleep(0.1)
+                try:
+                    await asyncio.wait_for(init_done.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    pass
 
             sess     = chat_sessions.get(session_id, {})
             bot_cfg  = sess.get("bot_config") or {}
@@ -1361,12 +2020,11 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
 
             log("[STT_SEND]", f"Opening Sarvam STT ({attempt_label}) lang={stt_lang}")
             try:
-                async with client_stt.speech_to_text_streaming.connect(
-                    model="saaras:v3", language_code=stt_lang, sample_rate=16000
-                ) as sarvam_ws:
-                    log("[STT_SEND]", f"Sarvam STT ESTABLISHED ({attempt_label})")
+                async with stt_pool.connection(stt_lang) as (sarvam_ws, warmed):
+                    log("[STT_SEND]", f"Sarvam STT ESTABLISHED ({attempt_label})"
+                                      f"{' from pool, pre-warmed' if warmed else ''}")
 
-                    ok = await _warmup_sarvam(sarvam_ws, attempt_label)
+                    ok = warmed or await _warmup_sarvam(sarvam_ws, attempt_label)
                     if not ok:
                         reconnect_num += 1
                         await asyncio.sleep(1)
@@ -1378,13 +2036,17 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                         pass
 
                     recv_task = asyncio.create_task(
-                        _sarvam_receiver(sarvam_ws, commit_queue, websocket)
+                        _sarvam_receiver(sarvam_ws, websocket)
                     )
 
+                    # Event-driven: the loop sleeps on the audio queue, the
+                    # language-switch event and the keepalive deadline at once —
+                    # no polling interval between a frame arriving and its send.
+                    switch_wait = asyncio.create_task(language_switch_event.wait())
                     try:
-                        KEEPALIVE_INTERVAL = 20.0
-                        POLL_INTERVAL      = 0.1
-                        last_real_pkt_time = asyncio.get_event_loop().time()
+                        KEEPALIVE_INTERVAL = config.STT_KEEPALIVE_INTERVAL_S
+                        loop               = asyncio.get_running_loop()
+                        last_real_pkt_time = loop.time()
 
                         while True:
                             # ── Language-switch check: break to reconnect STT with new lang
@@ -1397,23 +2059,46 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                             try:
                                 raw = audio_buf.get_nowait()
                             except asyncio.QueueEmpty:
-                                now    = asyncio.get_event_loop().time()
-                                idle_s = now - last_real_pkt_time
-                                if idle_s >= KEEPALIVE_INTERVAL and not _ai_is_speaking():
-                                    await sarvam_ws.transcribe(audio=_SILENCE_FRAME_B64)
-                                    last_real_pkt_time = now
-                                await asyncio.sleep(POLL_INTERVAL)
-                                continue
-
-                            last_real_pkt_time = asyncio.get_event_loop().time()
+                                raw = None
+                            if raw is None:
+                                idle_s = loop.time() - last_real_pkt_time
+                                if idle_s >= KEEPALIVE_INTERVAL:
+                                    if not _ai_is_speaking():
+                                        await sarvam_ws.transcribe(audio=_SILENCE_FRAME_B64)
+                                        last_real_pkt_time = loop.time()
+                                        continue
+                                    # Keepalive is held while the AI speaks; re-check when it stops.
+                                    timeout = max(ai_speaking_until[0] - _time.monotonic(), 0.05)
+                                else:
+                                    timeout = KEEPALIVE_INTERVAL - idle_s
+                                get_task = asyncio.create_task(audio_buf.get())
+                                await asyncio.wait(
+                                    {get_task, switch_wait}, timeout=timeout,
+                                    return_when=asyncio.FIRST_COMPLETED,
+                                )
+                                if not get_task.done():
+                                    get_task.cancel()
+                                    try:
+                                        await get_task
+                                    except asyncio.CancelledError:
+                                        pass
+                                    continue
+                                raw = get_task.result()
+
+                            frames = await _next_stt_batch(
+                                audio_buf, raw,
+                                config.STT_BATCH_TARGET_BYTES, config.STT_BATCH_MAX_WAIT_MS / 1000,
+                            )
+                            last_real_pkt_time = loop.time()
                             await sarvam_ws.transcribe(
-                                audio=base64.b64encode(raw).decode("utf-8")
+                                audio=base64.b64encode(b"".join(frames)).decode("utf-8")
                             )
-                            _sent += 1
+                            _sent += len(frames)
 
                     except Exception as e:
                         log("[STT_SEND]", f"Send loop ended ({attempt_label}): {e}")
                     finally:
+                        switch_wait.cancel()
                         recv_task.cancel()
                         try:
                             await recv_task
@@ -1445,7 +2130,7 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                     pass
 
     # ── Task 2b: Sarvam transcript receiver ──────────────────────────────────
-    async def _sarvam_receiver(sarvam_ws, commit_queue, websocket):
+    async def _sarvam_receiver(sarvam_ws, websocket):
         log("[STT_RECV]", "Receiver started")
         try:
             p_count = f_count = 0
@@ -1460,18 +2145,33 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                 speaking_now = _ai_is_speaking()
                 if is_final:
                     f_count += 1
+                    if speculation_timer[0] is not None:
+                        speculation_timer[0].cancel()
                     if speaking_now:
+                        turn_queue.drop("ai_speaking")
                         log("[STT_RECV]", f"FINAL DROPPED (AI speaking): '{transcript}'")
                     elif is_noisy_transcript(transcript):
-                        await commit_queue.put("__UNCLEAR__")
+                        await _queue_utterance(UNCLEAR)
                     else:
                         last_ai = chat_sessions.get(session_id, {}).get("last_ai_text", "")
                         if is_echo_of_ai(transcript, last_ai):
+                            turn_queue.drop("echo")
                             log("[STT_RECV]", f"FINAL DROPPED (echo): '{transcript}'")
                         else:
-                            await commit_queue.put(transcript)
+                            await _queue_utterance(transcript)
                 else:
                     p_count += 1
+                    if (
+                        barge_in_enabled[0]
+                        and len(transcript.split()) >= config.BARGE_IN_MIN_PARTIAL_WORDS
+                        and not is_echo_of_ai(transcript, tts_session.speaking_text())
+                        and not is_echo_of_ai(
+                            transcript, chat_sessions.get(session_id, {}).get("last_ai_text", "")
+                        )
+                    ):
+                        await _barge_in("stt")
+                    if not speaking_now:
+                        _on_partial(transcript)
 
                 try:
                     await websocket.send_json({
@@ -1490,22 +2190,29 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
         log("[BRAIN_CONSUMER]", "Started")
         while True:
             try:
-                sentence = await commit_queue.get()
-                log("[BRAIN_CONSUMER]", f"Dequeued: '{sentence}' | locked={brain_lock.locked()}")
-                if brain_lock.locked():
-                    log("[BRAIN_CONSUMER]", "Brain BUSY — dropping")
-                    continue
+                sentence, fragments = await turn_queue.get(still_speaking=lambda: vad.speech_run_ms > 0)
+                log("[BRAIN_CONSUMER]", f"Dequeued: '{sentence}' | fragments={fragments}")
+                spec, speculation[0] = speculation[0], None
                 async with brain_lock:
                     await websocket.send_json({"type": "processing_start"})
+                    current_turn["interrupted"] = False
+                    current_turn["task"] = turn = asyncio.create_task(run_brain(
+                        session_id=session_id,
+                        user_text=sentence,
+                        websocket=websocket,
+                        tts_session=tts_session,
+                        chat_sessions=chat_sessions,
+                        tts_convert_fn=tts_convert,
+                        speculation=spec,
+                    ))
                     try:
-                        await run_brain(
-                            session_id=session_id,
-                            user_text=sentence,
-                            websocket=websocket,
-                            tts_session=tts_session,
-                            chat_sessions=chat_sessions,
-                            tts_convert_fn=tts_convert,
-                        )
+                        await turn
+                    except asyncio.CancelledError:
+                        if not current_turn["interrupted"]:
+                            raise           # the consumer itself is being cancelled
+                        removed = await settle_interrupted_turn(chat_sessions.get(session_id) or {})
+                        log("[BRAIN_CONSUMER]", f"Turn interrupted by barge-in"
+                                                f"{f' | dropped {removed} tool message(s)' if removed else ''}")
                     except Exception as e:
                         bot_cfg = chat_sessions.get(session_id, {}).get("bot_config") or {}
                         memory = chat_sessions.get(session_id, {}).get("memory") or {}
@@ -1522,11 +2229,16 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
                             import random as _rand
                             resp_id = _rand.randint(1, 999999)
                             await tts_session.speak(
-                                [fallback_text], fb_speaker, fb_lang, resp_id, done_evt
+                                [fallback_text], fb_speaker, fb_lang, resp_id, done_evt, cacheable=True
                             )
                             await done_evt.wait()
                         except Exception as tts_err:
                             log("[BRAIN_CONSUMER]", f"Fallback TTS also failed: {tts_err}")
+                    finally:
+                        current_turn["task"] = None
+                        if spec is not None:
+                            spec.discard("turn never reached memory extraction")
+                    await _persist_voice_state(session_id)
 
             except asyncio.CancelledError:
                 break
@@ -1545,4 +2257,10 @@ async def voice_ws(websocket: WebSocket, phone_number: Optional[str] = None):
     finally:
         log("[WS]", "Closing StreamingTTSSession")
         await tts_session.close()
+        if speculation_timer[0] is not None:
+            speculation_timer[0].cancel()
+        _drop_speculation("call ended")
+        log("[VAD]", f"Session summary | {vad.close()}")
+        await _persist_voice_state(session_id)
+        chat_sessions.discard(session_id)
     log("[WS]", "All tasks exited")
@@ -28,6 +28,8 @@ import uuid
 from functools import lru_cache
 from typing import Optional, List
 
+from services.tool_context import current_tool_context
+
 # ─────────────────────────────────────────────────────────────────────────────
 # FIX 1 + FIX 2 — EAGER GLOBALS
 # Loaded once when this module is first imported (at FastAPI startup via warmup).
@@ -339,8 +341,7 @@ def retrieve_facts(tenant_id: str, query: str, top_k: int = 3) -> List[str]:
 # LangChain-compatible tool
 # ─────────────────────────────────────────────────────────────────────────────
 
-# Tenant context injected by brain.py before every tool call (same pattern as calendar_tool)
-tenant_context = None
+# Tenant context: set by brain._run_tool_async around every tool call (services/tool_context.py)
 
 
 def get_facts(query: str, phone_number: Optional[str] = None) -> str:
@@ -356,11 +357,12 @@ def get_facts(query: str, phone_number: Optional[str] = None) -> str:
     """
     print(f"[FACTS_FLOW] get_facts called | query='{query}'")
 
+    tenant_context = current_tool_context()
     if tenant_context is None:
         print("[FACTS_FLOW] Error: tenant_context is None")
         return "Error: Facts module context not initialised."
 
-    session = tenant_context.chat_sessions.get(tenant_context.session_id)
+    session = tenant_context.session()
     if not session:
         print(f"[FACTS_FLOW] Error: no session for id='{tenant_context.session_id}'")
         return "Error: No active session for facts lookup."
@@ -60,11 +60,11 @@ def invalidate_tools_cache(tenant_id: Optional[str] = None):
 
 def get_enabled_modules_for_tenant(tenant_id: str) -> List[str]:
     """
-    Load enabled module names for a tenant from the DB.
+    Load enabled module names for a tenant (database/tenant_cache.py, DB on miss).
     Falls back to [BOOKING_MODULE] if DB is unavailable (backward-compat).
     """
     try:
-        from database.crud import get_tenant_modules
+        from database.tenant_cache import get_tenant_modules
         modules_dict = get_tenant_modules(tenant_id)
         enabled = [name for name, on in modules_dict.items() if on]
         # If nothing configured, default to booking only
@@ -74,6 +74,18 @@ def get_enabled_modules_for_tenant(tenant_id: str) -> List[str]:
         return [BOOKING_MODULE]
 
 
+async def aget_enabled_modules_for_tenant(tenant_id: str) -> List[str]:
+    """Async variant of get_enabled_modules_for_tenant() (asyncpg, no thread hop)."""
+    try:
+        from database.tenant_cache import aget_tenant_modules
+        modules_dict = await aget_tenant_modules(tenant_id)
+        enabled = [name for name, on in modules_dict.items() if on]
+        return enabled if enabled else [BOOKING_MODULE]
+    except Exception as e:
+        print(f"[MODULE_REGISTRY] DB unavailable, defaulting to BOOKING_MODULE: {e}")
+        return [BOOKING_MODULE]
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Tool schemas
 # ─────────────────────────────────────────────────────────────────────────────
@@ -119,6 +131,7 @@ def build_tools_for_tenant(tenant_id: str, enabled_modules: List[str]) -> List:
                 cancel_appointment,
                 reschedule_appointment,
                 suggest_next_available_slot,
+                find_available_times,
             )
             tools += [
                 _wrap(check_calendar_availability,  "check_calendar_availability", "Check if a time slot is available"),
@@ -126,6 +139,8 @@ def build_tools_for_tenant(tenant_id: str, enabled_modules: List[str]) -> List:
                 _wrap(cancel_appointment,           "cancel_appointment",           "Cancel an existing appointment"),
                 _wrap(reschedule_appointment,       "reschedule_appointment",       "Reschedule an appointment"),
                 _wrap(suggest_next_available_slot,  "suggest_next_available_slot",  "Suggest the next free slots"),
+                _wrap(find_available_times,         "find_available_times",
+                      "List free appointment times across several days (e.g. 'any time this week?')"),
             ]
             print(f"[MODULE_REGISTRY] BOOKING_MODULE tools loaded for tenant={tenant_id}")
         except ImportError as e:
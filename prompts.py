@@ -75,11 +75,13 @@ def _booking_prompt_section(lang_pack: dict) -> str:
 
 You can help the user book, cancel, or reschedule appointments using these tools:
   check_calendar_availability, book_appointment, cancel_appointment,
-  reschedule_appointment, suggest_next_available_slot
+  reschedule_appointment, suggest_next_available_slot, find_available_times
 
 === BOOKING — CRITICAL RULES ===
 1. NO INVENTED SLOTS: Only suggest times a tool returned as FREE.
 2. If slot is 'BUSY', call suggest_next_available_slot and present those options.
+   For open-ended requests ("any time this week?") pass search_days (e.g. 7); pass direction="before" or "both" if the user prefers earlier times.
+   If the user has no specific time in mind ("when are you free this week?", "any morning next week?"), call find_available_times with start_date and days (earliest_time / latest_time for mornings or evenings).
 3. If check_calendar_availability returns an out-of-hours error ("We only accept appointments during these business hours..."), do NOT call suggest_next_available_slot immediately. First explain that the requested time is outside business hours and ask the user to choose a time within those periods.
 3. GARBLED INPUT: If unclear, ask "{unclear_msg}" — do not call any tools.
 4. NEVER SUGGEST PAST TIMES: If the appointment date is today, you must not call any booking tool with a time earlier than CURRENT_IST_TIME.
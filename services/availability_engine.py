@@ -0,0 +1,214 @@
+"""
+services/availability_engine.py
+-------------------------------
+Slot search over business periods and busy intervals (pure Python, no I/O).
+
+suggest_next_available_slot used to step through candidates one by one and,
+for each, scan every busy interval and re-parse the tenant's business periods.
+This engine does the work once:
+
+  1. business periods are normalised into an AvailabilityEngine, cached per
+     distinct period set (get_engine)
+  2. busy intervals are sorted and coalesced (merge_intervals)
+  3. each day's business windows (memoised per date) are walked lazily and
+     busy time is subtracted by bisect, giving free windows over the horizon
+     (days or weeks) — the walk stops as soon as enough slots are found
+  4. candidate starts on the anchor's step grid are read straight out of the
+     free windows, after and/or before the requested time
+
+On the requested day candidates match the old loop: anchor + k * step, where
+step defaults to the appointment duration. Other days use a grid from local
+midnight. A slot must fit entirely inside one business period and overlap no
+busy interval.
+"""
+
+import bisect
+import datetime
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pytz
+
+Interval = Tuple[datetime.datetime, datetime.datetime]
+
+AFTER  = "after"
+BEFORE = "before"
+BOTH   = "both"
+DIRECTIONS = (AFTER, BEFORE, BOTH)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort and coalesce overlapping / touching intervals."""
+    merged: List[Interval] = []
+    for s, e in sorted(intervals):
+        if e <= s:
+            continue
+        if merged and s <= merged[-1][1]:
+            if e > merged[-1][1]:
+                merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def _ceil_div(a: float, b: float) -> int:
+    return -int(-a // b)
+
+
+class AvailabilityEngine:
+    """Business periods (minutes from local midnight) for one tenant."""
+
+    def __init__(self, periods: Sequence[Tuple[int, int]], tz_name: str):
+        self.tz = pytz.timezone(tz_name)
+        self.periods = [
+            (datetime.timedelta(minutes=s), datetime.timedelta(minutes=e))
+            for s, e in sorted(periods) if s < e
+        ]
+        self._day_cache: dict = {}
+
+    # ── windows ───────────────────────────────────────────────────────────
+
+    def _day_windows(self, day: datetime.date) -> Tuple[datetime.datetime, List[Interval]]:
+        """(aware local midnight, business windows) for one date — memoised, localize() is slow."""
+        cached = self._day_cache.get(day)
+        if cached is None:
+            midnight = datetime.datetime.combine(day, datetime.time())
+            cached = (
+                self.tz.localize(midnight),
+                [
+                    (self.tz.localize(midnight + p_start), self.tz.localize(midnight + p_end))
+                    for p_start, p_end in self.periods
+                ],
+            )
+            if len(self._day_cache) > 4096:
+                self._day_cache.clear()
+            self._day_cache[day] = cached
+        return cached
+
+    def _iter_windows(self, start: datetime.datetime, end: datetime.datetime,
+                      reverse: bool) -> Iterator[Tuple[datetime.datetime, datetime.datetime, datetime.datetime]]:
+        if not self.periods or end <= start:
+            return
+        first = start.astimezone(self.tz).date() - datetime.timedelta(days=1)
+        last = end.astimezone(self.tz).date()
+        one = datetime.timedelta(days=1)
+        day = last if reverse else first
+        while first <= day <= last:
+            midnight, windows = self._day_windows(day)
+            for ws, we in (reversed(windows) if reverse else windows):
+                if we > start and ws < end:
+                    yield max(ws, start), min(we, end), midnight
+            day = day - one if reverse else day + one
+
+    def _iter_free(self, busy: Sequence[Interval], start: datetime.datetime,
+                   end: datetime.datetime, reverse: bool):
+        starts = [b[0] for b in busy]
+        ends = [b[1] for b in busy]
+        for ws, we, midnight in self._iter_windows(start, end, reverse):
+            lo = bisect.bisect_right(ends, ws)
+            hi = bisect.bisect_left(starts, we)
+            pieces = []
+            cursor = ws
+            for bs, be in busy[lo:hi]:
+                if bs > cursor:
+                    pieces.append((cursor, bs, midnight))
+                cursor = max(cursor, be)
+            if cursor < we:
+                pieces.append((cursor, we, midnight))
+            yield from (reversed(pieces) if reverse else pieces)
+
+    def business_windows(self, start: datetime.datetime, end: datetime.datetime,
+                         reverse: bool = False) -> Iterator[Interval]:
+        """Aware business windows intersecting [start, end), lazily, in (reverse) order."""
+        for ws, we, _ in self._iter_windows(start, end, reverse):
+            yield ws, we
+
+    def free_windows(self, busy: Sequence[Interval], start: datetime.datetime,
+                     end: datetime.datetime, reverse: bool = False) -> Iterator[Interval]:
+        """
+        Business windows in [start, end) minus busy time, lazily.
+        `busy` must already be merged (merge_intervals) — starts and ends then
+        both ascend, so each window finds its overlapping busy run by bisect.
+        """
+        for fs, fe, _ in self._iter_free(busy, start, end, reverse):
+            yield fs, fe
+
+    # ── slot search ───────────────────────────────────────────────────────
+
+    def find_slots(
+        self,
+        busy: Iterable[Interval],
+        anchor: datetime.datetime,
+        duration_minutes: int,
+        max_slots: int = 3,
+        horizon: datetime.timedelta = datetime.timedelta(hours=4),
+        direction: str = AFTER,
+        step_minutes: Optional[int] = None,
+        earliest: Optional[datetime.datetime] = None,
+    ) -> List[datetime.datetime]:
+        """
+        Up to `max_slots` free start times on the anchor grid, chronological.
+
+        AFTER  — anchor .. anchor + horizon (anchor included)
+        BEFORE — anchor - horizon .. anchor (anchor excluded), never before `earliest`
+        BOTH   — the `max_slots` candidates closest to the anchor from either side
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}")
+        if max_slots <= 0:
+            return []
+        dur = datetime.timedelta(minutes=int(duration_minutes))
+        step = datetime.timedelta(minutes=int(step_minutes or duration_minutes))
+        step_s = step.total_seconds()
+        merged = merge_intervals(busy)
+        # Grid origin: the anchor on its own day (same grid as the old loop),
+        # local midnight on other days so 30-min slots land on :00 / :30.
+        anchor_midnight, _ = self._day_windows(anchor.astimezone(self.tz).date())
+
+        after: List[datetime.datetime] = []
+        before: List[datetime.datetime] = []
+
+        if direction in (AFTER, BOTH):
+            for fs, fe, midnight in self._iter_free(merged, anchor, anchor + horizon, False):
+                base = anchor if midnight == anchor_midnight else midnight
+                t = base + _ceil_div((fs - base).total_seconds(), step_s) * step
+                while t + dur <= fe and len(after) < max_slots:
+                    after.append(t)
+                    t += step
+                if len(after) >= max_slots:
+                    break
+
+        if direction in (BEFORE, BOTH):
+            lo = anchor - horizon
+            if earliest is not None and earliest > lo:
+                lo = earliest
+            # Window extends to anchor + dur so a slot may start just before the
+            # anchor and run past it.
+            for fs, fe, midnight in self._iter_free(merged, lo, anchor + dur, True):
+                last = fe - dur
+                base = anchor if midnight == anchor_midnight else midnight
+                t = base + int((last - base).total_seconds() // step_s) * step
+                while t >= anchor:
+                    t -= step
+                while t >= fs and len(before) < max_slots:
+                    before.append(t)
+                    t -= step
+                if len(before) >= max_slots:
+                    break
+
+        if direction == AFTER:
+            return after
+        if direction == BEFORE:
+            return sorted(before)
+        nearest = sorted(after + before, key=lambda t: (abs((t - anchor).total_seconds()), t < anchor))
+        return sorted(nearest[:max_slots])
+
+
+@lru_cache(maxsize=256)
+def _engine_for(periods: Tuple[Tuple[int, int], ...], tz_name: str) -> AvailabilityEngine:
+    return AvailabilityEngine(periods, tz_name)
+
+
+def get_engine(periods: Sequence[Tuple[int, int]], tz_name: str) -> AvailabilityEngine:
+    """Engine for a tenant's normalised business periods (cached per distinct period set)."""
+    return _engine_for(tuple((int(s), int(e)) for s, e in periods), tz_name)
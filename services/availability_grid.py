@@ -0,0 +1,177 @@
+"""
+services/availability_grid.py
+-----------------------------
+NumPy bitmap view of a tenant's availability over many days.
+
+Each day is a row of 1440 / slot_minutes booleans (one cell per slot from local
+midnight); the rows are laid end to end so intervals crossing midnight need no
+special case.
+
+  business  — the tenant's business periods, identical for every row
+  busy      — one bitmap per calendar (difference array + cumsum)
+  free      — business & ~busy_1 & ~busy_2 ...   (several doctors → bitwise AND)
+
+Every feasible start for a D-cell appointment is then one vectorised
+sliding-window test over the whole horizon: csum[i + D] - csum[i] == D.
+Candidate starts step from each business period's opening (9:30, 10:15, ...
+for 45-min slots opening at 9:30), not from midnight.
+
+The cell size is the gcd of the appointment length, the step and the period
+boundaries (cell_minutes_for), typically 15 or 30 minutes. Busy time is rounded
+outward to whole cells, which is exact for starts on that grid: a slot is free
+iff every cell it covers is free.
+
+Used by the find_available_times tool in calendar_tool.py for open-ended
+questions ("any time this week?"). Offsets are taken from the first local
+midnight, so days are assumed to be 24h long (true for Asia/Kolkata).
+"""
+
+import datetime
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pytz
+
+MINUTES_PER_DAY = 24 * 60
+
+Interval = Tuple[datetime.datetime, datetime.datetime]
+
+
+def cell_minutes_for(periods: Sequence[Tuple[int, int]], *lengths: Optional[int]) -> int:
+    """Largest cell size (divides a day) on which periods, durations and steps all align."""
+    g = MINUTES_PER_DAY
+    for s, e in periods:
+        g = math.gcd(g, math.gcd(int(s), int(e)))
+    for n in lengths:
+        if n:
+            g = math.gcd(g, int(n))
+    return max(1, g)
+
+
+def business_bitmap(periods: Sequence[Tuple[int, int]], days: int, cell: int = 1) -> np.ndarray:
+    """Flat bool array (days * cells_per_day): True inside a business period."""
+    day = np.zeros(MINUTES_PER_DAY // cell, dtype=bool)
+    for start, end in periods:
+        # Rounded inward: a cell only counts if the whole cell is open.
+        day[-(-max(0, start) // cell):min(MINUTES_PER_DAY, end) // cell] = True
+    return np.tile(day, days)
+
+
+def busy_bitmap(busy: Iterable[Interval], origin: datetime.datetime, days: int,
+                cell: int = 1) -> np.ndarray:
+    """Flat bool array (days * cells_per_day): True where any busy interval touches the cell."""
+    total = days * (MINUTES_PER_DAY // cell)
+    # Subtracting aware datetimes is much cheaper than .timestamp() on pytz zones.
+    spans = [((s - origin).total_seconds(), (e - origin).total_seconds()) for s, e in busy]
+    if not spans:
+        return np.zeros(total, dtype=bool)
+    arr = np.asarray(spans, dtype=np.float64) / (60.0 * cell)
+    # A meeting that covers any part of a cell blocks the whole cell.
+    starts = np.clip(np.floor(arr[:, 0]), 0, total).astype(np.intp)
+    ends = np.clip(np.ceil(arr[:, 1]), 0, total).astype(np.intp)
+    keep = ends > starts
+    diff = (np.bincount(starts[keep], minlength=total + 1)
+            - np.bincount(ends[keep], minlength=total + 1))
+    return np.cumsum(diff[:-1]) > 0
+
+
+def window_starts(free: np.ndarray, length: int) -> np.ndarray:
+    """Bool array: True at i when free[i : i + length] is entirely True."""
+    total = free.shape[0]
+    ok = np.zeros(total, dtype=bool)
+    if length <= 0 or length > total:
+        return ok
+    csum = np.concatenate(([0], np.cumsum(free, dtype=np.int32)))
+    ok[: total - length + 1] = (csum[length:] - csum[:-length]) == length
+    return ok
+
+
+class AvailabilityGrid:
+    """Free-cell bitmap for one tenant over [start_date, start_date + days)."""
+
+    def __init__(self, periods: Sequence[Tuple[int, int]], start_date: datetime.date,
+                 days: int, tz_name: str, cell_minutes: int = 1):
+        if cell_minutes <= 0 or MINUTES_PER_DAY % cell_minutes:
+            raise ValueError("cell_minutes must divide 1440")
+        self.tz = pytz.timezone(tz_name)
+        self.start_date = start_date
+        self.days = max(1, int(days))
+        self.cell = int(cell_minutes)
+        self.cells_per_day = MINUTES_PER_DAY // self.cell
+        self.origin = self.tz.localize(datetime.datetime.combine(start_date, datetime.time()))
+        self.periods = [(int(s), int(e)) for s, e in periods]
+        self.free = business_bitmap(self.periods, self.days, self.cell)
+
+    @property
+    def end(self) -> datetime.datetime:
+        return self.origin + datetime.timedelta(days=self.days)
+
+    def block(self, busy: Iterable[Interval]) -> "AvailabilityGrid":
+        """AND in one calendar's busy time (call once per calendar / staff member)."""
+        self.free &= ~busy_bitmap(busy, self.origin, self.days, self.cell)
+        return self
+
+    def intersect(self, other: "AvailabilityGrid") -> "AvailabilityGrid":
+        """Keep only cells free in both grids (same origin, length and cell size)."""
+        if (other.origin, other.days, other.cell) != (self.origin, self.days, self.cell):
+            raise ValueError("Grids must share origin, length and cell size to be intersected.")
+        self.free &= other.free
+        return self
+
+    def _cells(self, minutes: int) -> int:
+        if minutes % self.cell:
+            raise ValueError(f"{minutes} min is not a multiple of the {self.cell} min cell")
+        return minutes // self.cell
+
+    def start_mask(
+        self,
+        duration_minutes: int,
+        step_minutes: Optional[int] = None,
+        not_before: Optional[datetime.datetime] = None,
+        earliest_minute: Optional[int] = None,
+        latest_minute: Optional[int] = None,
+    ) -> np.ndarray:
+        """Bool (days, cells_per_day): feasible starts, stepping from each period's opening."""
+        length = self._cells(int(duration_minutes))
+        step = self._cells(int(step_minutes or duration_minutes))
+        ok = window_starts(self.free, length).reshape(self.days, self.cells_per_day)
+
+        # Column filter (same for every day): step grid and time-of-day bounds.
+        col = np.arange(self.cells_per_day)
+        col_min = col * self.cell
+        cols = np.zeros(self.cells_per_day, dtype=bool)
+        for start, end in self.periods:
+            first = -(-max(0, start) // self.cell)        # first whole open cell, as in business_bitmap
+            last = min(MINUTES_PER_DAY, end) // self.cell
+            cols |= (col >= first) & (col < last) & ((col - first) % step == 0)
+        if earliest_minute is not None:
+            cols &= col_min >= earliest_minute
+        if latest_minute is not None:
+            # latest_minute bounds the appointment end, not its start
+            cols &= col_min + int(duration_minutes) <= latest_minute
+        ok &= cols
+
+        if not_before is not None:
+            cut = math.ceil((not_before - self.origin).total_seconds() / (60.0 * self.cell))
+            ok.reshape(-1)[: max(0, min(cut, ok.size))] = False
+        return ok
+
+    def start_times(self, duration_minutes: int, max_per_day: int = 3, max_results: int = 10,
+                    **mask_kwargs) -> Dict[datetime.date, List[datetime.datetime]]:
+        """
+        {local date: [start datetimes]} — at most `max_per_day` per day and
+        `max_results` in total, earliest days first.
+        """
+        mask = self.start_mask(duration_minutes, **mask_kwargs)
+        out: Dict[datetime.date, List[datetime.datetime]] = {}
+        remaining = max_results
+        for d in np.flatnonzero(mask.any(axis=1)):
+            if remaining <= 0:
+                break
+            cells = np.flatnonzero(mask[d])[: min(max_per_day, remaining)]
+            day = self.start_date + datetime.timedelta(days=int(d))
+            midnight = self.origin + datetime.timedelta(days=int(d))
+            out[day] = [midnight + datetime.timedelta(minutes=int(c) * self.cell) for c in cells]
+            remaining -= len(cells)
+        return out
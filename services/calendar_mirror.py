@@ -0,0 +1,378 @@
+"""
+services/calendar_mirror.py
+---------------------------
+Per-tenant in-memory mirror of Google Calendar busy time.
+
+check_calendar_availability / suggest_next_available_slot used to make a live
+freebusy().query round trip inside the LLM tool loop. With the mirror they read
+a coalesced, sorted list of busy intervals from memory instead.
+
+How it stays fresh:
+  - first use for a tenant: full events.list sync (singleEvents, from
+    now - CALENDAR_MIRROR_LOOKBACK_HOURS to now + AVAILABILITY_GRID_MAX_DAYS,
+    so open-ended recurring events expand to a bounded set) → nextSyncToken
+  - background thread every CALENDAR_MIRROR_REFRESH_S: incremental
+    events.list(syncToken=...) per tracked tenant; 410 GONE → full resync
+  - once the window's end is less than AVAILABILITY_GRID_MAX_DAYS ahead
+    (about once a day) the refresh does a full sync instead, moving the window
+    forward — events past the old end were never fetched, so the end can't
+    just be pushed out
+  - our own book/cancel/reschedule writes are applied locally right away
+    (record_event / forget_event), so the next check never sees stale data
+    for changes made by this process
+  - tenant_cache invalidation of calendar_token drops the tenant's mirror
+
+get_busy_intervals() returns None when the mirror is older than
+CALENDAR_MIRROR_MAX_STALENESS_S (after one inline incremental sync attempt) or
+the query falls outside the synced window — callers then fall back to the live
+freebusy API. The mirror only serves suggestions and availability answers:
+book / reschedule re-check the slot with a live freebusy query before writing,
+since bookings by other workers or edits in Google Calendar can be up to one
+refresh interval old here.
+
+Transparent ("show as available") and cancelled events are not busy, matching
+freebusy semantics.
+"""
+
+import bisect
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pytz
+from googleapiclient.errors import HttpError
+
+import config
+from services.calendar_provider import get_calendar_service
+
+Interval = Tuple[datetime.datetime, datetime.datetime]
+
+_UTC = datetime.timezone.utc
+
+
+def _parse_event_time(value: dict) -> Optional[datetime.datetime]:
+    """Event start/end → aware UTC datetime (all-day dates use the tenant timezone)."""
+    if not value:
+        return None
+    if value.get("dateTime"):
+        dt = datetime.datetime.fromisoformat(value["dateTime"])
+        if dt.tzinfo is None:
+            tz = pytz.timezone(value.get("timeZone") or config.CALENDAR_TIMEZONE)
+            dt = tz.localize(dt)
+        return dt.astimezone(_UTC)
+    if value.get("date"):
+        day = datetime.date.fromisoformat(value["date"])
+        tz = pytz.timezone(value.get("timeZone") or config.CALENDAR_TIMEZONE)
+        return tz.localize(datetime.datetime.combine(day, datetime.time())).astimezone(_UTC)
+    return None
+
+
+def _busy_span(event: dict) -> Optional[Interval]:
+    if event.get("status") == "cancelled" or event.get("transparency") == "transparent":
+        return None
+    start = _parse_event_time(event.get("start"))
+    end = _parse_event_time(event.get("end"))
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+
+class _TenantMirror:
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+        self.calendar_id: Optional[str] = None
+        self.sync_token: Optional[str] = None
+        self.window_start: Optional[datetime.datetime] = None
+        self.window_end: Optional[datetime.datetime] = None
+        self.last_synced = 0.0          # monotonic; 0 = never
+        self.last_used = time.monotonic()
+        self._events: Dict[str, Interval] = {}
+        self._merged: List[Interval] = []
+        self._merged_starts: List[datetime.datetime] = []
+        self._dirty = False
+        self._lock = threading.Lock()       # guards _events / _merged
+        self._sync_lock = threading.Lock()  # one sync at a time per tenant
+
+    # ── reads ─────────────────────────────────────────────────────────────
+
+    def is_fresh(self) -> bool:
+        return self.last_synced > 0 and time.monotonic() - self.last_synced < config.CALENDAR_MIRROR_MAX_STALENESS_S
+
+    def busy_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Interval]:
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            merged, starts = self._merged, self._merged_starts
+        # First merged interval that could overlap [start, end)
+        i = max(0, bisect.bisect_right(starts, start) - 1)
+        out = []
+        while i < len(merged) and merged[i][0] < end:
+            s, e = merged[i]
+            if e > start:
+                out.append((s, e))
+            i += 1
+        return out
+
+    def _rebuild(self):
+        spans = sorted(self._events.values())
+        merged: List[Interval] = []
+        for s, e in spans:
+            if merged and s <= merged[-1][1]:
+                if e > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], e)
+            else:
+                merged.append((s, e))
+        self._merged = merged
+        self._merged_starts = [s for s, _ in merged]
+        self._dirty = False
+
+    # ── writes ────────────────────────────────────────────────────────────
+
+    def apply(self, event: dict):
+        event_id = event.get("id")
+        if not event_id:
+            return
+        span = _busy_span(event)
+        with self._lock:
+            if span is None:
+                self._events.pop(event_id, None)
+            else:
+                self._events[event_id] = span
+            self._dirty = True
+
+    def forget(self, event_id: str):
+        with self._lock:
+            if self._events.pop(event_id, None) is not None:
+                self._dirty = True
+
+    def prune(self, before: datetime.datetime):
+        with self._lock:
+            stale = [eid for eid, (_, e) in self._events.items() if e < before]
+            for eid in stale:
+                del self._events[eid]
+            if stale:
+                self._dirty = True
+        if self.window_start is not None and self.window_start < before:
+            self.window_start = before
+
+    # ── sync ──────────────────────────────────────────────────────────────
+
+    def window_short(self) -> bool:
+        """True once the synced window no longer reaches the slot-search horizon."""
+        if self.window_end is None:
+            return False
+        horizon = datetime.datetime.now(_UTC) + datetime.timedelta(days=config.AVAILABILITY_GRID_MAX_DAYS)
+        return self.window_end < horizon
+
+    def sync(self, full: bool = False):
+        """Incremental sync when we have a token, full sync otherwise (or on 410 / full=True)."""
+        with self._sync_lock:
+            service, calendar_id = get_calendar_service(self.tenant_id)
+            if calendar_id != self.calendar_id:
+                self.sync_token = None
+            if self.sync_token and not full:
+                try:
+                    self._pull(service, calendar_id, full=False)
+                    _bump("incremental_syncs")
+                    return
+                except HttpError as e:
+                    if getattr(e.resp, "status", None) != 410:
+                        raise
+                    _bump("resyncs_410")
+            self._pull(service, calendar_id, full=True)
+            _bump("full_syncs")
+
+    def _pull(self, service, calendar_id: str, full: bool):
+        params = {"calendarId": calendar_id, "singleEvents": True, "maxResults": 2500}
+        if full:
+            now = datetime.datetime.now(_UTC)
+            window_start = now - datetime.timedelta(hours=config.CALENDAR_MIRROR_LOOKBACK_HOURS)
+            window_end = now + datetime.timedelta(days=config.AVAILABILITY_GRID_MAX_DAYS + 1)
+            params["timeMin"] = window_start.isoformat()
+            params["timeMax"] = window_end.isoformat()
+        else:
+            params["syncToken"] = self.sync_token
+            params["showDeleted"] = True
+
+        events: List[dict] = []
+        page_token = None
+        while True:
+            if page_token:
+                params["pageToken"] = page_token
+            resp = service.events().list(**params).execute()
+            events.extend(resp.get("items", []))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                next_sync = resp.get("nextSyncToken")
+                break
+
+        if full:
+            # Swap the whole set at once: readers keep the old window until then.
+            fresh: Dict[str, Interval] = {}
+            for ev in events:
+                span = _busy_span(ev)
+                if ev.get("id") and span is not None:
+                    fresh[ev["id"]] = span
+            with self._lock:
+                self._events = fresh
+                self._dirty = True
+            self.window_start = window_start
+            self.window_end = window_end
+            self.calendar_id = calendar_id
+        else:
+            for ev in events:
+                self.apply(ev)
+        self.sync_token = next_sync
+        self.last_synced = time.monotonic()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Registry + public API
+# ─────────────────────────────────────────────────────────────────────────────
+
+_mirrors: Dict[str, _TenantMirror] = {}
+_mirrors_lock = threading.Lock()
+_stats = {
+    "hits":              0,
+    "fallbacks":         0,
+    "full_syncs":        0,
+    "incremental_syncs": 0,
+    "resyncs_410":       0,
+    "window_resyncs":    0,
+    "sync_errors":       0,
+    "local_updates":     0,
+}
+
+
+def _bump(key: str, n: int = 1):
+    with _mirrors_lock:
+        _stats[key] += n
+
+
+def _get_mirror(tenant_id: str, create: bool = True) -> Optional[_TenantMirror]:
+    key = str(tenant_id)
+    with _mirrors_lock:
+        mirror = _mirrors.get(key)
+        if mirror is None and create:
+            mirror = _TenantMirror(key)
+            _mirrors[key] = mirror
+        return mirror
+
+
+def get_busy_intervals(tenant_id: str, start: datetime.datetime,
+                       end: datetime.datetime) -> Optional[List[Interval]]:
+    """
+    Merged busy intervals (aware UTC) overlapping [start, end), or None when the
+    caller should use the live freebusy API instead.
+    """
+    if not config.CALENDAR_MIRROR_ENABLED or not tenant_id:
+        return None
+    mirror = _get_mirror(tenant_id)
+    mirror.last_used = time.monotonic()
+    if not mirror.is_fresh():
+        try:
+            mirror.sync()
+        except Exception as e:
+            _bump("sync_errors")
+            print(f"[CAL_MIRROR] Inline sync failed for tenant={tenant_id}: {e}")
+    if (not mirror.is_fresh() or mirror.window_start is None
+            or start.astimezone(_UTC) < mirror.window_start
+            or end.astimezone(_UTC) > mirror.window_end):
+        _bump("fallbacks")
+        return None
+    _bump("hits")
+    return mirror.busy_between(start.astimezone(_UTC), end.astimezone(_UTC))
+
+
+def record_event(tenant_id: str, event: dict):
+    """Apply an event we just inserted/updated so the mirror doesn't wait for the next sync."""
+    mirror = _get_mirror(tenant_id, create=False)
+    if mirror is not None and event:
+        mirror.apply(event)
+        _bump("local_updates")
+
+
+def forget_event(tenant_id: str, event_id: str):
+    """Remove an event we just deleted."""
+    mirror = _get_mirror(tenant_id, create=False)
+    if mirror is not None and event_id:
+        mirror.forget(event_id)
+        _bump("local_updates")
+
+
+def invalidate_mirror(tenant_id: Optional[str] = None):
+    with _mirrors_lock:
+        if tenant_id is None:
+            _mirrors.clear()
+        else:
+            _mirrors.pop(str(tenant_id), None)
+
+
+def get_mirror_stats() -> dict:
+    with _mirrors_lock:
+        return {**_stats, "tracked_tenants": len(_mirrors)}
+
+
+def _on_tenant_config_invalidated(tenant_id: Optional[str], kind: Optional[str]):
+    if kind in (None, "calendar_token"):
+        invalidate_mirror(tenant_id)
+
+
+try:
+    from database.tenant_cache import register_invalidation_hook
+    register_invalidation_hook(_on_tenant_config_invalidated)
+except ImportError:
+    pass
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Background refresh thread
+# ─────────────────────────────────────────────────────────────────────────────
+
+_refresh_thread: Optional[threading.Thread] = None
+_refresh_stop = threading.Event()
+
+
+def _refresh_loop():
+    while not _refresh_stop.wait(config.CALENDAR_MIRROR_REFRESH_S):
+        now = time.monotonic()
+        with _mirrors_lock:
+            idle = [t for t, m in _mirrors.items() if now - m.last_used > config.CALENDAR_MIRROR_IDLE_EVICT_S]
+            for t in idle:
+                del _mirrors[t]
+            mirrors = list(_mirrors.values())
+        prune_before = datetime.datetime.now(_UTC) - datetime.timedelta(hours=config.CALENDAR_MIRROR_LOOKBACK_HOURS)
+        for mirror in mirrors:
+            if _refresh_stop.is_set():
+                return
+            try:
+                if mirror.window_short():
+                    _bump("window_resyncs")
+                    mirror.sync(full=True)
+                else:
+                    mirror.sync()
+                mirror.prune(prune_before)
+            except Exception as e:
+                _bump("sync_errors")
+                print(f"[CAL_MIRROR] Refresh failed for tenant={mirror.tenant_id}: {e}")
+
+
+def start_mirror_refresher():
+    """Start the background sync thread (called from FastAPI lifespan)."""
+    global _refresh_thread
+    if not config.CALENDAR_MIRROR_ENABLED:
+        return
+    if _refresh_thread is not None and _refresh_thread.is_alive():
+        return
+    _refresh_stop.clear()
+    _refresh_thread = threading.Thread(target=_refresh_loop, name="calendar-mirror-refresh", daemon=True)
+    _refresh_thread.start()
+
+
+def stop_mirror_refresher():
+    global _refresh_thread
+    _refresh_stop.set()
+    if _refresh_thread is not None:
+        _refresh_thread.join(timeout=5)
+        _refresh_thread = None
@@ -4,8 +4,21 @@ services/calendar_provider.py
 Per-tenant Google Calendar client factory for SamaySetu AI.
 
 Replaces the old global service_account.json approach.
-Every call to get_calendar_service() loads credentials from the DB
-for the requesting tenant and builds an isolated Google API client.
+get_calendar_service() loads credentials for the requesting tenant and returns
+an isolated Google API client.
+
+CLIENT CACHE:
+  Clients are cached per tenant for CALENDAR_CLIENT_TTL_S. Within that window:
+  - the service-account JSON is parsed and Credentials built only once, so the
+    OAuth access token is reused until CALENDAR_TOKEN_REFRESH_MARGIN_S before it
+    expires (then refreshed once, under a lock, not by every tool thread);
+  - the Calendar v3 discovery document is the static copy bundled with
+    google-api-python-client, so building a Resource never hits the network;
+  - each tool thread gets its own Resource/Http (httplib2 is not thread-safe),
+    all sharing the tenant's Credentials.
+  The stored token is re-read through database/tenant_cache.py on every call
+  and fingerprinted, so a new service account (/admin/calendar/connect, or a
+  NOTIFY from another worker) evicts the cached client immediately.
 
 Usage:
     from services.calendar_provider import get_calendar_service
@@ -14,14 +27,26 @@ Usage:
     service.events().insert(calendarId=calendar_id, body=event).execute()
 """
 
+import datetime
+import hashlib
 import json
-from functools import lru_cache
+import threading
+import time
+from typing import Dict, Optional
+
+import google_auth_httplib2
+import httplib2
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request as GoogleAuthRequest
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+
+import config
 
 # ── DB import (degrades gracefully if psycopg2 not installed) ─────────────────
 try:
-    from database.crud import get_calendar_token
+    from database.tenant_cache import get_calendar_token   # cached, NOTIFY-invalidated
+    import database.crud  # noqa: F401 — fail here if psycopg2 is missing
     _DB_AVAILABLE = True
 except ImportError:
     _DB_AVAILABLE = False
@@ -40,10 +65,136 @@ class InvalidCalendarCredentialsError(Exception):
     pass
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-tenant client cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+_discovery_doc: Optional[str] = None
+
+
+def _static_discovery_doc() -> Optional[str]:
+    """Calendar v3 discovery JSON bundled with google-api-python-client (read once)."""
+    global _discovery_doc
+    if _discovery_doc is None:
+        try:
+            from googleapiclient.discovery_cache import get_static_doc
+            _discovery_doc = get_static_doc("calendar", "v3")
+        except Exception:
+            _discovery_doc = None
+    return _discovery_doc
+
+
+class _TenantCalendarClient:
+    """Credentials shared by all threads + one Resource per thread."""
+
+    def __init__(self, tenant_id: str, calendar_id: str, fingerprint: str, creds):
+        self.tenant_id = tenant_id
+        self.calendar_id = calendar_id
+        self.fingerprint = fingerprint
+        self.creds = creds
+        self.created_at = time.monotonic()
+        self._refresh_lock = threading.Lock()
+        self._local = threading.local()
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.created_at > config.CALENDAR_CLIENT_TTL_S
+
+    def ensure_token(self):
+        """Refresh the access token only when missing or close to expiry."""
+        if self._token_fresh():
+            return
+        with self._refresh_lock:
+            if self._token_fresh():   # another thread refreshed while we waited
+                return
+            self.creds.refresh(GoogleAuthRequest())
+            _stats["token_refreshes"] += 1
+
+    def _token_fresh(self) -> bool:
+        if not self.creds.token or self.creds.expiry is None:
+            return False
+        # google-auth stores expiry as naive UTC
+        remaining = (self.creds.expiry - datetime.datetime.utcnow()).total_seconds()
+        return remaining > config.CALENDAR_TOKEN_REFRESH_MARGIN_S
+
+    def service(self):
+        svc = getattr(self._local, "service", None)
+        if svc is None:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.creds, http=httplib2.Http(timeout=config.CALENDAR_HTTP_TIMEOUT_S)
+            )
+            doc = _static_discovery_doc()
+            if doc is not None:
+                svc = build_from_document(doc, http=http)
+            else:
+                svc = build('calendar', 'v3', http=http, static_discovery=True, cache_discovery=False)
+            self._local.service = svc
+            _stats["services_built"] += 1
+        return svc
+
+
+_clients: Dict[str, _TenantCalendarClient] = {}
+_clients_lock = threading.Lock()
+_stats = {
+    "hits":            0,
+    "builds":          0,
+    "evictions":       0,
+    "services_built":  0,
+    "token_refreshes": 0,
+}
+
+
+def invalidate_calendar_client(tenant_id: Optional[str] = None):
+    """Drop the cached client for a tenant (None = all tenants)."""
+    with _clients_lock:
+        if tenant_id is None:
+            _stats["evictions"] += len(_clients)
+            _clients.clear()
+        elif _clients.pop(str(tenant_id), None) is not None:
+            _stats["evictions"] += 1
+
+
+def get_calendar_client_stats() -> dict:
+    with _clients_lock:
+        return {**_stats, "cached_tenants": len(_clients)}
+
+
+def _on_tenant_config_invalidated(tenant_id: Optional[str], kind: Optional[str]):
+    if kind in (None, "calendar_token"):
+        invalidate_calendar_client(tenant_id)
+
+
+if _DB_AVAILABLE:
+    from database.tenant_cache import register_invalidation_hook
+    register_invalidation_hook(_on_tenant_config_invalidated)
+
+
+def _fingerprint(calendar_id: str, token_json_str: str) -> str:
+    return hashlib.sha256(f"{calendar_id}\x00{token_json_str}".encode("utf-8")).hexdigest()
+
+
+def _build_client(tenant_id: str, calendar_id: str, token_json_str: str,
+                  fingerprint: str) -> _TenantCalendarClient:
+    try:
+        creds_info = json.loads(token_json_str)
+    except (json.JSONDecodeError, TypeError) as e:
+        raise InvalidCalendarCredentialsError(
+            f"Stored service account JSON is malformed for tenant {tenant_id}: {e}"
+        )
+    try:
+        creds = service_account.Credentials.from_service_account_info(
+            creds_info, scopes=SCOPES
+        )
+    except Exception as e:
+        raise InvalidCalendarCredentialsError(
+            f"Could not build Google Calendar client for tenant {tenant_id}: {e}"
+        )
+    return _TenantCalendarClient(tenant_id, calendar_id, fingerprint, creds)
+
+
 def get_calendar_service(tenant_id: str):
     """
-    Load this tenant's Google Calendar credentials from the DB and return
-    an authenticated (service, calendar_id) pair.
+    Return an authenticated (service, calendar_id) pair for this tenant,
+    reusing the cached client when the stored credentials are unchanged.
 
     Args:
         tenant_id: UUID string of the requesting tenant.
@@ -51,10 +202,12 @@ def get_calendar_service(tenant_id: str):
     Returns:
         (googleapiclient.discovery.Resource, str)
         A tuple of the Calendar API service object and the calendar_id string.
+        The Resource belongs to the calling thread — don't share it across threads.
 
     Raises:
         CalendarNotConnectedError  — no credentials row found for this tenant.
         InvalidCalendarCredentialsError — credentials are present but invalid.
+        google.auth.exceptions.TransportError — token refresh could not reach Google.
     """
     if not _DB_AVAILABLE:
         raise CalendarNotConnectedError(
@@ -63,6 +216,7 @@ def get_calendar_service(tenant_id: str):
 
     token_row = get_calendar_token(tenant_id)
     if not token_row:
+        invalidate_calendar_client(tenant_id)
         raise CalendarNotConnectedError(
             f"No calendar connected for tenant {tenant_id}. "
             "Please connect a Google Calendar from the admin panel."
@@ -76,24 +230,32 @@ def get_calendar_service(tenant_id: str):
             f"Incomplete calendar record for tenant {tenant_id}."
         )
 
-    try:
-        creds_info = json.loads(token_json_str)
-    except (json.JSONDecodeError, TypeError) as e:
-        raise InvalidCalendarCredentialsError(
-            f"Stored service account JSON is malformed for tenant {tenant_id}: {e}"
-        )
+    key = str(tenant_id)
+    fingerprint = _fingerprint(calendar_id, token_json_str)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is not None and (client.fingerprint != fingerprint or client.expired()):
+            del _clients[key]
+            _stats["evictions"] += 1
+            client = None
+        if client is None:
+            client = _build_client(key, calendar_id, token_json_str, fingerprint)
+            _clients[key] = client
+            _stats["builds"] += 1
+        else:
+            _stats["hits"] += 1
 
+    # Only a refresh Google rejected means bad credentials. Transport errors and
+    # 5xx propagate as-is and the cached client is kept for the next call.
     try:
-        creds = service_account.Credentials.from_service_account_info(
-            creds_info, scopes=SCOPES
-        )
-        service = build('calendar', 'v3', credentials=creds)
-    except Exception as e:
+        client.ensure_token()
+    except RefreshError as e:
+        invalidate_calendar_client(key)
         raise InvalidCalendarCredentialsError(
-            f"Could not build Google Calendar client for tenant {tenant_id}: {e}"
+            f"Google rejected the calendar credentials for tenant {tenant_id}: {e}"
         )
 
-    return service, calendar_id
+    return client.service(), client.calendar_id
 
 
 def verify_calendar_connection(tenant_id: str) -> dict:
@@ -0,0 +1,346 @@
+"""
+services/llm_router.py
+----------------------
+Latency-aware routing and hedging of main-LLM calls across providers
+(Groq / NVIDIA NIM, whichever have credentials).
+
+brain.get_llm_with_tools binds the tenant's tools on every provider and gets a
+RoutedLLM back; safe_llm_call / safe_llm_stream call its ainvoke() / astream()
+exactly as they called the LangChain model before.
+
+  routing  — per provider an EWMA of latency and of the error rate; the
+             configured primary is tried first unless another provider scores
+             better by LLM_ROUTE_SWITCH_RATIO (score = latency × (1 + 4·errors))
+  hedging  — if the first provider has not answered (ainvoke) or produced its
+             first chunk (astream) within its recent p95, clamped to
+             [LLM_HEDGE_MIN_DELAY_MS, LLM_HEDGE_MAX_DELAY_MS], the same request
+             goes to the next provider; the first answer wins and the other
+             request is cancelled. A retryable failure fails over immediately.
+  breaker  — LLM_BREAKER_429_THRESHOLD consecutive rate-limit errors open a
+             provider's circuit for LLM_BREAKER_OPEN_S; after that it is
+             half-open: a success closes it, another 429 re-opens it
+
+Errors the caller handles itself (Groq tool_use_failed BadRequestError,
+ValueError) are never hedged or failed over. tenacity still retries the
+whole routed call on retryable errors.
+
+Secondary providers are given as factories and built in a worker thread on
+the first routed call (ChatNVIDIA lists models over the network when
+constructed), not at import. A failed build is retried after
+LLM_PROVIDER_RETRY_S; until then calls simply go to the providers that are
+ready.
+"""
+
+import asyncio
+import bisect
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+import config
+
+try:
+    from groq import BadRequestError
+except ImportError:
+    BadRequestError = None
+
+HISTOGRAM_BUCKETS_MS = (100, 250, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000)
+_KINDS = ("invoke", "ttft")     # full ainvoke latency / astream time to first chunk
+
+
+def is_rate_limit(exc: BaseException) -> bool:
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if status == 429 or type(exc).__name__ == "RateLimitError":
+        return True
+    text = str(exc).lower()
+    return "429" in text or "rate_limit" in text or "rate limit" in text
+
+
+class ProviderStats:
+    """Latency / error tracking and circuit breaker for one provider+model."""
+
+    def __init__(self, name: str, model: str):
+        self.name = name
+        self.model = model
+        self.ewma_ms = {k: None for k in _KINDS}
+        self.ewma_error = 0.0
+        self._recent = {k: deque(maxlen=config.LLM_LATENCY_WINDOW) for k in _KINDS}
+        self._hist = {k: [0] * (len(HISTOGRAM_BUCKETS_MS) + 1) for k in _KINDS}
+        self.counts = {"requests": 0, "errors": 0, "rate_limited": 0, "cancelled": 0,
+                       "wins": 0, "hedges_sent": 0, "hedges_won": 0}
+        self.consecutive_429 = 0
+        self.open_until = 0.0
+
+    # ── observations ─────────────────────────────────────────────────────────
+    def _ewma(self, kind: str, ms: float):
+        a = config.LLM_EWMA_ALPHA
+        prev = self.ewma_ms[kind]
+        self.ewma_ms[kind] = ms if prev is None else (1 - a) * prev + a * ms
+
+    def record_success(self, kind: str, ms: float):
+        self._ewma(kind, ms)
+        self._recent[kind].append(ms)
+        self._hist[kind][bisect.bisect_left(HISTOGRAM_BUCKETS_MS, ms)] += 1
+        self.ewma_error *= (1 - config.LLM_EWMA_ALPHA)
+        if self.open_until:
+            self.open_until = 0.0
+            print(f"[LLM_ROUTER] {self.name}: circuit closed")
+        self.consecutive_429 = 0
+
+    def record_error(self, exc: BaseException):
+        a = config.LLM_EWMA_ALPHA
+        self.ewma_error = (1 - a) * self.ewma_error + a
+        self.counts["errors"] += 1
+        if is_rate_limit(exc):
+            self.counts["rate_limited"] += 1
+            self.consecutive_429 += 1
+            # Half-open (open period over, no success since): a single 429 re-opens it.
+            if self.consecutive_429 >= config.LLM_BREAKER_429_THRESHOLD:
+                self.open_until = time.monotonic() + config.LLM_BREAKER_OPEN_S
+                print(f"[LLM_ROUTER] {self.name}: circuit OPEN for {config.LLM_BREAKER_OPEN_S:.0f}s "
+                      f"after {self.consecutive_429} rate-limit errors")
+        else:
+            self.consecutive_429 = 0
+
+    def record_cancelled(self, kind: str, elapsed_ms: float):
+        # Lost a hedge race: only a lower bound on its latency, so it feeds the
+        # EWMA (routing learns it was slow) but not the histogram / p95.
+        self.counts["cancelled"] += 1
+        self._ewma(kind, elapsed_ms)
+
+    # ── decisions ────────────────────────────────────────────────────────────
+    def available(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def circuit(self) -> str:
+        if not self.open_until:
+            return "closed"
+        return "open" if time.monotonic() < self.open_until else "half_open"
+
+    def score(self, kind: str) -> Optional[float]:
+        ms = self.ewma_ms[kind]
+        return None if ms is None else ms * (1 + 4 * self.ewma_error)
+
+    def p95(self, kind: str) -> Optional[float]:
+        samples = self._recent[kind]
+        if len(samples) < config.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def hedge_delay_s(self, kind: str) -> float:
+        p95 = self.p95(kind)
+        ms = config.LLM_HEDGE_DEFAULT_DELAY_MS if p95 is None else p95
+        ms = min(max(ms, config.LLM_HEDGE_MIN_DELAY_MS), config.LLM_HEDGE_MAX_DELAY_MS)
+        return ms / 1000.0
+
+    def snapshot(self) -> dict:
+        out = {"model": self.model, **self.counts,
+               "ewma_error_rate": round(self.ewma_error, 4),
+               "circuit": self.circuit()}
+        for kind in _KINDS:
+            ewma, p95 = self.ewma_ms[kind], self.p95(kind)
+            labels = [f"le_{b}ms" for b in HISTOGRAM_BUCKETS_MS] + ["gt_10000ms"]
+            out[kind] = {
+                "ewma_ms": round(ewma, 1) if ewma is not None else None,
+                "p95_ms": round(p95, 1) if p95 is not None else None,
+                "histogram": dict(zip(labels, self._hist[kind])),
+            }
+        return out
+
+
+class LLMRouter:
+    """Orders providers for each call; shared by every RoutedLLM."""
+
+    def __init__(self, providers: Sequence[Tuple[str, str, object]],
+                 factories: Sequence[Tuple[str, str, Callable[[], object]]] = ()):
+        # providers: [(name, model, chat_model)], primary first, ready now
+        # factories: [(name, model, build)], built lazily in a worker thread
+        self.models: Dict[str, object] = {name: llm for name, _, llm in providers}
+        self._factories = {name: build for name, _, build in factories}
+        self._build_task: Dict[str, asyncio.Task] = {}
+        self._retry_at: Dict[str, float] = {}
+        self.build_errors: Dict[str, str] = {}
+        self.names = [name for name, _, _ in providers] + [name for name, _, _ in factories]
+        self.stats = {name: ProviderStats(name, model) for name, model, _ in [*providers, *factories]}
+        print(f"[LLM_ROUTER] providers={self.names} "
+              f"(lazy: {list(self._factories) or 'none'}) hedging={'on' if config.LLM_HEDGE_ENABLED else 'off'}")
+
+    @property
+    def hedging(self) -> bool:
+        return config.LLM_HEDGE_ENABLED and len(self.models) > 1
+
+    def _ensure_built(self):
+        """Start building any provider that is still missing (needs a running loop)."""
+        for name, build in self._factories.items():
+            if name in self.models or name in self._build_task:
+                continue
+            if time.monotonic() < self._retry_at.get(name, 0.0):
+                continue
+            task = asyncio.get_running_loop().create_task(asyncio.to_thread(build))
+            task.add_done_callback(lambda t, name=name: self._on_built(name, t))
+            self._build_task[name] = task
+
+    def _on_built(self, name: str, task: asyncio.Task):
+        self._build_task.pop(name, None)
+        exc = None if task.cancelled() else task.exception()
+        if task.cancelled() or exc is not None:
+            self._retry_at[name] = time.monotonic() + config.LLM_PROVIDER_RETRY_S
+            self.build_errors[name] = str(exc or "cancelled")[:200]
+            print(f"[LLM_ROUTER] {name} unavailable, retrying in {config.LLM_PROVIDER_RETRY_S:.0f}s: {exc}")
+            return
+        self.models[name] = task.result()
+        self.build_errors.pop(name, None)
+        print(f"[LLM_ROUTER] {name} ready — hedging {'on' if self.hedging else 'off'}")
+
+    def order(self, kind: str) -> List[str]:
+        self._ensure_built()
+        names = [n for n in self.names if n in self.models and self.stats[n].available()]
+        if not names:
+            return [self.names[0]]         # everything open: still try the primary
+        primary = names[0]
+        p_score = self.stats[primary].score(kind)
+        for other in names[1:]:
+            o_score = self.stats[other].score(kind)
+            if p_score is not None and o_score is not None and o_score < p_score * config.LLM_ROUTE_SWITCH_RATIO:
+                return [other] + [n for n in names if n != other]
+        return names
+
+    def bind(self, tools: Optional[list]) -> "RoutedLLM":
+        return RoutedLLM(self, tools)
+
+    def get_stats(self) -> dict:
+        return {
+            "providers": self.names,
+            "ready": [n for n in self.names if n in self.models],
+            "hedging": self.hedging,
+            "build_errors": dict(self.build_errors),
+            "by_provider": {name: st.snapshot() for name, st in self.stats.items()},
+        }
+
+
+class RoutedLLM:
+    """ainvoke / astream with the same signatures as a bound LangChain chat model."""
+
+    def __init__(self, router: LLMRouter, tools: Optional[list]):
+        self._router = router
+        self._tools = tools
+        self._bound_models: Dict[str, object] = {}
+
+    def _bound(self, name: str):
+        # Tools are bound per provider on first use, so a provider that becomes
+        # ready later is picked up by LLMs that were cached before it was.
+        bound = self._bound_models.get(name)
+        if bound is None:
+            llm = self._router.models[name]
+            bound = llm.bind_tools(self._tools) if self._tools else llm
+            self._bound_models[name] = bound
+        return bound
+
+    @staticmethod
+    def _handled_by_caller(exc: BaseException) -> bool:
+        return isinstance(exc, ValueError) or (
+            BadRequestError is not None and isinstance(exc, BadRequestError)
+        )
+
+    async def _race(self, kind: str, start):
+        """
+        Run start(name) on the best provider, hedge / fail over to the next.
+        start(name) returns an awaitable; yields (name, result) of the winner.
+        """
+        router = self._router
+        order = router.order(kind)
+        if not router.hedging:
+            order = order[:1]
+        pending = {}                      # task → (name, t0, hedge)
+        next_idx = 0
+        last_exc: Optional[BaseException] = None
+
+        def launch(hedge: bool):
+            nonlocal next_idx
+            name = order[next_idx]
+            next_idx += 1
+            st = router.stats[name]
+            st.counts["requests"] += 1
+            if hedge:
+                st.counts["hedges_sent"] += 1
+            pending[asyncio.ensure_future(start(name))] = (name, time.monotonic(), hedge)
+
+        launch(False)
+        try:
+            while pending:
+                timeout = None
+                if next_idx < len(order):
+                    first_name, first_t0, _ = next(iter(pending.values()))
+                    timeout = max(0.0, first_t0 + router.stats[first_name].hedge_delay_s(kind) - time.monotonic())
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    print(f"[LLM_ROUTER] {kind}: no answer from {first_name} within hedge delay "
+                          f"→ hedging to {order[next_idx]}")
+                    launch(True)
+                    continue
+                for task in done:
+                    name, t0, hedge = pending.pop(task)
+                    st = router.stats[name]
+                    exc = task.exception()
+                    if exc is None:
+                        st.record_success(kind, (time.monotonic() - t0) * 1000.0)
+                        st.counts["wins"] += 1
+                        if hedge:
+                            st.counts["hedges_won"] += 1
+                        return name, task.result()
+                    st.record_error(exc)
+                    if self._handled_by_caller(exc):
+                        raise exc
+                    last_exc = exc
+                    print(f"[LLM_ROUTER] {name} failed ({type(exc).__name__}: {str(exc)[:120]})")
+                    if not pending and next_idx < len(order):
+                        launch(True)       # fail over right away instead of waiting for backoff
+            raise last_exc
+        finally:
+            # Losers are cancelled without waiting for them: the winner's answer is not delayed.
+            for task, (name, t0, _) in pending.items():
+                task.cancel()
+                task.add_done_callback(_consume_result)
+                router.stats[name].record_cancelled(kind, (time.monotonic() - t0) * 1000.0)
+
+    async def ainvoke(self, messages, **kwargs):
+        _, result = await self._race("invoke", lambda name: self._bound(name).ainvoke(messages, **kwargs))
+        return result
+
+    async def astream(self, messages, **kwargs) -> AsyncIterator:
+        streams = {}
+
+        async def first_chunk(name):
+            agen = self._bound(name).astream(messages, **kwargs)
+            streams[name] = agen
+            return await agen.__anext__()
+
+        try:
+            winner, chunk = await self._race("ttft", first_chunk)
+        except BaseException:
+            for agen in streams.values():
+                await _aclose_quietly(agen)
+            raise
+        for name, agen in streams.items():
+            if name != winner:
+                await _aclose_quietly(agen)
+        agen = streams[winner]
+        try:
+            yield chunk
+            async for chunk in agen:
+                yield chunk
+        finally:
+            await _aclose_quietly(agen)
+
+
+def _consume_result(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()        # retrieved, so asyncio does not log it as never retrieved
+
+
+async def _aclose_quietly(agen):
+    try:
+        await agen.aclose()
+    except BaseException:
+        pass
@@ -0,0 +1,222 @@
+"""
+services/session_registry.py
+----------------------------
+Bounded registry for per-call session state (main.chat_sessions).
+
+chat_sessions used to be a plain dict: /ws/voice inserted a session and nothing
+ever removed it, so every call's LangChain history and memory stayed resident
+for the life of the worker. SessionRegistry keeps the dict interface that
+brain.py and the tools rely on (get / [] / in / setdefault ...) and adds:
+
+  pin / discard   — /ws/voice pins its session while the socket is open and
+                    discards it when the socket closes
+  idle TTL        — unpinned sessions not touched for SESSION_IDLE_TTL_S are
+                    evicted by sweep()
+  caps            — SESSION_MAX_COUNT (on insert) and SESSION_MAX_TOTAL_MB
+                    (on sweep) evict least recently used unpinned sessions
+  tenant index    — {tenant_id: {session_id}} so a tenant's config invalidation
+                    touches only that tenant's sessions; keep it current with
+                    set_tenant() rather than assigning session["tenant_id"]
+
+Session sizes are approximate (recursive sys.getsizeof, message contents by
+length) and only measured during sweep() / get_stats().
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Set
+
+import config
+
+
+def approx_size(obj, _depth: int = 0) -> int:
+    """Rough resident size in bytes of a session value (dicts, lists, strings, messages)."""
+    if _depth > 8:
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return size + sum(approx_size(v, _depth + 1) for v in obj)
+    content = getattr(obj, "content", None)     # LangChain messages
+    if content is not None:
+        size += approx_size(content, _depth + 1)
+        size += approx_size(getattr(obj, "tool_calls", None) or [], _depth + 1)
+    return size
+
+
+class SessionRegistry(MutableMapping):
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data: "OrderedDict[str, dict]" = OrderedDict()    # LRU order, oldest first
+        self._last_seen: Dict[str, float] = {}
+        self._tenants: Dict[str, str] = {}                      # session → tenant
+        self._by_tenant: Dict[str, Set[str]] = {}               # tenant → sessions
+        self._pinned: Set[str] = set()
+        self._stats = {
+            "created":        0,
+            "closed":         0,   # discarded when their socket closed
+            "evicted_idle":   0,
+            "evicted_count":  0,
+            "evicted_memory": 0,
+        }
+
+    # ── mapping interface ─────────────────────────────────────────────────────
+
+    def __getitem__(self, session_id: str) -> dict:
+        with self._lock:
+            value = self._data[session_id]
+            self._data.move_to_end(session_id)
+            self._last_seen[session_id] = time.monotonic()
+            return value
+
+    def __setitem__(self, session_id: str, value: dict):
+        with self._lock:
+            if session_id not in self._data:
+                self._stats["created"] += 1
+            self._data[session_id] = value
+            self._data.move_to_end(session_id)
+            self._last_seen[session_id] = time.monotonic()
+            self._index(session_id, value.get("tenant_id") if isinstance(value, dict) else None)
+            self._enforce_count()
+
+    def __delitem__(self, session_id: str):
+        with self._lock:
+            del self._data[session_id]
+            self._forget(session_id)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, session_id) -> bool:
+        return session_id in self._data
+
+    def values(self) -> List[dict]:
+        """Snapshot, without refreshing anyone's idle timer."""
+        with self._lock:
+            return list(self._data.values())
+
+    def items(self) -> List[tuple]:
+        with self._lock:
+            return list(self._data.items())
+
+    # ── lifecycle ─────────────────────────────────────────────────────────────
+
+    def pin(self, session_id: str):
+        """Exempt from idle / cap eviction while its socket is open."""
+        with self._lock:
+            self._pinned.add(session_id)
+
+    def discard(self, session_id: str):
+        """Drop a session whose socket has closed."""
+        with self._lock:
+            if self._data.pop(session_id, None) is not None:
+                self._stats["closed"] += 1
+            self._forget(session_id)
+
+    def set_tenant(self, session_id: str, tenant_id: Optional[str]):
+        with self._lock:
+            sess = self._data.get(session_id)
+            if sess is None:
+                return
+            sess["tenant_id"] = tenant_id
+            self._index(session_id, tenant_id)
+
+    def sessions_for_tenant(self, tenant_id: Optional[str]) -> List[dict]:
+        """Sessions of one tenant; every session when tenant_id is None."""
+        with self._lock:
+            if tenant_id is None:
+                return list(self._data.values())
+            return [self._data[s] for s in self._by_tenant.get(tenant_id, ()) if s in self._data]
+
+    # ── eviction ──────────────────────────────────────────────────────────────
+
+    def sweep(self) -> int:
+        """Evict idle sessions, then LRU sessions over the memory cap. Returns the number evicted."""
+        evicted = 0
+        now = time.monotonic()
+        with self._lock:
+            for sid in list(self._data):
+                if sid in self._pinned:
+                    continue
+                if now - self._last_seen.get(sid, now) >= config.SESSION_IDLE_TTL_S:
+                    self._evict(sid, "evicted_idle")
+                    evicted += 1
+            limit = int(config.SESSION_MAX_TOTAL_MB * 1024 * 1024)
+            if limit > 0:
+                sizes = {sid: approx_size(v) for sid, v in self._data.items()}
+                total = sum(sizes.values())
+                for sid in list(self._data):           # least recently used first
+                    if total <= limit:
+                        break
+                    if sid in self._pinned:
+                        continue
+                    total -= sizes[sid]
+                    self._evict(sid, "evicted_memory")
+                    evicted += 1
+        if evicted:
+            print(f"[SESSIONS] Evicted {evicted} session(s) | live={len(self._data)}")
+        return evicted
+
+    def _enforce_count(self):
+        over = len(self._data) - config.SESSION_MAX_COUNT
+        if over <= 0:
+            return
+        for sid in list(self._data):
+            if over <= 0:
+                break
+            if sid in self._pinned:
+                continue
+            self._evict(sid, "evicted_count")
+            over -= 1
+
+    def _evict(self, session_id: str, reason: str):
+        self._data.pop(session_id, None)
+        self._forget(session_id)
+        self._stats[reason] += 1
+
+    def _index(self, session_id: str, tenant_id: Optional[str]):
+        old = self._tenants.get(session_id)
+        if old == tenant_id:
+            return
+        if old is not None:
+            peers = self._by_tenant.get(old)
+            if peers is not None:
+                peers.discard(session_id)
+                if not peers:
+                    del self._by_tenant[old]
+        if tenant_id is None:
+            self._tenants.pop(session_id, None)
+        else:
+            self._tenants[session_id] = tenant_id
+            self._by_tenant.setdefault(tenant_id, set()).add(session_id)
+
+    def _forget(self, session_id: str):
+        self._index(session_id, None)
+        self._last_seen.pop(session_id, None)
+        self._pinned.discard(session_id)
+
+    # ── stats ─────────────────────────────────────────────────────────────────
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            sizes = [approx_size(v) for v in self._data.values()]
+            return {
+                **self._stats,
+                "live":    len(self._data),
+                "pinned":  len(self._pinned),
+                "tenants": len(self._by_tenant),
+                "approx_bytes_total": sum(sizes),
+                "approx_bytes_avg":   round(sum(sizes) / len(sizes)) if sizes else 0,
+                "approx_bytes_max":   max(sizes, default=0),
+            }
@@ -0,0 +1,170 @@
+"""
+services/session_store.py
+-------------------------
+Pluggable key/value store for state that must be shared between uvicorn
+workers: admin tokens and the durable part of voice sessions.
+
+Backends (SESSION_STORE env var, default "memory"):
+
+  memory — per-process dict with expiry; correct for a single worker only
+  redis  — any Redis-compatible server at REDIS_URL (redis, valkey, dragonfly,
+           a local redis-server in development); values are JSON with a TTL,
+           so tokens and sessions expire on their own
+
+Keys are namespaced:  <SESSION_STORE_PREFIX>:<namespace>:<key>
+
+Only JSON-serialisable state goes here. Socket-bound objects (asyncio.Event,
+locks, the LangChain history) stay in the worker's local chat_sessions
+registry; see VOICE_DURABLE_FIELDS for what a voice session persists.
+
+Voice state is keyed by an unguessable resume token (new_resume_token), not
+by the session id that shows up in logs. take_voice_state() hands it to a new
+connection only once, and only for the same tenant and caller.
+"""
+
+import json
+import os
+import secrets
+import time
+from typing import Dict, Optional, Tuple
+
+import config
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+ADMIN      = "admin"
+VOICE      = "voice"
+
+# chat_sessions fields that survive a reconnect to another worker
+VOICE_DURABLE_FIELDS = (
+    "phone_number", "tenant_id", "memory", "confirmation_state", "language_prompt_asked",
+)
+
+
+class MemorySessionStore:
+    """Process-local backend (the previous behaviour)."""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._data: Dict[Tuple[str, str], Tuple[dict, Optional[float]]] = {}
+
+    async def get(self, namespace: str, key: str) -> Optional[dict]:
+        item = self._data.get((namespace, key))
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._data.pop((namespace, key), None)
+            return None
+        return value
+
+    async def set(self, namespace: str, key: str, value: dict, ttl_s: Optional[float] = None):
+        expires_at = time.monotonic() + ttl_s if ttl_s else None
+        # JSON round trip: same copy / serialisation semantics as the Redis backend.
+        value = json.loads(json.dumps(value, default=str, ensure_ascii=False))
+        self._data[(namespace, key)] = (value, expires_at)
+        if len(self._data) % 256 == 0:
+            self._purge()
+
+    async def delete(self, namespace: str, key: str):
+        self._data.pop((namespace, key), None)
+
+    async def close(self):
+        pass
+
+    def _purge(self):
+        now = time.monotonic()
+        for k, (_, expires_at) in list(self._data.items()):
+            if expires_at is not None and now >= expires_at:
+                self._data.pop(k, None)
+
+    async def stats(self) -> dict:
+        self._purge()
+        return {"backend": self.backend, "keys": len(self._data)}
+
+
+class RedisSessionStore:
+    """Shared backend: JSON values in a Redis-compatible server."""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str):
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._prefix = prefix
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self._prefix}:{namespace}:{key}"
+
+    async def get(self, namespace: str, key: str) -> Optional[dict]:
+        raw = await self._redis.get(self._key(namespace, key))
+        return json.loads(raw) if raw else None
+
+    async def set(self, namespace: str, key: str, value: dict, ttl_s: Optional[float] = None):
+        raw = json.dumps(value, default=str, ensure_ascii=False)
+        await self._redis.set(self._key(namespace, key), raw, ex=int(ttl_s) if ttl_s else None)
+
+    async def delete(self, namespace: str, key: str):
+        await self._redis.delete(self._key(namespace, key))
+
+    async def close(self):
+        await self._redis.aclose()
+
+    async def stats(self) -> dict:
+        try:
+            keys = 0
+            async for _ in self._redis.scan_iter(match=f"{self._prefix}:*", count=500):
+                keys += 1
+            return {"backend": self.backend, "keys": keys}
+        except Exception as e:
+            return {"backend": self.backend, "error": str(e)}
+
+
+def create_session_store():
+    backend = os.getenv("SESSION_STORE", config.SESSION_STORE_BACKEND).strip().lower()
+    if backend == "redis":
+        if not REDIS_AVAILABLE:
+            print("[SESSION_STORE] SESSION_STORE=redis but the 'redis' package is not installed "
+                  "— falling back to in-memory (single worker only)")
+        else:
+            url = os.getenv("REDIS_URL", config.REDIS_URL)
+            print(f"[SESSION_STORE] Using Redis at {url}")
+            return RedisSessionStore(url, config.SESSION_STORE_PREFIX)
+    elif backend != "memory":
+        print(f"[SESSION_STORE] Unknown backend '{backend}' — using in-memory")
+    return MemorySessionStore()
+
+
+def durable_voice_state(session: dict) -> dict:
+    return {k: session.get(k) for k in VOICE_DURABLE_FIELDS if k in session}
+
+
+def new_resume_token() -> str:
+    return secrets.token_urlsafe(24)
+
+
+async def take_voice_state(store, resume_token: str, tenant_id: Optional[str],
+                           phone_number: Optional[str]) -> Optional[dict]:
+    """
+    Consume the state a previous connection saved under resume_token. Returns
+    the fields to carry over, or None when there is nothing to resume or it
+    belongs to another tenant / caller. Identity (tenant_id, phone_number) is
+    never taken from the stored state; the new connection's own init decides it.
+    """
+    if not resume_token:
+        return None
+    state = await store.get(VOICE, resume_token)
+    if not state:
+        return None
+    await store.delete(VOICE, resume_token)          # single use
+    if str(state.get("tenant_id") or "") != str(tenant_id or ""):
+        return None
+    stored_phone = state.get("phone_number")
+    if stored_phone and stored_phone != phone_number:
+        return None
+    return {k: v for k, v in state.items() if k not in ("tenant_id", "phone_number")}
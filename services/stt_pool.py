@@ -0,0 +1,196 @@
+"""
+services/stt_pool.py
+--------------------
+Pool of connected, already warmed-up Sarvam STT sockets per language code.
+
+Opening a streaming STT socket and priming it with WARMUP_FRAMES silence
+frames takes several hundred ms, and /ws/voice paid that on every session
+start, language switch and idle reconnect. The pool keeps up to
+STT_POOL_SIZES[lang] idle sockets per language (never more than
+STT_POOL_MAX_TOTAL overall), so a session takes one immediately:
+
+    async with stt_pool.connection(lang) as (sarvam_ws, warmed):
+        if not warmed:
+            ...warm up...
+
+An empty pool falls back to a fresh connect (warmed=False) — the pool only
+ever removes latency, it never blocks a call. Every checkout schedules a
+background refill. Idle sockets get a silence frame every
+STT_POOL_KEEPALIVE_S so the server does not time them out, and are recycled
+after STT_POOL_MAX_IDLE_S. A socket is used by exactly one session and
+closed afterwards; it never goes back into the pool.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import config
+
+ConnectFactory = Callable[[str], object]               # lang → async context manager
+Warmup = Callable[[object, str], Awaitable[bool]]      # (ws, label) → ok
+
+
+class _Idle:
+    __slots__ = ("cm", "ws", "created_at", "last_ping")
+
+    def __init__(self, cm, ws):
+        self.cm = cm
+        self.ws = ws
+        self.created_at = self.last_ping = time.monotonic()
+
+
+class STTConnectionPool:
+
+    def __init__(self, connect: ConnectFactory, warmup: Warmup, silence_frame: str):
+        self._connect = connect
+        self._warmup = warmup
+        self._silence = silence_frame
+        self._idle: Dict[str, List[_Idle]] = {lang: [] for lang in config.STT_POOL_SIZES}
+        self._opening: Dict[str, int] = {lang: 0 for lang in config.STT_POOL_SIZES}
+        self._refill_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "hits":      0,   # checkouts served from the pool
+            "misses":    0,   # fresh connects (pool empty / language not pooled)
+            "opened":    0,   # sockets opened and warmed by the pool
+            "open_failures": 0,
+            "recycled":  0,   # idle sockets closed (age / failed keepalive)
+        }
+
+    # ── lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintain())
+            self._refill_event.set()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for lang, entries in self._idle.items():
+            while entries:
+                await self._discard(entries.pop())
+
+    # ── checkout ──────────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def connection(self, lang: str):
+        """Yields (sarvam_ws, warmed). The socket is closed on exit."""
+        entry = self._take(lang)
+        if entry is not None:
+            self.stats["hits"] += 1
+            cm, ws, warmed = entry.cm, entry.ws, True
+        else:
+            self.stats["misses"] += 1
+            cm = self._connect(lang)
+            ws = await cm.__aenter__()
+            warmed = False
+        self._refill_event.set()
+        try:
+            yield ws, warmed
+        finally:
+            try:
+                await cm.__aexit__(None, None, None)
+            except Exception:
+                pass
+
+    def _take(self, lang: str) -> Optional[_Idle]:
+        entries = self._idle.get(lang)
+        if not entries:
+            return None
+        # Newest first: the freshest socket is the least likely to have been dropped.
+        return entries.pop()
+
+    # ── background maintenance ────────────────────────────────────────────────
+
+    def _total(self) -> int:
+        return sum(len(v) for v in self._idle.values()) + sum(self._opening.values())
+
+    async def _open(self, lang: str):
+        self._opening[lang] += 1
+        cm = None
+        try:
+            cm = self._connect(lang)
+            ws = await cm.__aenter__()
+            if not await self._warmup(ws, f"pool:{lang}"):
+                raise RuntimeError("warm-up failed")
+            self._idle[lang].append(_Idle(cm, ws))
+            self.stats["opened"] += 1
+        except Exception as e:
+            self.stats["open_failures"] += 1
+            print(f"[STT_POOL] Open failed for {lang}: {e}")
+            if cm is not None:
+                await self._discard(_Idle(cm, None))
+            raise
+        finally:
+            self._opening[lang] -= 1
+
+    async def _discard(self, entry: _Idle):
+        try:
+            await entry.cm.__aexit__(None, None, None)
+        except Exception:
+            pass
+
+    async def _keepalive_and_recycle(self):
+        now = time.monotonic()
+        for lang, entries in self._idle.items():
+            for entry in list(entries):
+                if entry not in entries:
+                    continue                        # checked out during an earlier ping
+                if now - entry.created_at >= config.STT_POOL_MAX_IDLE_S:
+                    entries.remove(entry)
+                    self.stats["recycled"] += 1
+                    await self._discard(entry)
+                elif now - entry.last_ping >= config.STT_POOL_KEEPALIVE_S:
+                    # Out of the idle list while the ping is in flight, so
+                    # connection() can't hand it to a session meanwhile.
+                    entries.remove(entry)
+                    try:
+                        await entry.ws.transcribe(audio=self._silence)
+                    except Exception:
+                        self.stats["recycled"] += 1
+                        await self._discard(entry)
+                        continue
+                    entry.last_ping = now
+                    entries.append(entry)
+                    entries.sort(key=lambda e: e.created_at)   # _take pops the newest
+
+    async def _maintain(self):
+        backoff = config.STT_POOL_RETRY_S
+        while True:
+            self._refill_event.clear()
+            failed = False
+            await self._keepalive_and_recycle()
+            for lang, want in config.STT_POOL_SIZES.items():
+                missing = want - len(self._idle[lang]) - self._opening[lang]
+                budget = config.STT_POOL_MAX_TOTAL - self._total()
+                for _ in range(max(0, min(missing, budget))):
+                    try:
+                        await self._open(lang)
+                    except Exception:
+                        failed = True
+                        break
+            if failed:
+                # Sarvam unreachable / rejecting: back off, checkouts just miss meanwhile.
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+                continue
+            backoff = config.STT_POOL_RETRY_S
+            try:
+                await asyncio.wait_for(self._refill_event.wait(), timeout=config.STT_POOL_KEEPALIVE_S / 2)
+            except asyncio.TimeoutError:
+                pass
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "idle": {lang: len(v) for lang, v in self._idle.items()},
+            "opening": sum(self._opening.values()),
+        }
@@ -0,0 +1,62 @@
+"""
+services/tool_context.py
+------------------------
+Per-invocation context for LLM tools (calendar_tool, facts_module).
+
+Tools find out which session / tenant / caller they serve without taking
+those as arguments. This used to be a module global (`tenant_context`) that
+brain.py overwrote before each turn, so two sessions running tools at the
+same time could read each other's tenant and phone number.
+
+The context now lives in a ContextVar. brain._run_tool_async sets it around
+each tool call; asyncio.to_thread copies the caller's context into the worker
+thread, and every asyncio task has its own copy, so concurrent sessions never
+see each other's value.
+
+    with use_tool_context(ToolContext(session_id, chat_sessions)):
+        await asyncio.to_thread(tool, **args)
+
+    ctx = current_tool_context()      # inside the tool; None outside a tool call
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Mapping, Optional, Tuple
+
+
+class ToolContext:
+    """Which session a tool call belongs to; session data is read live from chat_sessions."""
+
+    __slots__ = ("session_id", "chat_sessions")
+
+    def __init__(self, session_id: str, chat_sessions: Mapping):
+        self.session_id = session_id
+        self.chat_sessions = chat_sessions
+
+    def session(self) -> Optional[dict]:
+        return self.chat_sessions.get(self.session_id)
+
+    def tenant_and_phone(self) -> Tuple[Optional[str], Optional[str]]:
+        session = self.session()
+        if not session:
+            return None, None
+        return session.get("tenant_id"), session.get("phone_number")
+
+    def __repr__(self) -> str:
+        return f"ToolContext(session_id={self.session_id!r})"
+
+
+_current: ContextVar[Optional[ToolContext]] = ContextVar("tool_context", default=None)
+
+
+def current_tool_context() -> Optional[ToolContext]:
+    return _current.get()
+
+
+@contextmanager
+def use_tool_context(ctx: Optional[ToolContext]) -> Iterator[Optional[ToolContext]]:
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
@@ -0,0 +1,290 @@
+"""
+services/tts_cache.py
+---------------------
+Content-addressed cache of synthesized speech.
+
+Many utterances are identical across calls (greeting, "didn't catch that",
+the language question, fallback apologies, the voice-preview sample). Their
+audio is stored under
+
+    sha256(model | speaker | language | normalised text)
+
+in two tiers:
+
+  memory — LRU OrderedDict bounded by TTS_CACHE_MEMORY_MAX_MB
+  disk   — TTS_CACHE_DIR/<ab>/<key>.<fmt>, oldest files (by mtime) evicted
+           past TTS_CACHE_DISK_MAX_MB; a disk hit is promoted to memory
+
+Entries are raw audio bytes plus their format ("mp3" from the streaming
+socket, "wav" from the HTTP convert API). Text is normalised by collapsing
+whitespace, so " ".join(split_into_sentences(t)) and t map to the same key.
+
+Disk I/O is synchronous; async callers use the a*-prefixed wrappers, which run
+it in a worker thread.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, Optional, Tuple
+
+import config
+
+Entry = Tuple[bytes, str]   # (audio bytes, format)
+
+_FORMATS = ("mp3", "wav")
+
+_lock = threading.Lock()
+_memory: "OrderedDict[str, Entry]" = OrderedDict()
+_memory_bytes = 0
+_disk_bytes: Optional[int] = None     # lazily measured on first write
+
+_stats = {
+    "memory_hits":  0,
+    "disk_hits":    0,
+    "misses":       0,
+    "stores":       0,
+    "memory_evictions": 0,
+    "disk_evictions":   0,
+    "precomputed":  0,
+}
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def make_key(text: str, speaker: str, lang: str, model: str = config.TTS_MODEL) -> str:
+    raw = "\x1f".join((model, (speaker or "").lower(), lang or "", normalize_text(text)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Memory tier
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _memory_put(key: str, entry: Entry):
+    global _memory_bytes
+    size = len(entry[0])
+    limit = int(config.TTS_CACHE_MEMORY_MAX_MB * 1024 * 1024)
+    if size > limit:
+        return
+    with _lock:
+        old = _memory.pop(key, None)
+        if old is not None:
+            _memory_bytes -= len(old[0])
+        _memory[key] = entry
+        _memory_bytes += size
+        while _memory_bytes > limit and _memory:
+            _, (audio, _) = _memory.popitem(last=False)
+            _memory_bytes -= len(audio)
+            _stats["memory_evictions"] += 1
+
+
+def _memory_get(key: str) -> Optional[Entry]:
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            _memory.move_to_end(key)
+        return entry
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Disk tier
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _path(key: str, fmt: str) -> str:
+    return os.path.join(config.TTS_CACHE_DIR, key[:2], f"{key}.{fmt}")
+
+
+def _iter_disk_files() -> Iterable[str]:
+    for root, _, files in os.walk(config.TTS_CACHE_DIR):
+        for name in files:
+            if name.endswith(tuple(f".{f}" for f in _FORMATS)):
+                yield os.path.join(root, name)
+
+
+def _disk_get(key: str) -> Optional[Entry]:
+    for fmt in _FORMATS:
+        path = _path(key, fmt)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            print(f"[TTS_CACHE] Read failed for {path}: {e}")
+            continue
+        try:
+            os.utime(path)   # mtime doubles as last-used for disk eviction
+        except OSError:
+            pass
+        return audio, fmt
+    return None
+
+
+def _disk_evict(limit: int):
+    global _disk_bytes
+    files = []
+    for path in _iter_disk_files():
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        files.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            with _lock:
+                _stats["disk_evictions"] += 1
+        except OSError:
+            pass
+    _disk_bytes = total
+
+
+def _disk_put(key: str, entry: Entry):
+    global _disk_bytes
+    audio, fmt = entry
+    path = _path(key, fmt)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(audio)
+        os.replace(tmp, path)   # atomic: readers never see a partial file
+    except OSError as e:
+        print(f"[TTS_CACHE] Write failed for {path}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return
+
+    limit = int(config.TTS_CACHE_DISK_MAX_MB * 1024 * 1024)
+    if _disk_bytes is None:
+        _disk_evict(limit)      # measures the directory
+    else:
+        _disk_bytes += len(audio)
+        if _disk_bytes > limit:
+            _disk_evict(limit)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Public API
+# ─────────────────────────────────────────────────────────────────────────────
+
+def get(text: str, speaker: str, lang: str) -> Optional[Entry]:
+    if not config.TTS_CACHE_ENABLED or not normalize_text(text):
+        return None
+    key = make_key(text, speaker, lang)
+    entry = _memory_get(key)
+    if entry is not None:
+        with _lock:
+            _stats["memory_hits"] += 1
+        return entry
+    entry = _disk_get(key)
+    if entry is not None:
+        _memory_put(key, entry)
+        with _lock:
+            _stats["disk_hits"] += 1
+        return entry
+    with _lock:
+        _stats["misses"] += 1
+    return None
+
+
+def put(text: str, speaker: str, lang: str, audio: bytes, fmt: str):
+    if not config.TTS_CACHE_ENABLED or not audio or not normalize_text(text):
+        return
+    if fmt not in _FORMATS:
+        raise ValueError(f"Unsupported audio format: {fmt}")
+    key = make_key(text, speaker, lang)
+    _memory_put(key, (audio, fmt))
+    _disk_put(key, (audio, fmt))
+    with _lock:
+        _stats["stores"] += 1
+
+
+async def aget(text: str, speaker: str, lang: str) -> Optional[Entry]:
+    if not config.TTS_CACHE_ENABLED:
+        return None
+    # Memory hits stay on the event loop; only disk lookups need a thread.
+    entry = _memory_get(make_key(text, speaker, lang))
+    if entry is not None:
+        with _lock:
+            _stats["memory_hits"] += 1
+        return entry
+    return await asyncio.to_thread(get, text, speaker, lang)
+
+
+async def aput(text: str, speaker: str, lang: str, audio: bytes, fmt: str):
+    if config.TTS_CACHE_ENABLED:
+        await asyncio.to_thread(put, text, speaker, lang, audio, fmt)
+
+
+async def aget_or_render(text: str, speaker: str, lang: str,
+                         render: Callable[[str, str, str], Awaitable[Entry]]) -> Entry:
+    """Cached audio, or render(text, speaker, lang) → (bytes, fmt) and store it."""
+    entry = await aget(text, speaker, lang)
+    if entry is None:
+        entry = await render(text, speaker, lang)
+        await aput(text, speaker, lang, *entry)
+    return entry
+
+
+async def precompute(phrases: Iterable[Tuple[str, str, str]],
+                     render: Callable[[str, str, str], Awaitable[Entry]]) -> int:
+    """
+    Render every (text, speaker, lang) not already cached, at most
+    TTS_CACHE_PRECOMPUTE_CONCURRENCY at a time. Returns the number rendered.
+    """
+    if not config.TTS_CACHE_ENABLED:
+        return 0
+    sem = asyncio.Semaphore(config.TTS_CACHE_PRECOMPUTE_CONCURRENCY)
+    unique = {make_key(t, s, l): (t, s, l) for t, s, l in phrases if normalize_text(t)}
+
+    async def one(text, speaker, lang) -> int:
+        if await aget(text, speaker, lang) is not None:
+            return 0
+        async with sem:
+            try:
+                audio, fmt = await render(text, speaker, lang)
+            except Exception as e:
+                print(f"[TTS_CACHE] Precompute failed for '{text[:40]}' ({lang}/{speaker}): {e}")
+                return 0
+        await aput(text, speaker, lang, audio, fmt)
+        return 1
+
+    t0 = time.monotonic()
+    rendered = sum(await asyncio.gather(*(one(*p) for p in unique.values())))
+    with _lock:
+        _stats["precomputed"] += rendered
+    print(f"[TTS_CACHE] Precomputed {rendered}/{len(unique)} phrase(s) in {time.monotonic() - t0:.2f}s")
+    return rendered
+
+
+def clear_memory():
+    global _memory_bytes
+    with _lock:
+        _memory.clear()
+        _memory_bytes = 0
+
+
+def get_cache_stats() -> dict:
+    with _lock:
+        hits = _stats["memory_hits"] + _stats["disk_hits"]
+        lookups = hits + _stats["misses"]
+        return {
+            **_stats,
+            "hit_ratio":      round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(_memory),
+            "memory_bytes":   _memory_bytes,
+            "disk_bytes":     _disk_bytes,
+        }
@@ -0,0 +1,175 @@
+"""
+services/turn_queue.py
+----------------------
+Coalescing queue between the transcript producers (Sarvam STT finals, the
+browser's commit_transcript) and brain_consumer in /ws/voice.
+
+Utterances that arrive while a turn is running are no longer dropped: they
+wait here and become the next turn. Fragments that arrive close together
+("કાલે" … "11 વાગ્યે") are merged into one run_brain call:
+
+  debounce  — a turn is released TURN_DEBOUNCE_MS after the last fragment;
+              each new fragment restarts the window, but never past
+              TURN_DEBOUNCE_MAX_MS from the first one. While the caller is
+              still talking (VAD), the window is held open up to that cap
+  dedupe    — the same utterance reported by both producers (STT final and
+              the client's silence-timer commit), or a fragment contained in
+              a longer one, is kept once. The last released turn is remembered
+              for TURN_REPEAT_WINDOW_MS, so an echo arriving after it was
+              released does not become a second turn (or barge in on the first)
+  unclear   — "__UNCLEAR__" only becomes a turn if nothing intelligible is
+              pending alongside it
+  cap       — at most TURN_QUEUE_MAX_FRAGMENTS are held; the oldest go first
+"""
+
+import asyncio
+import re
+import time
+from typing import Callable, List, Optional, Tuple
+
+import config
+
+UNCLEAR = "__UNCLEAR__"
+
+_stats = {
+    "received":          0,   # utterances offered by STT / commit_transcript
+    "processed":         0,   # turns handed to run_brain
+    "merged":            0,   # fragments folded into another fragment's turn
+    "deduped":           0,   # duplicates / contained fragments discarded
+    "repeats_of_released": 0, # … of which repeated the turn just released (late echo)
+    "held_while_busy":   0,   # fragments that arrived while a turn was in flight
+    "dropped":           0,   # total discarded (all reasons below)
+    "dropped_overflow":  0,
+    "dropped_ai_speaking": 0,
+    "dropped_echo":      0,
+    "unclear_suppressed": 0,  # "__UNCLEAR__" discarded because real text was pending
+}
+
+# Punctuation / whitespace only: \w would also strip Gujarati and Devanagari vowel signs.
+_NON_WORD = re.compile(r"[\s.,!?;:'\"()\-\u0964\u0965]+")
+
+
+def _norm(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+class TurnQueue:
+    """Per-call utterance queue; get() returns the next (possibly merged) turn."""
+
+    def __init__(self, session_id: Optional[str] = None):
+        self.session_id = session_id
+        self._pending: List[str] = []
+        self._unclear = False
+        self._first_at = 0.0
+        self._last_at = 0.0
+        self._released_key = ""                  # padded _norm() of the last turn handed out
+        self._released_at = 0.0
+        self._changed = asyncio.Event()
+        self.stats = {k: 0 for k in _stats}
+
+    def __len__(self) -> int:
+        return len(self._pending) + (1 if self._unclear and not self._pending else 0)
+
+    def put(self, text: str, busy: bool = False) -> bool:
+        """
+        Queue an utterance. Returns False when it was a duplicate of a pending
+        one or a repeat of the turn just released.
+        """
+        self._bump("received")
+        now = time.monotonic()
+        key = f" {_norm(text)} "                 # padded: containment is whole words
+        if (text != UNCLEAR and self._released_key
+                and now - self._released_at < config.TURN_REPEAT_WINDOW_MS / 1000.0
+                and key in self._released_key):
+            self._bump("deduped")
+            self._bump("repeats_of_released")
+            return False
+        if busy:
+            self._bump("held_while_busy")
+        if not self._pending and not self._unclear:
+            self._first_at = now
+        self._last_at = now
+
+        if text == UNCLEAR:
+            self._unclear = True
+            self._changed.set()
+            return True
+
+        for i, pending in enumerate(self._pending):
+            pkey = f" {_norm(pending)} "
+            if key in pkey:
+                self._bump("deduped")
+                self._changed.set()
+                return False
+            if pkey in key:
+                self._pending[i] = text          # the longer version wins
+                self._bump("deduped")
+                self._changed.set()
+                return False
+
+        self._pending.append(text)
+        while len(self._pending) > config.TURN_QUEUE_MAX_FRAGMENTS:
+            self._pending.pop(0)
+            self.drop("overflow")
+        self._changed.set()
+        return True
+
+    def drop(self, reason: str):
+        """Record an utterance discarded before it reached the queue (or evicted from it)."""
+        self._bump("dropped")
+        key = f"dropped_{reason}"
+        if key in self.stats:
+            self._bump(key)
+
+    async def get(self, still_speaking: Optional[Callable[[], bool]] = None) -> Tuple[str, int]:
+        """
+        Wait for the next turn: (text, number of fragments merged into it).
+        Fragments queued while the previous turn ran are returned after the
+        debounce window, measured from when they arrived.
+        """
+        while not self._pending and not self._unclear:
+            self._changed.clear()
+            await self._changed.wait()
+
+        debounce = config.TURN_DEBOUNCE_MS / 1000.0
+        cap = config.TURN_DEBOUNCE_MAX_MS / 1000.0
+        while True:
+            now = time.monotonic()
+            cap_left = self._first_at + cap - now
+            if cap_left <= 0:
+                break
+            quiet_left = self._last_at + debounce - now
+            if quiet_left <= 0:
+                if not (still_speaking and still_speaking()):
+                    break
+                quiet_left = debounce          # caller mid-utterance: look again shortly
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), min(quiet_left, cap_left))
+            except asyncio.TimeoutError:
+                pass
+
+        fragments, unclear = self._pending, self._unclear
+        self._pending, self._unclear = [], False
+        if fragments and unclear:
+            self._bump("unclear_suppressed")
+        self._bump("processed")
+        if len(fragments) > 1:
+            self._bump("merged", len(fragments) - 1)
+        if not fragments:
+            return UNCLEAR, 1
+        turn = " ".join(fragments)
+        self._released_key = f" {_norm(turn)} "
+        self._released_at = time.monotonic()
+        return turn, len(fragments)
+
+    def _bump(self, key: str, n: int = 1):
+        self.stats[key] += n
+        _stats[key] += n
+
+
+def get_turn_queue_stats() -> dict:
+    stats = dict(_stats)
+    turns = stats["processed"]
+    stats["fragments_per_turn"] = round((turns + stats["merged"]) / turns, 3) if turns else 0.0
+    return stats
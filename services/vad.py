@@ -0,0 +1,205 @@
+"""
+services/vad.py
+---------------
+Energy-based voice activity gate for the /ws/voice mic stream (NumPy).
+
+Browser frames (16 kHz PCM16, 4096 samples ≈ 256 ms) are split into
+VAD_SUBFRAME_MS sub-frames; per sub-frame RMS and zero-crossing rate are
+computed in one vectorised pass over the Int16 buffer. A frame is speech when
+any sub-frame is louder than
+
+    max(VAD_MIN_RMS, noise_floor * VAD_NOISE_RATIO)
+
+or, with VAD_USE_ZCR, at least half that loud with a fricative-like
+zero-crossing rate ("s", "f", "sh" onsets are quiet but noisy). The noise
+floor is an EMA of the median sub-frame RMS of silent frames, plus a
+min-statistics tracker: the quietest sub-frame over the last
+VAD_NOISE_WINDOW_MS (speech has gaps, steady noise does not) pulls the floor
+up, so a rise in ambient noise cannot hold the gate open forever.
+
+  pre-roll  — the last VAD_PREROLL_MS of silence is buffered and sent ahead of
+              the first speech frame, so word onsets are not clipped
+  hangover  — VAD_HANGOVER_MS of silence after speech is still forwarded, so
+              Sarvam sees the trailing pause it uses to end the utterance
+
+Everything else is dropped before it reaches audio_buf / Sarvam STT. The STT
+sender's keepalive frame keeps the socket open through long silences.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import config
+
+SAMPLE_RATE = 16000
+
+_lock = threading.Lock()
+_active: Dict[str, "VoiceActivityGate"] = {}
+_stats = {
+    "frames_in":      0,
+    "speech_frames":  0,
+    "forwarded":      0,   # speech + hangover + pre-roll frames sent to STT
+    "dropped":        0,
+    "bytes_dropped":  0,
+}
+
+
+def _samples(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype="<i2", count=len(raw) // 2)
+
+
+def compute_rms(raw: bytes) -> float:
+    """RMS of a little-endian PCM16 buffer."""
+    s = _samples(raw)
+    if s.size == 0:
+        return 0.0
+    x = s.astype(np.float64)
+    return float(np.sqrt(np.dot(x, x) / s.size))
+
+
+def subframe_features(raw: bytes, subframe_ms: int = 20, sample_rate: int = SAMPLE_RATE):
+    """
+    (rms, zcr) arrays, one value per whole sub-frame; a short tail is folded
+    into its own sub-frame so tiny frames are never ignored.
+    """
+    s = _samples(raw).astype(np.float32)
+    n = max(1, sample_rate * subframe_ms // 1000)
+    if s.size == 0:
+        return np.zeros(0, np.float32), np.zeros(0, np.float32)
+    if s.size < n:
+        n = s.size
+    usable = s.size - s.size % n
+    frames = s[:usable].reshape(-1, n)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(n - 1 or 1)
+    return rms, zcr.astype(np.float32)
+
+
+class VoiceActivityGate:
+    """Per-call speech gate: process() returns the frames to forward to STT (possibly none)."""
+
+    def __init__(self, session_id: Optional[str] = None, sample_rate: int = SAMPLE_RATE):
+        self.session_id = session_id
+        self.sample_rate = sample_rate
+        self.noise_floor = config.VAD_MIN_RMS / config.VAD_NOISE_RATIO
+        self._hangover_left = 0.0          # ms of post-speech audio still to forward
+        self.speech_run_ms = 0.0           # length of the current run of speech frames (barge-in)
+        self._preroll: deque = deque()
+        self._preroll_ms = 0.0
+        self._quietest: deque = deque()     # (frame_ms, min sub-frame RMS) over VAD_NOISE_WINDOW_MS
+        self._quietest_ms = 0.0
+        self.stats = {k: 0 for k in _stats}
+        self.stats["speech_ms"] = 0.0
+        self.stats["silence_ms"] = 0.0
+        if session_id:
+            with _lock:
+                _active[session_id] = self
+
+    def _frame_ms(self, raw: bytes) -> float:
+        return (len(raw) // 2) * 1000.0 / self.sample_rate
+
+    def is_speech(self, raw: bytes) -> bool:
+        rms, zcr = subframe_features(raw, config.VAD_SUBFRAME_MS, self.sample_rate)
+        if rms.size == 0:
+            return False
+        self._track_minimum(self._frame_ms(raw), float(rms.min()))
+        threshold = max(config.VAD_MIN_RMS, self.noise_floor * config.VAD_NOISE_RATIO)
+        voiced = rms >= threshold
+        if config.VAD_USE_ZCR:
+            voiced |= (rms >= threshold * 0.5) & (zcr >= config.VAD_FRICATIVE_ZCR)
+        if voiced.any():
+            return True
+        a = config.VAD_NOISE_ADAPT
+        self.noise_floor = (1 - a) * self.noise_floor + a * float(np.median(rms))
+        return False
+
+    def _track_minimum(self, frame_ms: float, quietest: float):
+        self._quietest.append((frame_ms, quietest))
+        self._quietest_ms += frame_ms
+        while self._quietest_ms - self._quietest[0][0] >= config.VAD_NOISE_WINDOW_MS:
+            self._quietest_ms -= self._quietest.popleft()[0]
+        if self._quietest_ms < config.VAD_NOISE_WINDOW_MS:
+            return
+        window_min = min(q for _, q in self._quietest)
+        if window_min > self.noise_floor:
+            self.noise_floor += config.VAD_NOISE_RISE * (window_min - self.noise_floor)
+
+    def process(self, raw: bytes) -> List[bytes]:
+        frame_ms = self._frame_ms(raw)
+        self._bump("frames_in")
+        if not config.VAD_ENABLED:
+            self._bump("forwarded")
+            return [raw]
+
+        if self.is_speech(raw):
+            self._bump("speech_frames")
+            self._bump("speech_ms", frame_ms)
+            self.speech_run_ms += frame_ms
+            self._hangover_left = config.VAD_HANGOVER_MS
+            out = list(self._preroll) + [raw]
+            self._preroll.clear()
+            self._preroll_ms = 0.0
+            self._bump("forwarded", len(out))
+            return out
+
+        self._bump("silence_ms", frame_ms)
+        self.speech_run_ms = 0.0
+        if self._hangover_left > 0:
+            self._hangover_left -= frame_ms
+            self._bump("forwarded")
+            return [raw]
+
+        # Silence: keep a short pre-roll, drop whatever falls out of it.
+        self._preroll.append(raw)
+        self._preroll_ms += frame_ms
+        while self._preroll and self._preroll_ms - self._frame_ms(self._preroll[0]) >= config.VAD_PREROLL_MS:
+            old = self._preroll.popleft()
+            self._preroll_ms -= self._frame_ms(old)
+            self._bump("dropped")
+            self._bump("bytes_dropped", len(old))
+        return []
+
+    def reset(self):
+        """Forget hangover / pre-roll (e.g. while the AI is speaking and mic audio is discarded)."""
+        self._hangover_left = 0.0
+        self.speech_run_ms = 0.0
+        self._preroll.clear()
+        self._preroll_ms = 0.0
+
+    def _bump(self, key: str, n=1):
+        self.stats[key] += n
+        if key in _stats:
+            with _lock:
+                _stats[key] += n
+
+    def summary(self) -> dict:
+        total_ms = self.stats["speech_ms"] + self.stats["silence_ms"]
+        frames = self.stats["frames_in"]
+        return {
+            **{k: (round(v, 1) if isinstance(v, float) else v) for k, v in self.stats.items()},
+            "speech_ratio":  round(self.stats["speech_ms"] / total_ms, 4) if total_ms else 0.0,
+            "silence_ratio": round(self.stats["silence_ms"] / total_ms, 4) if total_ms else 0.0,
+            "drop_ratio":    round(self.stats["dropped"] / frames, 4) if frames else 0.0,
+            "noise_floor":   round(self.noise_floor, 1),
+        }
+
+    def close(self) -> dict:
+        if self.session_id:
+            with _lock:
+                _active.pop(self.session_id, None)
+        return self.summary()
+
+
+def get_vad_stats() -> dict:
+    with _lock:
+        stats = dict(_stats)
+        sessions = list(_active.items())
+    frames = stats["frames_in"]
+    stats["speech_ratio"] = round(stats["speech_frames"] / frames, 4) if frames else 0.0
+    stats["drop_ratio"] = round(stats["dropped"] / frames, 4) if frames else 0.0
+    stats["active_sessions"] = {sid: gate.summary() for sid, gate in sessions}
+    return stats
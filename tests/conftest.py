@@ -0,0 +1,17 @@
+"""
+Shared pytest setup. brain.py builds its LLM clients at import time from
+environment variables; offline placeholders let it import without a .env
+(no request is sent while constructing the clients).
+"""
+
+import os
+
+for _name, _value in {
+    "LLM_PROVIDER": "groq",
+    "LLM_SECONDARY_PROVIDER": "none",
+    "GROQ_API_KEY": "test",
+    "GROQ_MODEL_NAME": "llama-3.3-70b-versatile",
+    "GROQ_SMALL_API_KEY": "test",
+    "GROQ_SMALL_MODEL_NAME": "llama-3.1-8b-instant",
+}.items():
+    os.environ.setdefault(_name, _value)
@@ -0,0 +1,62 @@
+"""
+tests/test_interrupted_turn.py
+------------------------------
+History cleanup after a barge-in cancelled run_brain
+(brain.rollback_interrupted_turn / brain.settle_interrupted_turn): half-done
+tool exchanges are dropped, a completed calendar write is kept.
+
+    python -m pytest -q tests
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+import brain
+
+
+def _call(name, call_id):
+    return {"name": name, "args": {}, "id": call_id, "type": "tool_call"}
+
+
+def _session(*messages):
+    return {"history": [SystemMessage(content="sys"), HumanMessage(content="હા"), *messages]}
+
+
+def test_unanswered_tool_call_is_dropped():
+    s = _session(AIMessage(content="", tool_calls=[_call("book_appointment", "c1")]))
+    assert brain.rollback_interrupted_turn(s) == 1
+    assert isinstance(s["history"][-1], HumanMessage)
+
+
+def test_completed_read_only_exchange_is_dropped():
+    s = _session(
+        AIMessage(content="", tool_calls=[_call("check_calendar_availability", "c1")]),
+        ToolMessage(content="Slot is FREE.", tool_call_id="c1"),
+    )
+    assert brain.rollback_interrupted_turn(s) == 2
+
+
+def test_completed_calendar_write_is_kept():
+    s = _session(
+        AIMessage(content="", tool_calls=[_call("book_appointment", "c1")]),
+        ToolMessage(content='{"status": "SUCCESS"}', tool_call_id="c1"),
+        AIMessage(content="", tool_calls=[_call("check_calendar_availability", "c2")]),
+    )
+    assert brain.rollback_interrupted_turn(s) == 1
+    assert isinstance(s["history"][-1], ToolMessage)
+
+
+def test_settle_waits_for_the_write_in_flight():
+    async def scenario():
+        s = _session(AIMessage(content="", tool_calls=[_call("cancel_appointment", "c1")]))
+
+        async def tool_round():
+            await asyncio.sleep(0.05)
+            s["history"].append(ToolMessage(content="Cancelled successfully.", tool_call_id="c1"))
+
+        s["_tool_round"] = asyncio.ensure_future(tool_round())
+        assert await brain.settle_interrupted_turn(s) == 0
+        assert "_tool_round" not in s
+        assert s["history"][-1].content == "Cancelled successfully."
+    asyncio.run(scenario())
@@ -0,0 +1,128 @@
+"""
+tests/test_memory_rules.py
+--------------------------
+Table-driven checks for the rule-based memory extractor
+(brain.extract_memory_rules): what it resolves without the small LLM, and
+what it must leave to the LLM.
+
+    python -m pytest -q tests
+"""
+
+from datetime import date
+
+import pytest
+
+import brain
+import config
+from modules.module_registry import BOOKING_MODULE
+
+TODAY = date(2026, 10, 17)          # a Saturday
+TOMORROW = "2026-10-18"
+
+
+def rules(text, memory=None, modules=(BOOKING_MODULE,)):
+    return brain.extract_memory_rules(
+        brain.normalize_gujarati_time(text), memory or {"intent": None}, list(modules), TODAY
+    )
+
+
+def confident(confidence):
+    return confidence > config.MEMORY_RULES_MIN_CONFIDENCE
+
+
+# (utterance, expected date, expected time, expected intent)
+BOOKINGS = [
+    ("કાલે 11 વાગ્યે",                              TOMORROW,     "11:00", "book"),
+    ("કાલે ૧૧ વાગ્યે",                               TOMORROW,     "11:00", "book"),
+    ("11વાગ્યે",                                    None,         "11:00", "book"),
+    ("tomorrow at 4",                               TOMORROW,     "16:00", "book"),
+    ("Tomorrow at 4 pm please",                     TOMORROW,     "16:00", "book"),
+    ("મને કાલે 11 વાગ્યે અપોઇન્ટમેન્ટ જોઈએ છે.",    TOMORROW,     "11:00", "book"),
+    ("આજે સાંજે 5 વાગ્યે",                           "2026-10-17", "17:00", "book"),
+    ("પરમ દિવસે 3 વાગ્યે",                           "2026-10-19", "15:00", "book"),
+    ("સવા ચાર વાગ્યે",                               None,         "16:15", "book"),
+    ("સાડા દસ વાગ્યે",                               None,         "10:30", "book"),
+    ("પોણા પાંચ વાગ્યે",                             None,         "16:45", "book"),
+    ("1 વાગ્યે ચાલશે",                               None,         "13:00", "book"),
+    ("सोमवार को 10 बजे",                             "2026-10-19", "10:00", "book"),
+    ("साढ़े चार बजे",                                None,         "16:30", "book"),
+    ("शुक्रवार शाम 6 बजे",                           "2026-10-23", "18:00", "book"),
+    ("25 March at 11 am",                           "2027-03-25", "11:00", "book"),
+    ("25/10 સવારે 9",                                "2026-10-25", "09:00", "book"),
+    ("day after tomorrow 10:30",                    "2026-10-19", "10:30", "book"),
+    ("next monday morning 9",                       "2026-10-19", "09:00", "book"),
+    ("મારે 20 તારીખે આવવું છે",                      "2026-10-20", None,    "book"),
+    ("cancel my appointment tomorrow at 5",         TOMORROW,     "17:00", "cancel"),
+]
+
+
+@pytest.mark.parametrize("text, day, hhmm, intent", BOOKINGS)
+def test_resolves_dates_and_times(text, day, hhmm, intent):
+    update, confidence, _ = rules(text)
+    assert confident(confidence), (text, confidence)
+    appointment = update.get("appointment", {})
+    assert appointment.get("date") == day
+    assert appointment.get("time") == hhmm
+    assert update["intent"] == intent
+    assert update["pending_action"] == "waiting_for_confirmation"
+
+
+@pytest.mark.parametrize("text, signal", [
+    ("હા", "yes"), ("હા, બુક કરી દો", "yes"), ("ok", "yes"), ("हाँ", "yes"),
+    ("ના", "no"), ("नहीं", "no"), ("no", "no"),
+])
+def test_yes_no(text, signal):
+    _, confidence, signals = rules(text)
+    assert confident(confidence)
+    assert signal in signals
+
+
+@pytest.mark.parametrize("text, lang", [
+    ("Hindi please", "hi-IN"), ("English", "en-IN"), ("continue in english", "en-IN"),
+])
+def test_language_names(text, lang):
+    update, confidence, _ = rules(text)
+    assert confident(confidence)
+    assert update["language_preference"] == lang
+
+
+# Must not be resolved by the rules: the small LLM decides.
+@pytest.mark.parametrize("text", [
+    "Is 4 pm available tomorrow",
+    "is 4 pm available tomorrow?",
+    "what are your timings tomorrow?",
+    "when can I come tomorrow",
+    "કાલે 4 વાગ્યે ખાલી છે",
+    "કાલે ક્યારે આવી શકું",
+    "ફી કેટલી છે?",
+    "क्या कल 4 बजे खाली है",
+    "कल कब आ सकते हैं",
+    "kal 4 baje khali hai kya",
+    "yes but not tomorrow",
+    "11",
+    "hello",
+    "reschedule to 6 pm",
+])
+def test_leaves_questions_and_unclear_turns_to_the_llm(text):
+    _, confidence, _ = rules(text)
+    assert not confident(confidence), text
+
+
+def test_reschedule_with_a_time_goes_to_the_llm():
+    assert rules("reschedule to 6 pm", {"intent": "book"})[1] == 0.0
+    assert rules("6 વાગ્યે", {"intent": "reschedule"})[1] == 0.0
+
+
+@pytest.mark.parametrize("text", [
+    "कल 4 बजे नहीं",
+    "કાલે 4 વાગ્યે નહીં",
+    "no, not 11 am",
+])
+def test_rejected_slot_goes_to_the_llm(text):
+    update, confidence, signals = rules(text, {"intent": "book"})
+    assert (update, confidence) == ({}, 0.0), text
+    assert "no+slot" in signals
+
+
+def test_booking_module_disabled():
+    assert rules("કાલે 11 વાગ્યે", modules=())[1] == 0.0
@@ -0,0 +1,162 @@
+"""
+tests/test_session_store.py
+---------------------------
+Session store backends (services/session_store.py) and the voice-resume rules.
+
+The Redis backend runs against a throwaway local redis-server when one is on
+PATH, otherwise against fakeredis; without either those cases are skipped.
+
+    python -m pytest -q tests
+"""
+
+import asyncio
+import shutil
+import socket
+import subprocess
+import time
+
+import pytest
+
+from services import session_store as ss
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def redis_url():
+    binary = shutil.which("redis-server")
+    if binary is None:
+        yield None
+        return
+    port = _free_port()
+    proc = subprocess.Popen(
+        [binary, "--port", str(port), "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    yield f"redis://127.0.0.1:{port}/0"
+    proc.terminate()
+    proc.wait(timeout=5)
+
+
+def _redis_store(url):
+    if not ss.REDIS_AVAILABLE:
+        pytest.skip("redis package not installed")
+    if url is not None:
+        return ss.RedisSessionStore(url, "test")
+    fakeredis = pytest.importorskip("fakeredis", reason="no redis-server binary and no fakeredis")
+    store = ss.RedisSessionStore("redis://unused", "test")
+    store._redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return store
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request, redis_url):
+    store = ss.MemorySessionStore() if request.param == "memory" else _redis_store(redis_url)
+    yield store
+    asyncio.run(store.close())
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+# ── backends ────────────────────────────────────────────────────────────────
+
+def test_round_trip_and_delete(store):
+    async def scenario():
+        value = {"memory": {"intent": "book", "appointment": {"time": "11:00"}}, "text": "કાલે"}
+        await store.set(ss.VOICE, "k1", value)
+        assert await store.get(ss.VOICE, "k1") == value
+        assert await store.get(ss.ADMIN, "k1") is None          # namespaces are separate
+        await store.delete(ss.VOICE, "k1")
+        assert await store.get(ss.VOICE, "k1") is None
+    _run(scenario())
+
+
+def test_stored_value_is_a_copy(store):
+    async def scenario():
+        value = {"memory": {"intent": None}}
+        await store.set(ss.VOICE, "k2", value)
+        value["memory"]["intent"] = "book"
+        assert (await store.get(ss.VOICE, "k2"))["memory"]["intent"] is None
+    _run(scenario())
+
+
+def test_ttl_expires(store):
+    async def scenario():
+        await store.set(ss.ADMIN, "tok", {"tenant_id": "t1"}, ttl_s=1)
+        assert await store.get(ss.ADMIN, "tok") is not None
+        if isinstance(store, ss.MemorySessionStore):
+            store._data[(ss.ADMIN, "tok")] = ({"tenant_id": "t1"}, time.monotonic() - 1)
+        else:
+            await store._redis.pexpire(store._key(ss.ADMIN, "tok"), 1)
+            await asyncio.sleep(0.05)
+        assert await store.get(ss.ADMIN, "tok") is None
+    _run(scenario())
+
+
+def test_stats(store):
+    async def scenario():
+        await store.set(ss.VOICE, "k3", {"a": 1})
+        stats = await store.stats()
+        assert stats["backend"] == store.backend
+        assert stats["keys"] >= 1
+    _run(scenario())
+
+
+# ── voice resume ────────────────────────────────────────────────────────────
+
+STATE = {
+    "phone_number": "+919800000001",
+    "tenant_id": "tenant-a",
+    "memory": {"intent": "book"},
+    "confirmation_state": {"status": "awaiting", "action": "book_appointment"},
+    "language_prompt_asked": True,
+}
+
+
+def test_resume_tokens_are_unguessable():
+    tokens = {ss.new_resume_token() for _ in range(100)}
+    assert len(tokens) == 100
+    assert all(len(t) >= 32 for t in tokens)
+
+
+@pytest.mark.parametrize("tenant_id, phone, resumed", [
+    ("tenant-a", "+919800000001", True),
+    ("tenant-b", "+919800000001", False),    # another tenant
+    ("tenant-a", "+919811111111", False),    # another caller
+    ("tenant-a", None,            False),    # caller not identified
+])
+def test_take_voice_state_checks_tenant_and_caller(store, tenant_id, phone, resumed):
+    async def scenario():
+        token = ss.new_resume_token()
+        await store.set(ss.VOICE, token, STATE)
+        state = await ss.take_voice_state(store, token, tenant_id, phone)
+        if resumed:
+            assert state == {k: v for k, v in STATE.items() if k not in ("tenant_id", "phone_number")}
+        else:
+            assert state is None
+        # single use, whatever the outcome
+        assert await ss.take_voice_state(store, token, "tenant-a", "+919800000001") is None
+    _run(scenario())
+
+
+def test_take_voice_state_anonymous_session(store):
+    async def scenario():
+        token = ss.new_resume_token()
+        await store.set(ss.VOICE, token, {**STATE, "phone_number": None})
+        assert (await ss.take_voice_state(store, token, "tenant-a", None))["memory"] == {"intent": "book"}
+        assert await ss.take_voice_state(store, "", "tenant-a", None) is None
+        assert await ss.take_voice_state(store, "no-such-token", "tenant-a", None) is None
+    _run(scenario())